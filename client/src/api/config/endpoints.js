@@ -54,6 +54,11 @@ export const ENDPOINTS = {
     UPDATE: (id) => `/news/${id}/`,
     DELETE: (id) => `/news/${id}/`,
     FETCH_BY_SYMBOL: '/news/fetch-by-symbol/',
+    FETCH_JOB: (jobId) => `/news/jobs/${jobId}/`,
+    CHANGES: '/news/changes/',
+    STREAM: '/news/stream/',
+    STREAM_TICKET: '/news/stream/ticket/',
+    SEARCH: '/news/search/',
     BY_SYMBOL: (symbol) => `/news/by-symbol/${symbol}/`,
     ANALYZE: (id) => `/news/${id}/analyze/`,
   },
@@ -64,6 +69,7 @@ export const ENDPOINTS = {
     CREATE: "/articles/",
     DETAIL: (id) => `/articles/${id}/`,
     ANALYZE: (id) => `/articles/${id}/analyze/`,
+    SEARCH: "/articles/search/",
   },
 
   // Stocks
@@ -72,5 +78,8 @@ export const ENDPOINTS = {
     SEARCH: "/stocks/search/",
     DETAIL: (symbol) => `/stock/${symbol}/`,
     HISTORICAL_PRICE: (symbol) => `/historical-price/${symbol}/`,
+    RESAMPLED_PRICE: (symbol) => `/historical-price/${symbol}/resample/`,
+    PRICE_OVERLAY: (symbol) => `/historical-price/${symbol}/overlay/`,
+    INDICATORS: "/indicators/",
   },
 };
@@ -1,7 +1,8 @@
 import { createRequestConfig, handleSilentError } from "./request.util";
+import { nextPageParams } from "./response.util";
 
 // Exportaciones nombradas
-export { createRequestConfig, handleSilentError };
+export { createRequestConfig, handleSilentError, nextPageParams };
 
 // Crear utilidades de respuesta si no existen
 export const formatResponse = (response) => {
@@ -37,6 +38,7 @@ export const isTimeoutError = (error) => {
 export default {
   createRequestConfig,
   handleSilentError,
+  nextPageParams,
   formatResponse,
   extractErrorDetails,
   isNetworkError,
@@ -30,6 +30,19 @@ export const extractPaginationData = (response) => {
   };
 };
 
+/**
+ * Parámetros de la página siguiente a partir del enlace `next` de un listado
+ * paginado (cursor o número de página)
+ * @param {string|null} next - URL de la página siguiente
+ * @returns {Object|null} Parámetros de consulta, o null si no hay más páginas
+ */
+export const nextPageParams = (next) => {
+  if (!next) return null;
+  return Object.fromEntries(
+    new URL(next, window.location.origin).searchParams.entries()
+  );
+};
+
 /**
  * Verificar si una respuesta contiene errores de validación
  * @param {Object} response - Respuesta de la API
@@ -94,6 +107,7 @@ export const transformForForm = (response) => {
 export default {
   formatApiResponse,
   extractPaginationData,
+  nextPageParams,
   hasValidationErrors,
   extractValidationErrors,
   isSuccessResponse,
@@ -1,12 +1,12 @@
 import { useState, useEffect } from "react";
+import { usePaginatedList } from "@/hooks/usePaginatedList";
 import { articlesApi } from "./articles.api";
 
+/**
+ * Artículos paginados por cursor; `loadMore` pide la página siguiente
+ */
 export function useArticles() {
-  const [data, setData] = useState([]);
-  useEffect(() => {
-    articlesApi.getArticles().then((res) => setData(res.data));
-  }, []);
-  return data;
+  return usePaginatedList(articlesApi.getArticles);
 }
 
 export function useAnalysis(articleId) {
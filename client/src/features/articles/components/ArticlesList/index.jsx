@@ -5,7 +5,7 @@ import { AnalysisPanel } from "../AnalysisPanel";
 import { ArticleCard } from "../ArticleCard";
 
 export function ArticlesList() {
-  const articles = useArticles();
+  const { items: articles, hasMore, loadMore, loadingMore } = useArticles();
   const [selectedId, setSelectedId] = useState(null);
   const analysis = useAnalysis(selectedId);
 
@@ -20,6 +20,16 @@ export function ArticlesList() {
             isActive={art.id === selectedId}
           />
         ))}
+        {hasMore && (
+          <button
+            type="button"
+            onClick={loadMore}
+            disabled={loadingMore}
+            className={styles["articles-list__more"]}
+          >
+            {loadingMore ? "Cargando…" : "Cargar más"}
+          </button>
+        )}
       </aside>
       <section className={styles["articles-list__detail"]}>
         {selectedId ? (
@@ -4,9 +4,45 @@ export const historicalPriceApi = {
   /**
    * Obtener precio histórico
    * @param {String} symbol
+   * @param {Object} params - start, end (YYYY-MM-DD) y max_points opcionales
    * @returns {Promise}
    */
-  getHistoricalPrice: (symbol) => api.get(ENDPOINTS.STOCKS.HISTORICAL_PRICE(symbol))
+  getHistoricalPrice: (symbol, params = {}) =>
+    api.get(ENDPOINTS.STOCKS.HISTORICAL_PRICE(symbol), { params }),
+
+  /**
+   * Obtener velas agregadas en el servidor
+   * @param {String} symbol
+   * @param {Object} params - interval (1wk, 1mo, 3mo, 1y, <N>d), start y end
+   * @returns {Promise}
+   */
+  getResampledPrice: (symbol, params = {}) =>
+    api.get(ENDPOINTS.STOCKS.RESAMPLED_PRICE(symbol), { params }),
+
+  /**
+   * Obtener precios y noticias (con sentimiento) del gráfico en una petición
+   * @param {String} symbol
+   * @param {Object} params - start, end, max_points y max_markers opcionales
+   * @returns {Promise}
+   */
+  getPriceOverlay: (symbol, params = {}) =>
+    api.get(ENDPOINTS.STOCKS.PRICE_OVERLAY(symbol), { params }),
+
+  /**
+   * Obtener indicadores técnicos de uno o varios símbolos
+   * @param {String[]} symbols
+   * @param {String[]} indicators - ej. ["sma:50", "rsi:14", "macd:12:26:9"]
+   * @param {Object} params - start y end opcionales
+   * @returns {Promise}
+   */
+  getIndicators: (symbols, indicators, params = {}) =>
+    api.get(ENDPOINTS.STOCKS.INDICATORS, {
+      params: {
+        ...params,
+        symbols: symbols.join(","),
+        indicators: indicators.join(","),
+      },
+    }),
 };
 
 export default historicalPriceApi;
@@ -5,7 +5,6 @@ import {
   getCandlestickOptions,
   getVolumeOptions,
 } from "../utils/stock-chart-options.util";
-import { useNewsByDate } from "./news-by-date.hook";
 
 const tooltipClasses = {
   tooltipClass: styles["chart-tooltip"],
@@ -16,6 +15,16 @@ const tooltipClasses = {
   tooltipTextBoldClass: styles["chart-tooltip__text--bold"],
 };
 
+function groupNewsByDate(news) {
+  // El servidor ya ancla cada noticia a la fecha de una vela devuelta
+  const grouped = {};
+  news.forEach((n) => {
+    grouped[n.date] = grouped[n.date] || [];
+    grouped[n.date].push(n.title);
+  });
+  return grouped;
+}
+
 function buildAnnotationPoints(hist, newsByDate) {
   const points = [];
 
@@ -25,28 +34,16 @@ function buildAnnotationPoints(hist, newsByDate) {
     candleByDate[h.date] = h;
   });
 
-  // Para cada fecha con noticias, posicionar el punto en la fecha
-  // de la noticia o en la siguiente fecha disponible en los datos
   Object.entries(newsByDate).forEach(([day, titles]) => {
-    let targetDate = day;
-
-    // Si no hay vela para ese día (p.ej. fin de semana),
-    // buscar el siguiente día con datos para anotar allí
-    if (!candleByDate[day]) {
-      const dayMs = new Date(day).getTime();
-      const next = hist.find((h) => new Date(h.date).getTime() > dayMs);
-      if (!next) return; // fuera del rango del histórico
-      targetDate = next.date;
-    }
-
-    const { low } = candleByDate[targetDate];
+    const candle = candleByDate[day];
+    if (!candle) return;
 
     // Colocar la anotación en el mínimo de la vela para que permanezca
     // visible incluso al hacer zoom
     titles.forEach(() => {
       points.push({
-        x: new Date(targetDate).getTime(),
-        y: low,
+        x: new Date(day).getTime(),
+        y: candle.low,
         marker: {
           size: 6,
           fillColor: "#ffb300",
@@ -67,7 +64,6 @@ export function useHistoricalPrice(symbol, showVolume) {
   const [candleOptions, setCandleOptions] = useState({});
   const [volumeOptions, setVolumeOptions] = useState({});
   const [loading, setLoading] = useState(true);
-  const newsByDate = useNewsByDate(symbol);
 
   useEffect(() => {
     if (!symbol) return;
@@ -76,9 +72,10 @@ export function useHistoricalPrice(symbol, showVolume) {
     (async () => {
       setLoading(true);
       try {
-        const { data: hist } = await historicalPriceApi.getHistoricalPrice(
-          symbol
-        );
+        // Precios y noticias en una sola petición
+        const { data } = await historicalPriceApi.getPriceOverlay(symbol);
+        const hist = data.prices;
+        const newsByDate = groupNewsByDate(data.news);
 
         // Construir candles & vols a partir de hist
         const candles = hist.map((item) => ({
@@ -127,7 +124,7 @@ export function useHistoricalPrice(symbol, showVolume) {
     return () => {
       cancelled = true;
     };
-  }, [symbol, showVolume, newsByDate]);
+  }, [symbol, showVolume]);
 
   return {
     candlesSeries,
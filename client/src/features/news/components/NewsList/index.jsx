@@ -2,70 +2,47 @@ import { useAuth } from "@/features/auth/hooks/auth-context.hook";
 import { newsApi } from "@/features/news/news.api";
 import { searchTermPropTypes } from "@/features/search/search-term.propTypes";
 import { useSearch } from "@/features/search/SearchContext";
-import { useEffect, useState } from "react";
+import { usePaginatedList } from "@/hooks/usePaginatedList";
+import { useEffect, useMemo, useState } from "react";
 import { NewCard } from "../NewCard";
 import styles from "./NewsList.module.scss";
 
+// Espera (ms) tras la última tecla antes de buscar en el servidor
+const SEARCH_DEBOUNCE_MS = 300;
+
 export function NewsList({ initialPageSize = 15 }) {
   const { searchTerm } = useSearch();
   const { loading: authLoading } = useAuth();
-  const [news, setNews] = useState([]);
-  // Estado para término de búsqueda, página actual y tamaño de página
-  const [currentPage, setCurrentPage] = useState(1);
   const [itemsPerPage, setItemsPerPage] = useState(initialPageSize);
-  const [loading, setLoading] = useState(true);
-  const [errorMessage, setErrorMessage] = useState("");
-
-  // Cuando cambie searchTerm o itemsPerPage, reiniciar página
-  useEffect(() => {
-    setCurrentPage(1);
-  }, [searchTerm, itemsPerPage]);
+  const term = (searchTerm || "").trim();
+  const [query, setQuery] = useState(term);
 
   useEffect(() => {
-    let cancelled = false;
-    (async () => {
-      try {
-        const res = await newsApi.getNews();
-        if (!cancelled) setNews(res.data);
-      } catch {
-        if (!cancelled) setErrorMessage("No se pudieron obtener las noticias.");
-      } finally {
-        if (!cancelled) setLoading(false);
-      }
-    })();
-    return () => {
-      cancelled = true;
-    };
-  }, []);
-
-  const filteredNews = searchTerm
-    ? news.filter((newItem) => {
-        const term = searchTerm.toUpperCase();
-        // ¿Coincide en el título?
-        const inTitle = newItem.title.toUpperCase().includes(term);
-        // ¿Coincide en related_tickers?
-        const inTickers =
-          Array.isArray(newItem.related_tickers) &&
-          newItem.related_tickers.some((t) => t.toUpperCase().includes(term));
-        return inTitle || inTickers;
-      })
-    : news;
+    const timer = setTimeout(() => setQuery(term), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [term]);
 
-  const totalItems = filteredNews.length;
-  const totalPages = Math.ceil(totalItems / itemsPerPage);
-
-  // Obtener los ítems de la página actual
-  const startIdx = (currentPage - 1) * itemsPerPage;
-  const currentNews = filteredNews.slice(startIdx, startIdx + itemsPerPage);
-
-  const goToPage = (page) => {
-    const p = Math.max(1, Math.min(page, totalPages));
-    setCurrentPage(p);
-  };
+  // Con término de búsqueda se usa la búsqueda de texto completo del servidor;
+  // las páginas siguientes se piden bajo demanda con el enlace `next`
+  const params = useMemo(
+    () =>
+      query
+        ? { q: query, page_size: itemsPerPage }
+        : { page_size: itemsPerPage },
+    [query, itemsPerPage]
+  );
+  const {
+    items: news,
+    loading,
+    loadingMore,
+    error,
+    hasMore,
+    loadMore,
+  } = usePaginatedList(query ? newsApi.searchNews : newsApi.getNews, params);
+  const errorMessage = error ? "No se pudieron obtener las noticias." : "";
 
   const handlePageSizeChange = (e) => {
     setItemsPerPage(Number(e.target.value));
-    setCurrentPage(1); // reiniciar a la primera página al cambiar tamaño
   };
 
   if (authLoading || loading) {
@@ -81,7 +58,7 @@ export function NewsList({ initialPageSize = 15 }) {
           <h1 className={styles["news-list__title"]}>Noticias de acciones</h1>
         </header>
 
-        {currentNews.length === 0 ? (
+        {news.length === 0 ? (
           <div>
             <p role="alert" className={styles["news-list__message"]}>
               No se han encontrado noticias que coincidan con la búsqueda.
@@ -94,7 +71,7 @@ export function NewsList({ initialPageSize = 15 }) {
             )}
           </div>
         ) : (
-          currentNews.map((item) => <NewCard newItem={item} key={item.uuid} />)
+          news.map((item) => <NewCard newItem={item} key={item.uuid} />)
         )}
 
         <nav
@@ -102,59 +79,22 @@ export function NewsList({ initialPageSize = 15 }) {
           className={styles["news-list__pagination"]}
         >
           <button
-            onClick={() => goToPage(1)}
-            disabled={currentPage === 1}
+            onClick={loadMore}
+            disabled={!hasMore || loadingMore}
             className={`${styles["news-list__pagination-button"]} ${
-              currentPage === 1
+              !hasMore || loadingMore
                 ? styles["news-list__pagination-button--disabled"]
                 : ""
             }`}
-            aria-label="Primera página"
+            aria-label="Cargar más noticias"
           >
-            ««
-          </button>
-          <button
-            onClick={() => goToPage(currentPage - 1)}
-            disabled={currentPage === 1}
-            className={`${styles["news-list__pagination-button"]} ${
-              currentPage === 1
-                ? styles["news-list__pagination-button--disabled"]
-                : ""
-            }`}
-            aria-label="Página anterior"
-          >
-            «
+            {loadingMore ? "Cargando…" : "Cargar más"}
           </button>
 
           <span className={styles["news-list__pagination-info"]}>
-            Página {currentPage} de {totalPages || 1}
+            {news.length} noticias{hasMore ? "" : " (no hay más)"}
           </span>
 
-          <button
-            onClick={() => goToPage(currentPage + 1)}
-            disabled={currentPage === totalPages || totalPages === 0}
-            className={`${styles["news-list__pagination-button"]} ${
-              currentPage === totalPages || totalPages === 0
-                ? styles["news-list__pagination-button--disabled"]
-                : ""
-            }`}
-            aria-label="Página siguiente"
-          >
-            »
-          </button>
-          <button
-            onClick={() => goToPage(totalPages)}
-            disabled={currentPage === totalPages || totalPages === 0}
-            className={`${styles["news-list__pagination-button"]} ${
-              currentPage === totalPages || totalPages === 0
-                ? styles["news-list__pagination-button--disabled"]
-                : ""
-            }`}
-            aria-label="Última página"
-          >
-            »»
-          </button>
-
           <label
             htmlFor="pageSizeSelect"
             className={styles["news-list__page-size"]}
@@ -171,7 +111,7 @@ export function NewsList({ initialPageSize = 15 }) {
               <option value={25}>25</option>
               <option value={50}>50</option>
             </select>
-            por página
+            por carga
           </label>
         </nav>
       </div>
@@ -8,6 +8,13 @@ export const newsApi = {
    */
   getNews: (params = {}) => api.get(ENDPOINTS.NEWS.LIST, { params }),
 
+  /**
+   * Búsqueda de texto completo en los titulares
+   * @param {Object} params - q (obligatorio), symbol, page y page_size
+   * @returns {Promise}
+   */
+  searchNews: (params = {}) => api.get(ENDPOINTS.NEWS.SEARCH, { params }),
+
   /**
    * Crear nueva noticia
    * @param {Object} newsData - Datos de la noticia
@@ -57,6 +64,15 @@ export const newsApi = {
   getNewsBySymbol: (symbol) => 
     api.get(ENDPOINTS.NEWS.BY_SYMBOL(symbol.toUpperCase())),
 
+  /**
+   * Cambios de noticias posteriores a un cursor (sincronización incremental)
+   * @param {number} since - Último next_cursor recibido (0 la primera vez)
+   * @returns {Promise} { next_cursor, has_more, news, deleted }; un 410 con
+   *   resync_required obliga a recargar el listado y seguir desde next_cursor
+   */
+  getNewsChanges: (since = 0) =>
+    api.get(ENDPOINTS.NEWS.CHANGES, { params: { since } }),
+
   /**
    * Analizar noticia
    * @param {string} uuid - UUID de la noticia
@@ -2,45 +2,49 @@ import { stocksApi } from "@/features/stocks/stocks.api";
 import { useAuth } from "@/features/auth/hooks/auth-context.hook";
 import { StockCard } from "@/features/stocks/components/StockCard";
 import { stockTermPropTypes } from "@/features/stocks/stock-term.propTypes";
+import { usePaginatedList } from "@/hooks/usePaginatedList";
 import styles from "@/shared/styles";
-import { useEffect, useMemo, useState } from "react";
+import { useCallback, useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
 
+// Espera (ms) tras la última tecla antes de buscar en el servidor
+const SEARCH_DEBOUNCE_MS = 300;
+
 export function Search() {
   const { loading: authLoading } = useAuth();
   const navigate = useNavigate();
 
   const [searchTerm, setSearchTerm] = useState("");
-  const [stocks, setStocks] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const [query, setQuery] = useState("");
   const [errorMessage, setErrorMessage] = useState("");
 
-  // Carga inicial de stocks
   useEffect(() => {
-    let cancelled = false;
-    (async () => {
-      try {
-        const res = await stocksApi.getStocks();
-        if (!cancelled) setStocks(res.data);
-      } catch {
-        if (!cancelled) setErrorMessage("No se pudieron obtener los stocks.");
-      } finally {
-        if (!cancelled) setLoading(false);
-      }
-    })();
-    return () => {
-      cancelled = true;
-    };
-  }, []);
+    const timer = setTimeout(
+      () => setQuery(searchTerm.trim().toUpperCase()),
+      SEARCH_DEBOUNCE_MS
+    );
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
 
-  // Filtrado memoizado
-  const filteredStocks = useMemo(() => {
-    if (!searchTerm.trim()) return stocks;
-    const term = searchTerm.trim().toUpperCase();
-    return stocks.filter((s) => s.symbol.toUpperCase().includes(term));
-  }, [searchTerm, stocks]);
+  // El filtrado por prefijo se hace en el servidor (/stocks/search/) y las
+  // páginas siguientes se piden bajo demanda
+  const fetchStocks = useCallback(
+    (params) =>
+      query
+        ? stocksApi.searchStocks(query, params)
+        : stocksApi.getStocks(params),
+    [query]
+  );
+  const {
+    items: stocks,
+    loading,
+    loadingMore,
+    error,
+    hasMore,
+    loadMore,
+  } = usePaginatedList(fetchStocks);
 
-  const handleSearch = (e) => {
+  const handleSearch = async (e) => {
     e.preventDefault();
     const term = searchTerm.trim().toUpperCase();
 
@@ -48,11 +52,17 @@ export function Search() {
       setErrorMessage("Por favor, escribe un símbolo.");
       return;
     }
-    const exact = stocks.find((s) => s.symbol.toUpperCase() === term);
-    if (exact) {
-      navigate(`/stock/${exact.symbol}/`);
-    } else {
+    // El símbolo exacto es el primero de los que empiezan por él
+    try {
+      const res = await stocksApi.searchStocks(term, { page_size: 1 });
+      const [first] = res.data.results;
+      if (first && first.symbol.toUpperCase() === term) {
+        navigate(`/stock/${first.symbol}/`);
+        return;
+      }
       setErrorMessage(`El stock “${searchTerm}” no se encuentra disponible.`);
+    } catch {
+      setErrorMessage("No se pudieron obtener los stocks.");
     }
   };
 
@@ -64,7 +74,7 @@ export function Search() {
     }
   };
 
-  if (authLoading || loading) {
+  if (authLoading) {
     return <p>Cargando…</p>;
   }
 
@@ -103,17 +113,31 @@ export function Search() {
       </form>
 
       <div className={styles["card__results"]}>
-        {filteredStocks.length > 0 ? (
-          filteredStocks.map((stock) => (
+        {loading ? (
+          <p className={styles["card__results-empty"]}>Cargando…</p>
+        ) : stocks.length > 0 ? (
+          stocks.map((stock) => (
             <StockCard key={stock.symbol} stock={stock} />
           ))
         ) : (
           <p className={styles["card__results-empty"]}>
-            {searchTerm
-              ? `No se encontraron resultados para “${searchTerm}”.`
-              : "No hay stocks disponibles."}
+            {error
+              ? "No se pudieron obtener los stocks."
+              : searchTerm
+                ? `No se encontraron resultados para “${searchTerm}”.`
+                : "No hay stocks disponibles."}
           </p>
         )}
+        {hasMore && (
+          <button
+            type="button"
+            onClick={loadMore}
+            disabled={loadingMore}
+            className={`${styles["button"]} ${styles["button--primary"]}`}
+          >
+            {loadingMore ? "Cargando…" : "Cargar más"}
+          </button>
+        )}
       </div>
     </div>
   );
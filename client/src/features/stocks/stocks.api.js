@@ -9,12 +9,13 @@ export const stocksApi = {
   getStocks: (params = {}) => api.get(ENDPOINTS.STOCKS.LIST, { params }),
 
   /**
-   * Buscar stocks
+   * Buscar stocks por prefijo del símbolo
    * @param {string} query - Término de búsqueda
+   * @param {Object} params - Parámetros de paginación (cursor, page_size)
    * @returns {Promise}
    */
-  searchStocks: (query) =>
-    api.get(ENDPOINTS.STOCKS.SEARCH, { params: { q: query } }),
+  searchStocks: (query, params = {}) =>
+    api.get(ENDPOINTS.STOCKS.SEARCH, { params: { ...params, q: query } }),
 
   /**
    * Obtener información de un stock específico
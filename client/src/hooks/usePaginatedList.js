@@ -0,0 +1,69 @@
+import { nextPageParams } from "@/api/utils";
+import { useCallback, useEffect, useRef, useState } from "react";
+
+/**
+ * Hook para listados paginados de la API: carga la primera página y las
+ * siguientes bajo demanda siguiendo el enlace `next` (cursor o página)
+ * @param {Function} request - Llamada a la API que recibe los parámetros (estable)
+ * @param {Object} params - Parámetros de la primera página
+ * @returns {Object} { items, loading, loadingMore, error, hasMore, loadMore }
+ */
+export function usePaginatedList(request, params = {}) {
+  const [items, setItems] = useState([]);
+  const [next, setNext] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [error, setError] = useState(null);
+  // Descarta las respuestas de una consulta anterior
+  const generation = useRef(0);
+  const paramsKey = JSON.stringify(params);
+
+  useEffect(() => {
+    const current = ++generation.current;
+    setItems([]);
+    setNext(null);
+    setError(null);
+    setLoading(true);
+    setLoadingMore(false);
+    request(JSON.parse(paramsKey))
+      .then(({ data }) => {
+        if (current !== generation.current) return;
+        setItems(data.results || []);
+        setNext(data.next || null);
+      })
+      .catch((err) => {
+        if (current === generation.current) setError(err);
+      })
+      .finally(() => {
+        if (current === generation.current) setLoading(false);
+      });
+  }, [request, paramsKey]);
+
+  const loadMore = useCallback(async () => {
+    if (!next || loadingMore) return;
+    const current = generation.current;
+    setLoadingMore(true);
+    try {
+      const { data } = await request({
+        ...JSON.parse(paramsKey),
+        ...nextPageParams(next),
+      });
+      if (current !== generation.current) return;
+      setItems((previous) => [...previous, ...(data.results || [])]);
+      setNext(data.next || null);
+    } catch (err) {
+      if (current === generation.current) setError(err);
+    } finally {
+      if (current === generation.current) setLoadingMore(false);
+    }
+  }, [request, paramsKey, next, loadingMore]);
+
+  return {
+    items,
+    loading,
+    loadingMore,
+    error,
+    hasMore: Boolean(next),
+    loadMore,
+  };
+}
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import New, Research, Quote, Stock, HistoricalPrice, NewsAnalysis
+from .models import New, Research, Quote, Stock, HistoricalPrice, NewsAnalysis, NewsTicker, WatchedTicker
 
 admin.site.register([New, Research, Quote, Stock, HistoricalPrice])
 admin.site.register(NewsAnalysis)
+admin.site.register(NewsTicker)
+admin.site.register(WatchedTicker)
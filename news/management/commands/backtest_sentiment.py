@@ -0,0 +1,132 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news.services.backtest import run_backtest
+from news.utils.helpers import parse_date
+
+SORT_KEYS = ("pnl", "avg_return", "hit_rate", "profit_factor", "trades")
+
+
+class Command(BaseCommand):
+    help = (
+        "Backtest de la señal combined_score/relevance de las noticias sobre "
+        "los precios guardados. Cada opción de la rejilla admite varios valores "
+        "separados por comas y se simulan todas las combinaciones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("symbols", nargs="*", type=str)
+        parser.add_argument(
+            "--threshold", type=str, default="0.2", help="Umbral de |combined_score|"
+        )
+        parser.add_argument(
+            "--holding", type=str, default="5", help="Barras hasta la salida"
+        )
+        parser.add_argument(
+            "--min-relevance",
+            type=str,
+            default="baja",
+            help="Relevancia mínima (baja, media, alta)",
+        )
+        parser.add_argument(
+            "--stop-loss", type=str, default="0", help="Stop loss (0.05 = 5%%; 0 sin stop)"
+        )
+        parser.add_argument(
+            "--take-profit",
+            type=str,
+            default="0",
+            help="Take profit (0.1 = 10%%; 0 sin objetivo)",
+        )
+        parser.add_argument(
+            "--long-only", action="store_true", help="No abrir cortos con noticias negativas"
+        )
+        parser.add_argument(
+            "--cost-bps",
+            type=float,
+            default=0.0,
+            help="Coste de ida y vuelta por operación en puntos básicos",
+        )
+        parser.add_argument("--since", type=str, help="Desde (YYYY-MM-DD)")
+        parser.add_argument("--until", type=str, help="Hasta (YYYY-MM-DD)")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Procesos para repartir la rejilla",
+        )
+        parser.add_argument(
+            "--sort-by", choices=SORT_KEYS, default="pnl", help="Métrica de ordenación"
+        )
+        parser.add_argument(
+            "--top", type=int, default=10, help="Configuraciones a mostrar"
+        )
+        parser.add_argument("--json", type=str, help="Guarda todos los resultados en JSON")
+
+    def _values(self, options, name, cast):
+        try:
+            values = [cast(v.strip()) for v in options[name].split(",") if v.strip()]
+        except ValueError:
+            raise CommandError(f"Valores inválidos en --{name.replace('_', '-')}")
+        if not values:
+            raise CommandError(f"--{name.replace('_', '-')} no puede estar vacío")
+        return list(dict.fromkeys(values))
+
+    def _day(self, value, name):
+        if not value:
+            return None
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"--{name} debe tener formato YYYY-MM-DD")
+        return day
+
+    def handle(self, *args, **options):
+        grid = {
+            "threshold": self._values(options, "threshold", float),
+            "holding": self._values(options, "holding", int),
+            "min_relevance": self._values(options, "min_relevance", str),
+            "stop_loss": self._values(options, "stop_loss", float),
+            "take_profit": self._values(options, "take_profit", float),
+            "allow_short": [not options["long_only"]],
+            "cost": [options["cost_bps"] / 10000],
+        }
+        if options["workers"] <= 0:
+            raise CommandError("--workers debe ser positivo")
+
+        try:
+            report = run_backtest(
+                grid,
+                symbols=options["symbols"] or None,
+                since=self._day(options["since"], "since"),
+                until=self._day(options["until"], "until"),
+                workers=options["workers"],
+                sort_by=options["sort_by"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for result in report["results"][: options["top"]]:
+            hit_rate = result["hit_rate"]
+            self.stdout.write(
+                f"umbral {result['threshold']:g} | {result['holding']} barras | "
+                f"relevancia >= {result['min_relevance']} | "
+                f"stop {result['stop_loss']:g} | objetivo {result['take_profit']:g}: "
+                f"{result['trades']} operaciones, PnL {result['pnl']:+.4f}, "
+                f"acierto {'-' if hit_rate is None else f'{hit_rate:.1%}'}, "
+                f"drawdown {result['max_drawdown']:.4f}"
+            )
+
+        if options["json"]:
+            with open(options["json"], "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        simulation = report["simulation_seconds"] or 1e-9
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Proceso completado. {report['configurations']} configuraciones "
+                f"sobre {report['events']} eventos: carga {report['load_seconds']:.1f}s, "
+                f"simulación {report['simulation_seconds']:.1f}s "
+                f"({report['configurations'] / simulation:.0f} configuraciones/s)."
+            )
+        )
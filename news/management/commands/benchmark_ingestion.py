@@ -0,0 +1,153 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import numpy as np
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models.signals import post_save
+
+from news.models import New
+from news.services import (
+    ReplayDataSource,
+    fetch_and_save_news,
+    get_circuit_breaker,
+    set_data_source,
+)
+from news.services.rate_limiter import (
+    InMemoryTokenBucketBackend,
+    RateLimiter,
+    set_rate_limiter,
+)
+from news.services.singleflight import SingleFlight, set_singleflight
+from sentiment_analysis.signals import enqueue_news_analysis
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el rendimiento de la ingesta sin red reproduciendo respuestas "
+        "grabadas de Yahoo Finance"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("tickers", nargs="+", type=str, help="Tickers a ingerir")
+        parser.add_argument(
+            "--fixtures",
+            type=str,
+            required=True,
+            help="Directorio con las respuestas grabadas (YAHOO_DATA_SOURCE=record)",
+        )
+        parser.add_argument(
+            "--target",
+            choices=["news", "info", "history"],
+            default="news",
+            help="Ingesta a medir: noticias, información del stock o históricos",
+        )
+        parser.add_argument("--iterations", type=int, default=100)
+        parser.add_argument(
+            "--concurrency", type=int, default=1, help="Hilos en paralelo"
+        )
+        parser.add_argument("--news_count", type=int, default=10)
+        parser.add_argument(
+            "--latency", type=float, default=0.0, help="Latencia base simulada (s)"
+        )
+        parser.add_argument(
+            "--jitter", type=float, default=0.0, help="Latencia extra aleatoria (s)"
+        )
+        parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Probabilidad de error"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--with-analysis",
+            action="store_true",
+            help="Mantener el encolado del análisis de sentimiento al guardar noticias",
+        )
+
+    def _ingest(self, target, ticker, news_count):
+        try:
+            if target == "news":
+                fetch_and_save_news(ticker, news_count)
+            elif target == "info":
+                call_command("fetch_stock_info", ticker, stdout=StringIO())
+            else:
+                call_command("fetch_historical_prices", ticker, stdout=StringIO())
+        finally:
+            connections.close_all()
+
+    def _timed(self, target, ticker, news_count):
+        start = time.perf_counter()
+        try:
+            self._ingest(target, ticker, news_count)
+            error = None
+        except Exception as e:
+            error = type(e).__name__
+        return time.perf_counter() - start, error
+
+    def handle(self, *args, **options):
+        if options["iterations"] <= 0 or options["concurrency"] <= 0:
+            raise CommandError("Las iteraciones y la concurrencia deben ser positivas")
+
+        tickers = [t.strip().upper() for t in options["tickers"]]
+        target = options["target"]
+
+        # Sin límites ni coalescencia para medir la ingesta en sí; el circuit
+        # breaker se mantiene porque forma parte del comportamiento real
+        set_data_source(
+            ReplayDataSource(
+                options["fixtures"],
+                latency=options["latency"],
+                jitter=options["jitter"],
+                error_rate=options["error_rate"],
+                seed=options["seed"],
+            )
+        )
+        set_rate_limiter(
+            RateLimiter(InMemoryTokenBucketBackend(), rate=1e9, capacity=1e9)
+        )
+        set_singleflight(SingleFlight(window=0))
+        get_circuit_breaker().reset()
+        if not options["with_analysis"]:
+            post_save.disconnect(enqueue_news_analysis, sender=New)
+
+        jobs = [tickers[i % len(tickers)] for i in range(options["iterations"])]
+        self.stdout.write(
+            f"Ingesta '{target}' de {len(jobs)} peticiones con "
+            f"{options['concurrency']} hilos..."
+        )
+
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                results = list(
+                    pool.map(
+                        lambda t: self._timed(target, t, options["news_count"]), jobs
+                    )
+                )
+            elapsed = time.perf_counter() - start
+        finally:
+            set_data_source(None)
+            set_rate_limiter(None)
+            set_singleflight(None)
+            get_circuit_breaker().reset()
+            if not options["with_analysis"]:
+                post_save.connect(enqueue_news_analysis, sender=New)
+
+        latencies = np.array([latency for latency, _ in results]) * 1000
+        errors = {}
+        for _, error in results:
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        self.stdout.write(f"Tiempo total: {elapsed:.2f}s")
+        self.stdout.write(f"Throughput: {len(jobs) / elapsed:.1f} peticiones/s")
+        self.stdout.write(
+            f"Latencia (ms): p50={p50:.1f} p90={p90:.1f} p99={p99:.1f} "
+            f"max={latencies.max():.1f}"
+        )
+        if errors:
+            summary = ", ".join(f"{name}={count}" for name, count in errors.items())
+            self.stdout.write(self.style.WARNING(f"Errores: {summary}"))
+        self.stdout.write(self.style.SUCCESS("Benchmark completado."))
@@ -0,0 +1,96 @@
+import json
+import random
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from rest_framework.renderers import JSONRenderer
+
+from news.models import Stock
+from news.renderers import FastJSONRenderer
+from news.serializers import StocksSerializer
+from news.utils.helpers import sanitize_floats
+
+# Valores no finitos habituales en los datos de yfinance
+NON_FINITE = (float("nan"), float("inf"), float("-inf"))
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el renderizado JSON del listado de stocks con sanitize_floats + "
+        "JSONRenderer y con FastJSONRenderer (orjson) sobre stocks sintéticos"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--iterations", type=int, default=5)
+
+    def _stocks(self, rows):
+        rng = random.Random(42)
+        numeric = [
+            f.attname
+            for f in Stock._meta.concrete_fields
+            if isinstance(f, (models.FloatField, models.IntegerField))
+            and not f.primary_key
+        ]
+        stocks = []
+        for i in range(rows):
+            stock = Stock(id=i + 1, symbol=f"SYM{i}", city="New York", sector="Technology")
+            for name in numeric:
+                field = Stock._meta.get_field(name)
+                if isinstance(field, models.FloatField):
+                    value = rng.uniform(-1000, 1000)
+                    # Uno de cada diez valores no es finito
+                    if rng.random() < 0.1:
+                        value = rng.choice(NON_FINITE)
+                else:
+                    value = rng.randint(0, 10**9)
+                setattr(stock, name, value)
+            stocks.append(stock)
+        return stocks
+
+    def _measure(self, label, fn, iterations):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            payload = fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        p50 = np.percentile(timings, 50)
+        self.stdout.write(f"{label}: p50={p50:.1f}ms min={min(timings):.1f}ms")
+        return payload, p50
+
+    def handle(self, *args, **options):
+        if options["rows"] <= 0 or options["iterations"] <= 0:
+            raise CommandError("Las filas y las iteraciones deben ser positivas")
+
+        stocks = self._stocks(options["rows"])
+        serialize_start = time.perf_counter()
+        data = StocksSerializer(stocks, many=True).data
+        serialize_ms = (time.perf_counter() - serialize_start) * 1000
+        self.stdout.write(
+            f"Serializados {len(stocks)} stocks en {serialize_ms:.1f}ms; renderizando..."
+        )
+
+        renderer = JSONRenderer()
+        fast_renderer = FastJSONRenderer()
+        old, old_ms = self._measure(
+            "sanitize_floats + JSONRenderer",
+            lambda: renderer.render(sanitize_floats(data)),
+            options["iterations"],
+        )
+        new, new_ms = self._measure(
+            "FastJSONRenderer",
+            lambda: fast_renderer.render(data),
+            options["iterations"],
+        )
+
+        if json.loads(old) != json.loads(new):
+            raise CommandError("Los dos renderizados no producen el mismo JSON")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Mismo JSON; {old_ms / new_ms:.1f}x más rápido "
+                f"({(serialize_ms + old_ms) / (serialize_ms + new_ms):.1f}x "
+                "contando la serialización)."
+            )
+        )
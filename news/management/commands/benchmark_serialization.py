@@ -0,0 +1,107 @@
+import time
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from news.models import New, NewsAnalysis
+from news.serializers import NewsSerializer, NewsValuesSerializer
+
+THUMBNAIL = {
+    "resolutions": [
+        {"url": f"https://example.com/{w}.jpg", "width": w, "height": w // 2, "tag": f"{w}x"}
+        for w in (140, 320, 640, 1280)
+    ]
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la serialización de listados de noticias con NewsSerializer "
+        "y con NewsValuesSerializer sobre filas sintéticas (se deshacen al terminar)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000)
+        parser.add_argument("--iterations", type=int, default=5)
+
+    def _create_rows(self, rows):
+        now = int(time.time())
+        news = [
+            New(
+                uuid=uuid.uuid4(),
+                title=f"Headline {i} moves the market",
+                publisher="Reuters",
+                link=f"https://example.com/{i}",
+                provider_publish_time=now - i * 60,
+                published_at=datetime.fromtimestamp(now - i * 60, tz=timezone.utc),
+                news_type="STORY",
+                thumbnail=THUMBNAIL,
+                related_tickers=["AAPL", "MSFT"],
+            )
+            for i in range(rows)
+        ]
+        New.objects.bulk_create(news, batch_size=500)
+        NewsAnalysis.objects.bulk_create(
+            [
+                NewsAnalysis(
+                    news=item,
+                    sentiment_score=0.4,
+                    sentiment_label="positivo",
+                    combined_score=0.3,
+                    relevance="media",
+                    keyword_score=0.4,
+                    ticker_count=2,
+                    figures_count=0,
+                )
+                for item in news[::2]
+            ],
+            batch_size=500,
+        )
+        return [item.uuid for item in news]
+
+    def _measure(self, label, fn, iterations):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            payload = fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        p50 = np.percentile(timings, 50)
+        self.stdout.write(f"{label}: p50={p50:.1f}ms min={min(timings):.1f}ms")
+        return payload, p50
+
+    def handle(self, *args, **options):
+        if options["rows"] <= 0 or options["iterations"] <= 0:
+            raise CommandError("Las filas y las iteraciones deben ser positivas")
+
+        renderer = JSONRenderer()
+        with transaction.atomic():
+            uuids = self._create_rows(options["rows"])
+            queryset = New.objects.filter(uuid__in=uuids).order_by(
+                "-published_at", "-uuid"
+            )
+            self.stdout.write(f"Serializando {len(uuids)} noticias...")
+
+            full, full_ms = self._measure(
+                "NewsSerializer",
+                lambda: renderer.render(
+                    NewsSerializer(queryset.select_related("analysis"), many=True).data
+                ),
+                options["iterations"],
+            )
+            fast_serializer = NewsValuesSerializer()
+            fast, fast_ms = self._measure(
+                "NewsValuesSerializer",
+                lambda: renderer.render(
+                    fast_serializer.serialize(fast_serializer.values(queryset))
+                ),
+                options["iterations"],
+            )
+            transaction.set_rollback(True)
+
+        if full != fast:
+            raise CommandError("Las dos serializaciones no producen el mismo JSON")
+        self.stdout.write(self.style.SUCCESS(f"Mismo JSON; {full_ms / fast_ms:.1f}x más rápido."))
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+
+from news.models import New
+from news.services.change_feed import record_changes
+from news.services.dedup import DuplicateDetector
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula la huella de los titulares guardados y enlaza los casi "
+        "duplicados con su noticia canónica"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=1000,
+            help="Noticias por lote de actualización (por defecto: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        detector = DuplicateDetector()
+        pending = []
+        changed = []
+        procesadas = 0
+        duplicadas = 0
+
+        # Orden cronológico: la primera aparición de cada historia es la canónica
+        queryset = New.objects.order_by("provider_publish_time", "uuid").only(
+            "uuid", "title", "provider_publish_time", "title_fingerprint", "canonical"
+        )
+        for news in queryset.iterator(chunk_size=batch_size):
+            fingerprint, canonical = detector.assign(
+                str(news.uuid), news.title, news.provider_publish_time
+            )
+            news.title_fingerprint = fingerprint
+            if str(news.canonical_id or "") != str(canonical or ""):
+                # bulk_update no emite señales: avisar al feed de cambios
+                changed.append(news.uuid)
+            news.canonical_id = canonical
+            pending.append(news)
+            procesadas += 1
+            if canonical:
+                duplicadas += 1
+
+            if len(pending) >= batch_size:
+                New.objects.bulk_update(pending, ["title_fingerprint", "canonical"])
+                record_changes(changed)
+                pending, changed = [], []
+                self.stdout.write(f"{procesadas} noticias procesadas...")
+
+        if pending:
+            New.objects.bulk_update(pending, ["title_fingerprint", "canonical"])
+            record_changes(changed)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Proceso completado. {procesadas} noticias, {duplicadas} duplicadas."
+            )
+        )
@@ -1,56 +1,146 @@
-import yfinance as yf
-from django.core.management.base import BaseCommand
-from news.models.stock_models import HistoricalPrice
+from django.core.management.base import BaseCommand, CommandError
+from news.models import Stock
+from news.services import update_price_history, update_price_histories
+from news.services.price_service import DEFAULT_BATCH_SYMBOLS, DEFAULT_DOWNLOAD_WORKERS
 
 
 class Command(BaseCommand):
-    help = "Obtiene y guarda precios históricos de una acción usando yfinance"
+    help = (
+        "Obtiene y guarda precios históricos usando yfinance; si ya hay precios "
+        "guardados sólo descarga los días que faltan. Admite varios símbolos, "
+        "un fichero (--file) o todos los de la tabla Stock (--all-stocks)"
+    )
 
     def add_arguments(self, parser):
-        parser.add_argument("symbol", type=str, help="Símbolo de la acción (ej. MLGO)")
         parser.add_argument(
-            "--period", type=str, default="1mo", help="Período (ej. 1mo, 3mo, 1y)"
+            "symbols", nargs="*", type=str, help="Símbolos de las acciones (ej. MLGO)"
+        )
+        parser.add_argument(
+            "--file",
+            type=str,
+            help="Fichero con símbolos (uno por línea o separados por comas; # comenta)",
+        )
+        parser.add_argument(
+            "--all-stocks",
+            action="store_true",
+            help="Actualiza todos los símbolos de la tabla Stock",
+        )
+        parser.add_argument(
+            "--period",
+            type=str,
+            default="1mo",
+            help="Período si no hay precios guardados (ej. 1mo, 3mo, 1y, 10y)",
         )
         parser.add_argument(
             "--interval", type=str, default="1d", help="Intervalo (ej. 1d, 1wk)"
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SYMBOLS,
+            help="Símbolos por lote (una escritura en bloque por lote)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_DOWNLOAD_WORKERS,
+            help="Descargas simultáneas por lote",
+        )
+
+    def _read_file(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            raise CommandError(f"No se pudo leer {path}: {e}")
+        symbols = []
+        for line in lines:
+            line = line.split("#", 1)[0]
+            symbols.extend(s.strip() for s in line.split(",") if s.strip())
+        return symbols
+
+    def _symbols(self, options):
+        symbols = list(options["symbols"])
+        if options["file"]:
+            symbols.extend(self._read_file(options["file"]))
+        if options["all_stocks"]:
+            symbols.extend(
+                Stock.objects.order_by("symbol").values_list("symbol", flat=True)
+            )
+        return list(dict.fromkeys(s.upper() for s in symbols))
 
     def handle(self, *args, **kwargs):
-        symbol = kwargs["symbol"].upper()
-        period = kwargs["period"]
-        interval = kwargs["interval"]
+        symbols = self._symbols(kwargs)
+        if not symbols:
+            raise CommandError("Indica al menos un símbolo, --file o --all-stocks")
+        if kwargs["batch_size"] <= 0 or kwargs["workers"] <= 0:
+            raise CommandError("El tamaño de lote y los workers deben ser positivos")
+
+        if len(symbols) == 1:
+            self._single(symbols[0], kwargs["period"], kwargs["interval"])
+        else:
+            self._universe(symbols, kwargs)
 
+    def _single(self, symbol, period, interval):
         self.stdout.write(f"Obteniendo datos para {symbol}...")
 
-        ticker = yf.Ticker(symbol)
-        df = ticker.history(period=period, interval=interval)
+        try:
+            result = update_price_history(symbol, period=period, interval=interval)
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f"Error al obtener precios: {e}"))
+            return
 
-        if df.empty:
+        if result["since"]:
+            self.stdout.write(f"Último precio guardado: {result['since']}")
+        if not result["saved"]:
             self.stdout.write(
-                self.style.WARNING(f"No se encontraron datos para {symbol}")
+                self.style.WARNING(f"No se encontraron datos nuevos para {symbol}")
             )
             return
 
-        registros_creados = 0
-        for fecha, fila in df.iterrows():
-            obj, creado = HistoricalPrice.objects.update_or_create(
-                symbol=symbol,
-                date=fecha.date(),
-                defaults={
-                    "open": fila["Open"],
-                    "high": fila["High"],
-                    "low": fila["Low"],
-                    "close": fila["Close"],
-                    "volume": fila["Volume"],
-                    "dividends": fila.get("Dividends", 0.0),
-                    "stock_splits": fila.get("Stock Splits", 0.0),
-                },
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Proceso completado. {result['created']} registros nuevos añadidos "
+                f"({result['saved']} barras guardadas)."
             )
-            if creado:
-                registros_creados += 1
+        )
+
+    def _report_batch(self, batch):
+        rate = batch["saved"] / batch["elapsed"] if batch["elapsed"] else 0
+        line = (
+            f"Lote {batch['batch']}/{batch['batches']}: {batch['symbols']} símbolos, "
+            f"{batch['saved']} barras ({batch['created']} nuevas) en "
+            f"{batch['elapsed']:.1f}s ({rate:.0f} barras/s)"
+        )
+        if batch["errors"]:
+            line += f", errores: {', '.join(sorted(batch['errors']))}"
+            self.stdout.write(self.style.WARNING(line))
+        else:
+            self.stdout.write(line)
+
+    def _universe(self, symbols, options):
+        self.stdout.write(
+            f"Actualizando precios de {len(symbols)} símbolos en lotes de "
+            f"{options['batch_size']} ({options['workers']} descargas simultáneas)..."
+        )
+        totals = update_price_histories(
+            symbols,
+            period=options["period"],
+            interval=options["interval"],
+            batch_size=options["batch_size"],
+            max_workers=options["workers"],
+            on_batch=self._report_batch,
+        )
 
+        elapsed = totals["elapsed"] or 1e-9
+        errors = totals["errors"]
         self.stdout.write(
             self.style.SUCCESS(
-                f"Proceso completado. {registros_creados} registros nuevos añadidos."
+                f"Proceso completado. {totals['created']} registros nuevos añadidos "
+                f"({totals['saved']} barras guardadas) en {totals['elapsed']:.1f}s: "
+                f"{totals['saved'] / elapsed:.0f} barras/s, "
+                f"{len(symbols) / elapsed:.1f} símbolos/s."
             )
         )
+        for symbol, error in sorted(errors.items()):
+            self.stderr.write(self.style.ERROR(f"{symbol}: {error}"))
@@ -1,7 +1,11 @@
 from django.core.management.base import BaseCommand
-import yfinance as yf
 
-from news.models.news_models import New
+from news.services import (
+    build_duplicate_detector,
+    fetch_news,
+    process_news_item,
+    validate_news_data,
+)
 
 
 class Command(BaseCommand):
@@ -30,8 +34,7 @@ class Command(BaseCommand):
         self.stdout.write(f"Obteniendo noticias para {ticker}...")
 
         try:
-            search_result = yf.Search(ticker, news_count=news_count)
-            news_list = search_result.news
+            news_list = fetch_news(ticker, news_count)
         except Exception as e:
             self.stderr.write(self.style.ERROR(f"Error al obtener noticias: {e}"))
             return
@@ -41,40 +44,21 @@ class Command(BaseCommand):
             return
 
         registros_creados = 0
+        detector = build_duplicate_detector(news_list)
         for news_data in news_list:
-            uuid_val = news_data.get("uuid")
             title = news_data.get("title")
-            publisher = news_data.get("publisher")
-            link = news_data.get("link")
-            provider_publish_time = news_data.get("providerPublishTime")
-            news_type = news_data.get("type")
-            thumbnail = news_data.get("thumbnail")
-            related_tickers = news_data.get("relatedTickers")
 
-            if not uuid_val or not title or not link:
+            if not validate_news_data(news_data):
                 self.stderr.write(
                     self.style.WARNING("Noticia con datos incompletos, se omite.")
                 )
                 continue
 
             try:
-                obj, created = New.objects.update_or_create(
-                    uuid=uuid_val,
-                    defaults={
-                        "title": title,
-                        "publisher": publisher,
-                        "link": link,
-                        "provider_publish_time": (
-                            int(provider_publish_time)
-                            if provider_publish_time
-                            else None
-                        ),
-                        "news_type": news_type,
-                        "thumbnail": thumbnail,
-                        "related_tickers": related_tickers,
-                    },
-                )
+                obj, created = process_news_item(news_data, detector)
                 action = "Creada" if created else "Actualizada"
+                if obj.canonical_id:
+                    action += " (duplicada)"
                 self.stdout.write(f"{action} noticia: {title}")
                 if created:
                     registros_creados += 1
@@ -1,8 +1,7 @@
 from django.core.management.base import BaseCommand
-import yfinance as yf
 from news.models import Quote
+from news.services import fetch_quotes, UpstreamUnavailableError
 from datetime import datetime
-import requests
 
 
 class Command(BaseCommand):
@@ -26,15 +25,11 @@ class Command(BaseCommand):
         self.stdout.write(f"Obteniendo {max_results} quotes para el ticker {ticker}...")
 
         try:
-            search_instance = yf.Search(ticker, max_results=max_results)
-            # Aumenta el timeout si es necesario
-            search_instance.timeout = 60
-            quotes_list = search_instance.quotes
-        except requests.exceptions.ReadTimeout:
+            quotes_list = fetch_quotes(ticker, max_results)
+        except UpstreamUnavailableError as e:
             self.stdout.write(
                 self.style.ERROR(
-                    "La petición a Yahoo Finance agotó el tiempo de espera (timeout). "
-                    "Intenta aumentar el timeout o verifica tu conexión a internet."
+                    f"{e}. Reintenta en {e.retry_after:.0f} segundos."
                 )
             )
             return
@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
-from models import Research
-from services import fetch_research
+from news.models import Research
+from news.services import fetch_research
 
 
 class Command(BaseCommand):
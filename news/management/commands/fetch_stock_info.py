@@ -1,6 +1,6 @@
-import yfinance as yf
 from django.core.management.base import BaseCommand
 from news.models import Stock
+from news.services import fetch_stock_info
 
 
 class Command(BaseCommand):
@@ -16,7 +16,7 @@ class Command(BaseCommand):
         self.stdout.write(f"Fetching stock information for {ticker_symbol}...")
 
         try:
-            stock_info = yf.Ticker(ticker_symbol).info
+            stock_info = fetch_stock_info(ticker_symbol)
             self.stdout.write(f"El stock_info: {stock_info}")
             stock, created = Stock.objects.update_or_create(
                 symbol=stock_info.get("symbol"),
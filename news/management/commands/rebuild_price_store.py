@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news.models import HistoricalPrice
+from news.services.price_store import get_price_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el almacén columnar de precios desde HistoricalPrice "
+        "(todos los símbolos si no se indica ninguno)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("symbols", nargs="*", type=str)
+
+    def handle(self, *args, **options):
+        store = get_price_store()
+        if store is None:
+            raise CommandError("El almacén de precios está desactivado (PRICE_STORE)")
+
+        symbols = [s.upper() for s in options["symbols"]] or sorted(
+            set(HistoricalPrice.objects.values_list("symbol", flat=True).order_by())
+        )
+        start = time.monotonic()
+        bars = 0
+        for symbol in symbols:
+            bars += len(store.rebuild(symbol))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Proceso completado. {len(symbols)} símbolos y {bars} barras en "
+                f"{store.directory} ({time.monotonic() - start:.1f}s)."
+            )
+        )
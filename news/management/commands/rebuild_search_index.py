@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from news.services.search import news_index
+from sentiment_analysis.search import article_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Recrea el índice de texto completo de noticias y artículos "
+        "(necesario en SQLite si una migración rehízo las tablas)"
+    )
+
+    def handle(self, *args, **options):
+        for name, index in (("noticias", news_index()), ("artículos", article_index())):
+            index.install()
+            self.stdout.write(f"Índice de {name} reconstruido ({index.table})")
+        self.stdout.write(self.style.SUCCESS("Proceso completado."))
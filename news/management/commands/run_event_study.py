@@ -0,0 +1,127 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from news.services.event_study import (
+    DEFAULT_ESTIMATION_WINDOW,
+    event_returns,
+    parse_group_by,
+    parse_windows,
+    summarize_events,
+)
+from news.utils.helpers import parse_date
+
+
+class Command(BaseCommand):
+    help = (
+        "Estudio de eventos noticia-precio: retornos hacia delante y anormales "
+        "tras cada noticia analizada, agrupados por sentimiento y relevancia "
+        "(todo el universo si no se indica ningún símbolo)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("symbols", nargs="*", type=str)
+        parser.add_argument(
+            "--windows", type=str, default="", help="Ventanas en barras (ej. 1,3,5,10)"
+        )
+        parser.add_argument(
+            "--benchmark",
+            type=str,
+            help="Símbolo de referencia para los retornos anormales (ej. SPY)",
+        )
+        parser.add_argument(
+            "--estimation",
+            type=int,
+            default=DEFAULT_ESTIMATION_WINDOW,
+            help="Barras para el retorno medio si no hay benchmark",
+        )
+        parser.add_argument("--since", type=str, help="Desde (YYYY-MM-DD)")
+        parser.add_argument("--until", type=str, help="Hasta (YYYY-MM-DD)")
+        parser.add_argument(
+            "--group-by",
+            type=str,
+            default="",
+            help="Campos de agrupación (sentiment_label,relevance)",
+        )
+        parser.add_argument(
+            "--events-csv", type=str, help="Guarda los retornos por evento en CSV"
+        )
+        parser.add_argument(
+            "--json", type=str, help="Guarda el resumen completo en JSON"
+        )
+
+    def _day(self, value, name):
+        if not value:
+            return None
+        day = parse_date(value)
+        if day is None:
+            raise CommandError(f"--{name} debe tener formato YYYY-MM-DD")
+        return day
+
+    def _report_chunk(self, chunk):
+        self.stdout.write(
+            f"Bloque {chunk['chunk']}/{chunk['chunks']}: {chunk['symbols']} símbolos, "
+            f"{chunk['events']} eventos en {chunk['elapsed']:.1f}s"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            windows = parse_windows(options["windows"])
+            group_by = parse_group_by(options["group_by"])
+            start = time.monotonic()
+            frame = event_returns(
+                options["symbols"] or None,
+                windows,
+                benchmark=options["benchmark"],
+                since=self._day(options["since"], "since"),
+                until=self._day(options["until"], "until"),
+                estimation=options["estimation"],
+                on_chunk=self._report_chunk,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        summary = summarize_events(frame, windows, group_by)
+        elapsed = time.monotonic() - start
+
+        for bucket in summary["buckets"]:
+            label = " / ".join(str(bucket[field]) for field in group_by)
+            self.stdout.write(f"{label}: {bucket['events']} eventos")
+            for window in windows:
+                returns = bucket["returns"][str(window)]
+                abnormal = bucket["abnormal"][str(window)]
+                if not returns["count"]:
+                    continue
+                self.stdout.write(
+                    f"  {window:>3}d  retorno {returns['mean']:+.4%}  "
+                    f"anormal {self._pct(abnormal['mean'])}  "
+                    f"acierto {returns['hit_rate']:.1%}  (n={returns['count']})"
+                )
+
+        if options["events_csv"]:
+            frame.to_csv(options["events_csv"], index=False)
+        if options["json"]:
+            with open(options["json"], "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "windows": list(windows),
+                        "benchmark": options["benchmark"],
+                        "group_by": list(group_by),
+                        **summary,
+                    },
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Proceso completado. {summary['events']} eventos de "
+                f"{summary['symbols']} símbolos en {elapsed:.1f}s."
+            )
+        )
+
+    @staticmethod
+    def _pct(value):
+        return "-" if value is None else f"{value:+.4%}"
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 14:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WatchedTicker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=20, unique=True)),
+                ('news_count', models.PositiveIntegerField(default=10)),
+                ('active', models.BooleanField(default=True)),
+                ('news_velocity', models.FloatField(default=0.0)),
+                ('poll_interval', models.PositiveIntegerField(default=3600)),
+                ('last_polled_at', models.DateTimeField(blank=True, null=True)),
+                ('next_poll_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['next_poll_at'],
+                'indexes': [models.Index(fields=['active', 'next_poll_at'], name='news_watche_active_0c8921_idx')],
+            },
+        ),
+    ]
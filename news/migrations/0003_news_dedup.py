@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 14:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_watchedticker'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='new',
+            name='canonical',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='news.new'),
+        ),
+        migrations.AddField(
+            model_name='new',
+            name='title_fingerprint',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
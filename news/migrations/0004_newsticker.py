@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-19 14:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_news_tickers(apps, schema_editor):
+    New = apps.get_model('news', 'New')
+    NewsTicker = apps.get_model('news', 'NewsTicker')
+    batch = []
+    rows = New.objects.values_list('uuid', 'related_tickers', 'provider_publish_time')
+    for uuid, related_tickers, publish_time in rows.iterator(chunk_size=2000):
+        symbols = {str(t).strip().upper() for t in related_tickers or [] if str(t).strip()}
+        batch.extend(
+            NewsTicker(news_id=uuid, symbol=symbol, publish_time=publish_time)
+            for symbol in symbols
+        )
+        if len(batch) >= 2000:
+            NewsTicker.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        NewsTicker.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_news_dedup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsTicker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('symbol', models.CharField(max_length=20)),
+                ('publish_time', models.BigIntegerField()),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tickers', to='news.new')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['symbol', '-publish_time'], name='news_newsti_symbol_0a85e6_idx')],
+                'constraints': [models.UniqueConstraint(fields=('news', 'symbol'), name='unique_news_ticker')],
+            },
+        ),
+        migrations.RunPython(backfill_news_tickers, migrations.RunPython.noop),
+    ]
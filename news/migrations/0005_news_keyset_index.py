@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_newsticker'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='new',
+            index=models.Index(fields=['-provider_publish_time', '-uuid'], name='news_new_provide_e12c68_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2 on 2026-10-19 14:23
+
+from datetime import datetime, timezone
+
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 2000
+
+
+def backfill_published_at(apps, schema_editor):
+    """
+    Rellena published_at por lotes de BATCH_SIZE filas, cada uno en su propia
+    transacción, para no bloquear la tabla durante todo el backfill
+    """
+    New = apps.get_model('news', 'New')
+    last_pk = None
+    while True:
+        rows = New.objects.filter(published_at__isnull=True).order_by('uuid')
+        if last_pk is not None:
+            rows = rows.filter(uuid__gt=last_pk)
+        batch = list(rows.only('uuid', 'provider_publish_time')[:BATCH_SIZE])
+        if not batch:
+            break
+        for news in batch:
+            news.published_at = datetime.fromtimestamp(
+                news.provider_publish_time, tz=timezone.utc
+            )
+        with transaction.atomic():
+            New.objects.bulk_update(batch, ['published_at'])
+        last_pk = batch[-1].uuid
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('news', '0005_news_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='new',
+            name='news_new_provide_e12c68_idx',
+        ),
+        migrations.AddField(
+            model_name='new',
+            name='published_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(backfill_published_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='new',
+            name='published_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='new',
+            index=models.Index(fields=['-published_at', '-uuid'], name='news_new_publish_58a62f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsanalysis',
+            index=models.Index(fields=['sentiment_label', 'relevance', 'news'], name='news_newsan_sentime_9df2a3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsanalysis',
+            index=models.Index(fields=['relevance', 'news'], name='news_newsan_relevan_25b236_idx'),
+        ),
+    ]
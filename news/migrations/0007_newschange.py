@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-19 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_news_published_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('news_uuid', models.UUIDField()),
+                ('op', models.CharField(choices=[('upsert', 'Alta o cambio'), ('delete', 'Borrado')], max_length=6)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
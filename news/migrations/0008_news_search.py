@@ -0,0 +1,89 @@
+from django.db import migrations
+
+# SQL en línea (y no news.services.search.FullTextIndex) para que la migración
+# no cambie si cambia el código vivo. Debe coincidir con FullTextIndex(New,
+# ['title', 'publisher']), que es lo que recrea ``rebuild_search_index``.
+#
+# En SQLite, cualquier AlterField/AddField que rehaga la tabla news_new (copia
+# a una tabla nueva y renombra) borra estos triggers sin avisar: esas
+# migraciones deben ir seguidas de ``python manage.py rebuild_search_index``.
+# Lo comprueba SearchIndexMigrationTests en news/tests.py.
+
+POSTGRESQL_INSTALL = [
+    """
+    ALTER TABLE "news_new" ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce("title", '')), 'A')
+        || setweight(to_tsvector('english', coalesce("publisher", '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS "news_new_search_gin" ON "news_new" USING GIN (search_vector)',
+]
+
+POSTGRESQL_UNINSTALL = [
+    'ALTER TABLE "news_new" DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS "news_new_fts" USING fts5(
+        key UNINDEXED, "title", "publisher", tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS "news_new_fts_ai" AFTER INSERT ON "news_new" BEGIN
+        INSERT INTO "news_new_fts" (key, "title", "publisher")
+        VALUES (new."uuid", new."title", new."publisher");
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS "news_new_fts_ad" AFTER DELETE ON "news_new" BEGIN
+        DELETE FROM "news_new_fts" WHERE key = old."uuid";
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS "news_new_fts_au" AFTER UPDATE ON "news_new" BEGIN
+        DELETE FROM "news_new_fts" WHERE key = old."uuid";
+        INSERT INTO "news_new_fts" (key, "title", "publisher")
+        VALUES (new."uuid", new."title", new."publisher");
+    END
+    """,
+    'DELETE FROM "news_new_fts"',
+    """
+    INSERT INTO "news_new_fts" (key, "title", "publisher")
+    SELECT "uuid", "title", "publisher" FROM "news_new"
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS "news_new_fts_ai"',
+    'DROP TRIGGER IF EXISTS "news_new_fts_ad"',
+    'DROP TRIGGER IF EXISTS "news_new_fts_au"',
+    'DROP TABLE IF EXISTS "news_new_fts"',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+install_search_index = _run(
+    {'postgresql': POSTGRESQL_INSTALL, 'sqlite': SQLITE_INSTALL}
+)
+uninstall_search_index = _run(
+    {'postgresql': POSTGRESQL_UNINSTALL, 'sqlite': SQLITE_UNINSTALL}
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_newschange'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
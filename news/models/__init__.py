@@ -1,10 +1,14 @@
-from .news_models import New, NewsAnalysis
+from .news_models import New, NewsAnalysis, NewsTicker
 from .stock_models import Stock, CompanyOfficer, HistoricalPrice
 from .research_models import Research, Quote
+from .watchlist_models import WatchedTicker
+from .change_models import NewsChange
+from .job_models import IngestionJob
 
 __all__ = [
     'New',
     'NewsAnalysis',
+    'NewsTicker',
     
     'Stock',
     'CompanyOfficer', 
@@ -12,4 +16,8 @@ __all__ = [
     
     'Research',
     'Quote',
+
+    'WatchedTicker',
+    'NewsChange',
+    'IngestionJob',
 ]
\ No newline at end of file
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class NewsChange(models.Model):
+    """
+    Registro de cambios de noticias para la sincronización incremental.
+
+    El ``id`` autoincremental es la secuencia de cambios: los clientes piden
+    los cambios posteriores al último ``id`` que vieron.
+    """
+    OP_UPSERT = "upsert"
+    OP_DELETE = "delete"
+    OP_CHOICES = [(OP_UPSERT, "Alta o cambio"), (OP_DELETE, "Borrado")]
+
+    id = models.BigAutoField(primary_key=True)
+    # Sin FK: el cambio debe sobrevivir al borrado de la noticia (tombstone)
+    news_uuid = models.UUIDField()
+    op = models.CharField(max_length=6, choices=OP_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.id} {self.op} {self.news_uuid}"
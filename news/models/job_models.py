@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db import models
+
+
+class IngestionJob(models.Model):
+    """
+    Job de Celery encolado por un usuario; sólo ese usuario puede consultar
+    su estado y resultado
+    """
+    job_id = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="ingestion_jobs"
+    )
+    symbol = models.CharField(max_length=20)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.job_id} ({self.symbol})"
@@ -1,3 +1,5 @@
+from datetime import datetime, timezone as dt_timezone
+
 from django.db import models
 import uuid
 
@@ -10,17 +12,70 @@ class New(models.Model):
     link = models.URLField()
     # Se almacena como entero; si se tiene que convertir a datetime, se puede hacer en la lógica de la aplicación
     provider_publish_time = models.BigIntegerField()
+    # provider_publish_time como fecha indexada para filtros por rango y orden
+    published_at = models.DateTimeField()
     # Campo para el tipo de noticia
     news_type = models.CharField(max_length=50)
     # Usamos JSONField para almacenar el diccionario "thumbnail" que incluye la lista de resoluciones
     thumbnail = models.JSONField(null=True, blank=True)
     # Usamos JSONField para almacenar la lista de tickers relacionados
     related_tickers = models.JSONField(null=True, blank=True)
+    # Huella SimHash del título para detectar la misma historia sindicada
+    title_fingerprint = models.BigIntegerField(null=True, blank=True)
+    # Noticia canónica de la que esta es un casi duplicado (None si es canónica)
+    canonical = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="duplicates",
+    )
+
+    class Meta:
+        indexes = [
+            # Orden de la paginación por cursor y filtros since/until de /api/news/
+            models.Index(fields=["-published_at", "-uuid"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.published_at = datetime.fromtimestamp(
+            self.provider_publish_time, tz=dt_timezone.utc
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "provider_publish_time" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "published_at"}
+        super().save(*args, **kwargs)
 
     # dato que se va a observar en el listado dentro de /admin
     def __str__(self):
         return self.title
 
+
+class NewsTicker(models.Model):
+    """
+    Relación normalizada noticia-ticker.
+
+    Replica ``New.related_tickers`` con la fecha de publicación para que los
+    listados por símbolo sean un recorrido del índice (symbol, publish_time).
+    """
+    news = models.ForeignKey(New, on_delete=models.CASCADE, related_name="tickers")
+    symbol = models.CharField(max_length=20)
+    publish_time = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["news", "symbol"], name="unique_news_ticker"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["symbol", "-publish_time"]),
+        ]
+
+    def __str__(self):
+        return f"{self.symbol} - {self.news_id}"
+
+
 class NewsAnalysis(models.Model):
     news = models.OneToOneField(
         New,
@@ -34,3 +89,10 @@ class NewsAnalysis(models.Model):
     keyword_score    = models.FloatField()
     ticker_count     = models.IntegerField()
     figures_count    = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            # Filtros ?sentiment= y ?relevance= de /api/news/ sin leer la tabla
+            models.Index(fields=["sentiment_label", "relevance", "news"]),
+            models.Index(fields=["relevance", "news"]),
+        ]
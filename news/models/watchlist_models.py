@@ -0,0 +1,22 @@
+from django.db import models
+from django.utils import timezone
+
+
+class WatchedTicker(models.Model):
+    # Ticker que el planificador consulta periódicamente en Yahoo
+    symbol = models.CharField(max_length=20, unique=True)
+    news_count = models.PositiveIntegerField(default=10)
+    active = models.BooleanField(default=True)
+    # Noticias nuevas por hora observadas (media exponencial)
+    news_velocity = models.FloatField(default=0.0)
+    # Intervalo actual entre consultas, en segundos
+    poll_interval = models.PositiveIntegerField(default=3600)
+    last_polled_at = models.DateTimeField(null=True, blank=True)
+    next_poll_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["next_poll_at"]
+        indexes = [models.Index(fields=["active", "next_poll_at"])]
+
+    def __str__(self):
+        return f"{self.symbol} (cada {self.poll_interval}s)"
@@ -0,0 +1,244 @@
+"""
+Paginación por cursor (keyset) para los listados de la API.
+
+A diferencia de ``LIMIT/OFFSET``, cada página se pide a partir de los valores
+de ordenación de la última fila servida, así que la consulta es un recorrido
+de índice acotado al tamaño de página sin importar cuántas filas tenga la
+tabla, y las filas nuevas no desplazan las páginas ya servidas. No se ejecuta
+ningún ``count()``.
+
+El cursor es opaco para el cliente: codifica los valores de la fila frontera
+y la dirección (siguiente o anterior).
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError as DRFValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_PAGE_SIZE = 200
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación keyset sobre ``ordering``.
+
+    El último campo de ``ordering`` debe ser único para que el orden sea
+    total y los cursores estables. El tamaño de página se toma de
+    ``settings.API_PAGE_SIZE`` y se puede cambiar con ``?page_size=``
+    hasta ``max_page_size``.
+    """
+
+    ordering: Sequence[str] = ()
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = DEFAULT_MAX_PAGE_SIZE
+    invalid_cursor_message = "Cursor inválido"
+
+    def get_page_size(self, request) -> int:
+        default = getattr(settings, "API_PAGE_SIZE", DEFAULT_PAGE_SIZE)
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, default))
+        except (TypeError, ValueError):
+            size = default
+        return max(1, min(size, self.max_page_size))
+
+    # Cursor --------------------------------------------------------------
+
+    def _fields(self, model):
+        return [model._meta.get_field(name.lstrip("-")) for name in self.ordering]
+
+    def _cursor_value(self, field, obj) -> str:
+        if not isinstance(obj, dict):
+            # value_to_string conserva la precisión completa (microsegundos)
+            return field.value_to_string(obj)
+        # Filas de .values()
+        value = obj[field.attname]
+        return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+    def encode_cursor(self, obj, reverse: bool) -> str:
+        values = [
+            self._cursor_value(field, obj) for field in self._fields(self.model)
+        ]
+        raw = json.dumps({"v": values, "r": reverse})
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, model, token: str):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            fields = self._fields(model)
+            if len(data["v"]) != len(fields):
+                raise ValueError
+            values = [field.to_python(v) for field, v in zip(fields, data["v"])]
+            return values, bool(data.get("r"))
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+            UnicodeError,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _after(self, values: List[Any], reverse: bool) -> Q:
+        """
+        Condición "fila posterior a ``values``" en el orden de la página:
+        ``(a, b) > (x, y)`` se expande a ``a > x OR (a = x AND b > y)``
+        """
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, values):
+            field = name.lstrip("-")
+            descending = name.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    # Paginación ------------------------------------------------------------
+
+    def paginate_queryset(self, queryset, request, view=None) -> List[Any]:
+        self.request = request
+        self.model = queryset.model
+        self.page_size = self.get_page_size(request)
+        token = request.query_params.get(self.cursor_query_param)
+
+        reverse = False
+        if token:
+            values, reverse = self.decode_cursor(queryset.model, token)
+            queryset = queryset.filter(self._after(values, reverse))
+
+        ordering = list(self.ordering)
+        if reverse:
+            ordering = [
+                name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+            ]
+        rows = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Hacia delante, la fila del cursor queda detrás; hacia atrás, delante
+        if reverse:
+            self.has_next, self.has_previous = bool(rows), has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(token) and bool(rows)
+        self.page = rows
+        return rows
+
+    def _link(self, obj, reverse: bool) -> str:
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(obj, reverse)
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class NewsPagination(KeysetPagination):
+    ordering = ("-published_at", "-uuid")
+
+
+class NewsTickerPagination(KeysetPagination):
+    """
+    Feed por símbolo: recorre el índice (symbol, publish_time) de NewsTicker
+    """
+
+    ordering = ("-publish_time", "-id")
+
+
+class StockPagination(KeysetPagination):
+    ordering = ("symbol",)
+
+
+class RankedPagination:
+    """
+    Paginación por ``?page=`` para resultados ordenados por relevancia.
+
+    El orden por ranking no admite cursores keyset; se pide una fila de más
+    para saber si hay página siguiente sin ejecutar ``count()``.
+    """
+
+    default_page_size = 20
+    max_page_size = 100
+
+    def __init__(self, request):
+        self.request = request
+        try:
+            self.page = int(request.query_params.get("page", 1))
+            self.page_size = int(
+                request.query_params.get("page_size", self.default_page_size)
+            )
+        except ValueError:
+            raise DRFValidationError(
+                {"page": "Los parámetros page y page_size deben ser enteros"}
+            )
+        self.page = max(1, self.page)
+        self.page_size = max(1, min(self.page_size, self.max_page_size))
+
+    @property
+    def offset(self) -> int:
+        return (self.page - 1) * self.page_size
+
+    @property
+    def limit(self) -> int:
+        # Una fila extra indica si existe la página siguiente
+        return self.page_size + 1
+
+    def _link(self, page: int) -> str:
+        return replace_query_param(self.request.build_absolute_uri(), "page", page)
+
+    def paginate(self, rows: List[Any]) -> List[Any]:
+        """
+        Recorta la fila extra pedida con ``limit``
+        """
+        self.has_next = len(rows) > self.page_size
+        return rows[: self.page_size]
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            {
+                "next": self._link(self.page + 1) if self.has_next else None,
+                "previous": self._link(self.page - 1) if self.page > 1 else None,
+                "results": data,
+            }
+        )
@@ -0,0 +1,51 @@
+"""
+Codificación JSON con orjson para las respuestas de la API.
+
+orjson escribe los ``float`` no finitos (NaN, ±Inf) como ``null`` mientras
+codifica, así que los datos de mercado de yfinance no necesitan un recorrido
+previo con ``sanitize_floats``. Los tipos que orjson no conoce (y las fechas,
+para conservar el formato de DRF) pasan por el ``default`` del encoder de DRF.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_PASSTHROUGH_DATETIME
+)
+
+_fallback = JSONEncoder()
+
+
+def dumps(data, indent: bool = False) -> bytes:
+    """
+    JSON en bytes con NaN/Inf convertidos en ``null``
+    """
+    options = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+    return orjson.dumps(data, default=_fallback.default, option=options)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` de DRF sobre orjson
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        return dumps(data, indent=bool(indent))
+
+
+class FastJSONEncoder(JSONEncoder):
+    """
+    Encoder para ``JsonResponse(..., encoder=FastJSONEncoder)`` con la misma
+    codificación que ``FastJSONRenderer``
+    """
+
+    def encode(self, o):
+        return dumps(o, indent=bool(self.indent)).decode("utf-8")
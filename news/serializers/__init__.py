@@ -1,9 +1,10 @@
-from .news_serializers import NewsSerializer, NewsAnalysisSerializer
+from .news_serializers import NewsSerializer, NewsAnalysisSerializer, NewsValuesSerializer
 from .stock_serializers import StocksSerializer, HistoricalPriceSerializer
 
 __all__ = [
     'NewsSerializer',
     'NewsAnalysisSerializer',
+    'NewsValuesSerializer',
     'StocksSerializer', 
     'HistoricalPriceSerializer',
 ]
\ No newline at end of file
@@ -1,8 +1,13 @@
+from functools import lru_cache
+from operator import itemgetter
+
+from django.db import models
 from rest_framework import serializers
 from sentiment_analysis.serializers import (
     NewsAnalysisSerializer as SentimentAnalysisSerializer,
 )
 from ..models import New, NewsAnalysis
+from ..utils.fieldsets import SparseFieldsetMixin
 
 
 class NewsAnalysisSerializer(serializers.ModelSerializer):
@@ -21,9 +26,11 @@ class NewsAnalysisSerializer(serializers.ModelSerializer):
         return data
 
 
-class NewsSerializer(serializers.ModelSerializer):
+class NewsSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
-    Serializer principal para noticias con análisis incluido
+    Serializer principal para noticias con análisis incluido.
+
+    Admite ``?fields=`` / ``?exclude=`` en la petición del contexto.
     """
 
     analysis = SentimentAnalysisSerializer(read_only=True)
@@ -32,10 +39,86 @@ class NewsSerializer(serializers.ModelSerializer):
         model = New
         fields = "__all__"
 
-    def to_representation(self, instance):
-        """
-        Personalizar la representación de salida
-        """
-        data = super().to_representation(instance)
-        # Aquí puedes añadir lógica personalizada
-        return data
+
+def _str_or_none(value):
+    return str(value) if value is not None else None
+
+
+@lru_cache(maxsize=None)
+def _news_layout():
+    """
+    ``(clave, columnas)`` de cada campo de ``NewsSerializer``, en su orden.
+
+    Se deriva de los campos del serializer para que un campo nuevo del modelo
+    aparezca en ambos sin tocar ``NewsValuesSerializer``.
+    """
+    layout = []
+    for name in NewsSerializer().fields:
+        if name == "analysis":
+            columns = [
+                "analysis__id",
+                *(f"analysis__{f}" for f in NewsValuesSerializer.analysis_fields),
+            ]
+        else:
+            columns = [New._meta.get_field(name).attname]
+        layout.append((name, columns))
+    return tuple(layout)
+
+
+class NewsValuesSerializer:
+    """
+    Serialización de sólo lectura para listados, con la misma forma JSON que
+    ``NewsSerializer``.
+
+    Lee las columnas con ``.values()`` (el análisis se une en la misma
+    consulta) y arma los diccionarios directamente, sin instanciar modelos
+    ni recorrer los campos de DRF por cada fila. Las claves y su orden salen
+    de ``NewsSerializer().fields``.
+
+    ``fields`` limita la salida (y las columnas leídas) a esos campos;
+    ``required_columns`` se leen siempre aunque no se devuelvan.
+    """
+
+    analysis_fields = SentimentAnalysisSerializer.Meta.fields
+
+    def __init__(self, fields=None, required_columns=()):
+        datetime_field = serializers.DateTimeField()
+        layout = [
+            (name, columns)
+            for name, columns in _news_layout()
+            if fields is None or name in fields
+        ]
+        self.fields = [name for name, _ in layout]
+        self._columns = [c for _, columns in layout for c in columns]
+        self.required_columns = list(required_columns)
+        # Conversión de cada clave a partir de la fila de values()
+        self._getters = []
+        for name, columns in layout:
+            if name == "analysis":
+                getter = self._analysis
+            else:
+                getter = self._getter(columns[0], datetime_field)
+            self._getters.append((name, getter))
+
+    @staticmethod
+    def _getter(column, datetime_field):
+        field = New._meta.get_field(column)
+        if isinstance(field, models.UUIDField) or field.is_relation:
+            return lambda row: _str_or_none(row[column])
+        if isinstance(field, models.DateTimeField):
+            return lambda row: datetime_field.to_representation(row[column])
+        return itemgetter(column)
+
+    def values(self, queryset):
+        return queryset.values(*dict.fromkeys([*self._columns, *self.required_columns]))
+
+    def _analysis(self, row):
+        if row["analysis__id"] is None:
+            return None
+        return {name: row[f"analysis__{name}"] for name in self.analysis_fields}
+
+    def to_representation(self, row):
+        return {name: getter(row) for name, getter in self._getters}
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
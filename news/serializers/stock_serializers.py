@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from ..models import Stock, HistoricalPrice
+from ..utils.fieldsets import SparseFieldsetMixin
 
 
-class StocksSerializer(serializers.ModelSerializer):
+class StocksSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
-    Serializer para información de stocks
+    Serializer para información de stocks (admite ``?fields=`` / ``?exclude=``)
     """
     # Campos calculados opcionales
     price_change = serializers.SerializerMethodField()
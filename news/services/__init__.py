@@ -3,15 +3,71 @@ from .news_service import (
     validate_news_data,
     process_news_item,
     fetch_and_save_news,
+    build_duplicate_detector,
+    sync_news_tickers,
 )
 from .quotes_service import fetch_quotes
 from .research_service import fetch_research
+from .stock_service import fetch_stock_info, fetch_price_history
+from .price_service import (
+    update_price_history,
+    update_price_histories,
+    last_price_dates,
+    stored_prices,
+)
+from .rate_limiter import (
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    PRIORITY_LOW,
+    RateLimiter,
+    get_rate_limiter,
+)
+from .circuit_breaker import CircuitBreaker, get_circuit_breaker
+from .data_sources import (
+    YahooDataSource,
+    RecordingDataSource,
+    ReplayDataSource,
+    get_data_source,
+    set_data_source,
+)
+from .exceptions import (
+    UpstreamUnavailableError,
+    UpstreamRateLimitError,
+    CircuitOpenError,
+    LatencyBudgetExceeded,
+    UpstreamSaturatedError,
+)
 
 __all__ = [
     "fetch_news",
     "fetch_quotes",
     "fetch_research",
+    "fetch_stock_info",
+    "fetch_price_history",
+    "update_price_history",
+    "update_price_histories",
+    "last_price_dates",
+    "stored_prices",
     "validate_news_data",
     "process_news_item",
     "fetch_and_save_news",
+    "build_duplicate_detector",
+    "sync_news_tickers",
+    "PRIORITY_HIGH",
+    "PRIORITY_NORMAL",
+    "PRIORITY_LOW",
+    "RateLimiter",
+    "get_rate_limiter",
+    "CircuitBreaker",
+    "get_circuit_breaker",
+    "YahooDataSource",
+    "RecordingDataSource",
+    "ReplayDataSource",
+    "get_data_source",
+    "set_data_source",
+    "UpstreamUnavailableError",
+    "UpstreamRateLimitError",
+    "CircuitOpenError",
+    "LatencyBudgetExceeded",
+    "UpstreamSaturatedError",
 ]
@@ -0,0 +1,153 @@
+"""
+Backtest de la señal de sentimiento sobre las noticias y precios guardados.
+
+``load_signal_panel`` convierte cada noticia analizada de un símbolo
+(``NewsTicker`` + ``NewsAnalysis.combined_score``/``relevance``) en una
+entrada al cierre de la primera barra posterior a su publicación: las
+publicadas antes del cierre entran ese mismo día y las demás al siguiente,
+como en el estudio de eventos. La simulación de cada configuración y el
+reparto de rejillas entre procesos están en ``news.utils.backtesting``.
+"""
+
+import itertools
+import time
+from datetime import time as dt_time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ..utils.backtesting import (
+    MAX_HOLDING,
+    SignalPanel,
+    StrategyConfig,
+    entry_paths,
+    relevance_levels,
+    sweep,
+)
+from .event_study import (
+    EVENT_SYMBOL_CHUNK,
+    MARKET_CLOSE,
+    event_days,
+    event_rows,
+    event_symbols,
+    to_epoch,
+)
+from .price_store import get_price_series
+
+# Configuraciones por rejilla, para acotar el tiempo de un barrido
+MAX_GRID_SIZE = 5000
+
+
+def load_signal_panel(
+    symbols: Optional[Iterable[str]] = None,
+    since=None,
+    until=None,
+    max_holding: int = MAX_HOLDING,
+    market_close: dt_time = MARKET_CLOSE,
+) -> SignalPanel:
+    """
+    Panel de señales de ``symbols`` (todo el universo si es ``None``) con
+    los retornos de hasta ``max_holding`` barras tras cada entrada
+    """
+    if not 1 <= max_holding <= MAX_HOLDING:
+        raise ValueError(f"El periodo debe estar entre 1 y {MAX_HOLDING} barras")
+    universe = (
+        event_symbols()
+        if symbols is None
+        else list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    )
+    since, until = to_epoch(since), to_epoch(until, end_of_day=True)
+
+    scores: List[np.ndarray] = []
+    relevances: List[np.ndarray] = []
+    paths: List[np.ndarray] = []
+    exit_days: List[np.ndarray] = []
+    for offset in range(0, len(universe), EVENT_SYMBOL_CHUNK):
+        chunk = universe[offset : offset + EVENT_SYMBOL_CHUNK]
+        rows = list(event_rows(chunk, since, until))
+        if not rows:
+            continue
+        symbol, _, published, _, relevance, score = (
+            np.array(column) for column in zip(*rows)
+        )
+        starts = np.flatnonzero(np.r_[True, symbol[1:] != symbol[:-1]])
+        ends = np.r_[starts[1:], len(rows)]
+        for lo, hi in zip(starts, ends):
+            series = get_price_series(str(symbol[lo]))
+            if not len(series):
+                continue
+            days = event_days(published[lo:hi].astype(np.int64), market_close)
+            entry = np.searchsorted(series.dates, days, side="left")
+            returns, exits = entry_paths(series.close, series.dates, entry, max_holding)
+            scores.append(score[lo:hi].astype(float))
+            relevances.append(relevance_levels(relevance[lo:hi]))
+            paths.append(returns)
+            exit_days.append(exits)
+
+    if not scores:
+        return SignalPanel(
+            np.empty(0),
+            np.empty(0, dtype=np.int8),
+            np.empty((0, max_holding)),
+            np.empty((0, max_holding), dtype=np.int32),
+        )
+    return SignalPanel(
+        np.concatenate(scores),
+        np.concatenate(relevances),
+        np.concatenate(paths),
+        np.concatenate(exit_days),
+    )
+
+
+def build_grid(grid: Mapping[str, Sequence[Any]]) -> List[StrategyConfig]:
+    """
+    Producto cartesiano de los valores de ``grid`` (campos de
+    ``StrategyConfig``); lanza ``ValueError`` si algún valor no es válido
+    """
+    fields = StrategyConfig.__dataclass_fields__
+    unknown = [name for name in grid if name not in fields]
+    if unknown:
+        raise ValueError(f"Parámetros desconocidos: {', '.join(unknown)}")
+    names = list(grid)
+    size = int(np.prod([len(grid[name]) for name in names])) if names else 1
+    if size > MAX_GRID_SIZE:
+        raise ValueError(
+            f"La rejilla tiene {size} configuraciones (máximo {MAX_GRID_SIZE})"
+        )
+    return [
+        StrategyConfig(**dict(zip(names, values)))
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def run_backtest(
+    grid: Mapping[str, Sequence[Any]],
+    symbols: Optional[Iterable[str]] = None,
+    since=None,
+    until=None,
+    workers: int = 1,
+    sort_by: str = "pnl",
+) -> Dict[str, Any]:
+    """
+    Carga el panel una vez y simula toda la rejilla, con los resultados
+    ordenados de mayor a menor ``sort_by``
+    """
+    configs = build_grid(grid)
+    started = time.monotonic()
+    max_holding = max(config.holding for config in configs)
+    panel = load_signal_panel(symbols, since, until, max_holding)
+    loaded = time.monotonic()
+
+    results = sweep(panel, configs, workers)
+    results.sort(
+        key=lambda result: (result.get(sort_by) is not None, result.get(sort_by) or 0),
+        reverse=True,
+    )
+    finished = time.monotonic()
+    return {
+        "events": len(panel),
+        "configurations": len(configs),
+        "load_seconds": loaded - started,
+        "simulation_seconds": finished - loaded,
+        "results": results,
+    }
@@ -0,0 +1,159 @@
+"""
+Feed de cambios de noticias para la sincronización incremental.
+
+Cada alta, modificación o borrado de una noticia (o de su análisis) añade una
+fila a ``NewsChange``. El cliente guarda el último ``id`` recibido y pide sólo
+los cambios posteriores, así el coste de cada consulta depende de lo que ha
+cambiado y no del tamaño de la tabla.
+
+Los cambios se registran en ``transaction.on_commit`` para que el orden de la
+secuencia siga el orden de confirmación. Aun así dos confirmaciones casi
+simultáneas pueden obtener ids en distinto orden, por lo que sólo se sirven
+los cambios con más de ``NEWS_CHANGES_SETTLE_SECONDS`` de antigüedad: un cambio
+con id menor nunca aparece después de que el cliente haya avanzado su cursor.
+
+La tabla se poda periódicamente (``prune_changes``, ver ``CELERY_BEAT_SCHEDULE``)
+conservando ``NEWS_CHANGES_RETENTION_DAYS`` días. Un cursor anterior al cambio
+más antiguo conservado ya no puede ponerse al día: ``read_changes`` responde
+con ``resync_required`` y el cliente debe recargar el listado completo.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import New, NewsChange
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTLE_SECONDS = 2.0
+DEFAULT_RETENTION_DAYS = 7
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 2000
+
+
+def record_changes(news_uuids: Iterable[Any], op: str = NewsChange.OP_UPSERT) -> None:
+    """
+    Registra cambios de noticias cuando la transacción en curso se confirme
+    """
+    uuids = list(dict.fromkeys(news_uuids))
+    if not uuids:
+        return
+
+    def _write():
+        NewsChange.objects.bulk_create(
+            [NewsChange(news_uuid=news_uuid, op=op) for news_uuid in uuids]
+        )
+
+    transaction.on_commit(_write)
+
+
+def latest_change_id() -> int:
+    """
+    Último ``id`` de la secuencia de cambios (0 si no hay ninguno)
+    """
+    return NewsChange.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+
+def prune_changes(retention_days: Optional[float] = None, now=None) -> int:
+    """
+    Borra los cambios más antiguos que el periodo de retención.
+
+    Siempre se conserva el último cambio para que la secuencia no retroceda
+    (SQLite reutiliza el id máximo si se borra). Devuelve las filas borradas.
+    """
+    if retention_days is None:
+        retention_days = getattr(
+            settings, "NEWS_CHANGES_RETENTION_DAYS", DEFAULT_RETENTION_DAYS
+        )
+    now = now or timezone.now()
+    deleted, _ = NewsChange.objects.filter(
+        created_at__lt=now - timedelta(days=retention_days),
+        id__lt=latest_change_id(),
+    ).delete()
+    return deleted
+
+
+def oldest_change_id() -> int:
+    """
+    Primer ``id`` conservado de la secuencia de cambios (0 si no hay ninguno)
+    """
+    return NewsChange.objects.order_by("id").values_list("id", flat=True).first() or 0
+
+
+def read_changes(
+    since: int,
+    limit: int = DEFAULT_LIMIT,
+    include_duplicates: bool = False,
+    now=None,
+) -> Dict[str, Any]:
+    """
+    Cambios con ``id > since``, compactados por noticia.
+
+    Devuelve ``news`` (noticias vigentes, con su análisis), ``deleted`` (uuids
+    borrados u ocultos como duplicados), ``next_cursor`` y ``has_more``. Si
+    los cambios posteriores a ``since`` ya se han podado devuelve
+    ``resync_required`` y, en ``next_cursor``, el cursor desde el que seguir
+    tras recargar el listado.
+    """
+    settle = getattr(settings, "NEWS_CHANGES_SETTLE_SECONDS", DEFAULT_SETTLE_SECONDS)
+    now = now or timezone.now()
+    limit = max(1, min(limit, MAX_LIMIT))
+    settled = NewsChange.objects.filter(
+        created_at__lte=now - timedelta(seconds=settle)
+    )
+
+    # Los ids podados son todos menores que el más antiguo conservado; con
+    # huecos en la secuencia se pide una resincronización de más, nunca de menos
+    oldest = oldest_change_id()
+    if oldest and since < oldest - 1:
+        # Cursor del último cambio asentado: el listado recargado ya incluye
+        # lo anterior y lo posterior se servirá en la siguiente consulta
+        cursor = settled.order_by("-id").values_list("id", flat=True).first()
+        return {
+            "news": [],
+            "deleted": [],
+            "next_cursor": cursor or oldest - 1,
+            "has_more": False,
+            "resync_required": True,
+        }
+
+    rows = list(
+        settled.filter(id__gt=since)
+        .order_by("id")
+        .values_list("id", "news_uuid", "op")[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not rows:
+        return {"news": [], "deleted": [], "next_cursor": since, "has_more": False}
+
+    # Cada noticia aparece una vez, en la posición de su último cambio
+    latest: Dict[Any, int] = {}
+    for seq, news_uuid, _ in rows:
+        latest[news_uuid] = seq
+    touched = sorted(latest, key=latest.get)
+
+    current = {
+        news.uuid: news
+        for news in New.objects.filter(uuid__in=touched).select_related("analysis")
+    }
+    news: List[New] = []
+    deleted: List[str] = []
+    for news_uuid in touched:
+        obj: Optional[New] = current.get(news_uuid)
+        if obj is None or (obj.canonical_id and not include_duplicates):
+            deleted.append(str(news_uuid))
+        else:
+            news.append(obj)
+
+    return {
+        "news": news,
+        "deleted": deleted,
+        "next_cursor": rows[-1][0],
+        "has_more": has_more,
+    }
@@ -0,0 +1,155 @@
+"""
+Datos del gráfico de un símbolo en una sola respuesta: precios y noticias.
+
+Los precios salen del almacén de precios (reducidos con LTTB como en
+``get_historical_prices``) y las noticias de un recorrido acotado del índice
+``(symbol, publish_time)`` de ``NewsTicker``, con su análisis de sentimiento.
+Cada noticia se ancla con ``np.searchsorted`` a la primera barra devuelta en
+su día de publicación (UTC) o posterior, así el cliente dibuja los marcadores
+sin cruzar fechas.
+
+``overlay_etag`` identifica el contenido sin calcularlo: depende de los
+parámetros, de la última barra del símbolo y del último cambio del feed de
+noticias (``NewsChange``), que registra altas, cambios de análisis y
+borrados.
+"""
+
+import hashlib
+from datetime import date, datetime, time as dt_time, timezone as dt_timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..models import NewsTicker
+from .change_feed import latest_change_id
+from .price_series import PriceSeries
+
+OVERLAY_DEFAULT_MAX_MARKERS = 500
+OVERLAY_MAX_MARKERS = 2000
+
+MARKER_FIELDS = (
+    "news_id",
+    "publish_time",
+    "news__title",
+    "news__publisher",
+    "news__link",
+    "news__analysis__sentiment_label",
+    "news__analysis__combined_score",
+    "news__analysis__relevance",
+)
+
+
+def _epoch(day: date, end_of_day: bool = False) -> int:
+    moment = datetime.combine(
+        day, dt_time.max if end_of_day else dt_time.min, tzinfo=dt_timezone.utc
+    )
+    return int(moment.timestamp())
+
+
+def news_markers(
+    series: PriceSeries, max_markers: int = OVERLAY_DEFAULT_MAX_MARKERS
+) -> Dict[str, Any]:
+    """
+    Noticias canónicas de ``series.symbol`` entre la primera y la última
+    barra, ancladas a la fecha de una barra de ``series``.
+
+    Si hay más de ``max_markers`` se devuelven las más recientes y
+    ``truncated`` es ``True``.
+    """
+    if not len(series):
+        return {"news": [], "truncated": False}
+
+    first = series.dates[0].item()
+    last = series.dates[-1].item()
+    rows = list(
+        NewsTicker.objects.filter(
+            symbol=series.symbol,
+            publish_time__gte=_epoch(first),
+            publish_time__lte=_epoch(last, end_of_day=True),
+            news__canonical__isnull=True,
+        )
+        .order_by("-publish_time", "-id")
+        .values_list(*MARKER_FIELDS)[: max_markers + 1]
+    )
+    truncated = len(rows) > max_markers
+    rows = rows[:max_markers][::-1]
+    if not rows:
+        return {"news": [], "truncated": False}
+
+    times = np.array([row[1] for row in rows], dtype=np.int64)
+    days = (times // 86400).astype("datetime64[D]")
+    snapped = series.dates[np.searchsorted(series.dates, days, side="left")]
+    bar_dates = np.datetime_as_string(snapped, unit="D").tolist()
+
+    markers: List[Dict[str, Any]] = [
+        {
+            "uuid": str(news_id),
+            "provider_publish_time": published,
+            "date": bar_date,
+            "title": title,
+            "publisher": publisher,
+            "link": link,
+            "sentiment_label": label,
+            "combined_score": score,
+            "relevance": relevance,
+        }
+        for (
+            news_id,
+            published,
+            title,
+            publisher,
+            link,
+            label,
+            score,
+            relevance,
+        ), bar_date in zip(rows, bar_dates)
+    ]
+    return {"news": markers, "truncated": truncated}
+
+
+def overlay_etag(
+    symbol: str,
+    series: PriceSeries,
+    start: Optional[date],
+    end: Optional[date],
+    max_points: int,
+    max_markers: int,
+) -> str:
+    """
+    ETag (sin comillas) de la respuesta para ``series``, la serie completa
+    """
+    key = "|".join(
+        str(part)
+        for part in (
+            symbol.upper(),
+            start,
+            end,
+            max_points,
+            max_markers,
+            series.version,
+            latest_change_id(),
+        )
+    )
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def chart_overlay(
+    series: PriceSeries,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    max_points: Optional[int] = None,
+    max_markers: int = OVERLAY_DEFAULT_MAX_MARKERS,
+) -> Dict[str, Any]:
+    """
+    Precios de ``series`` entre ``start`` y ``end`` (reducidos a
+    ``max_points``) y los marcadores de noticias de ese tramo
+    """
+    window = series.between(start, end)
+    if max_points:
+        window = window.downsample(max_points)
+    return {
+        "symbol": series.symbol,
+        "prices": window.to_records(),
+        **news_markers(window, max_markers),
+    }
+
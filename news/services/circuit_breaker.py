@@ -0,0 +1,319 @@
+"""
+Circuit breaker y presupuesto de latencia para las llamadas a Yahoo Finance.
+
+El circuito observa una ventana deslizante de llamadas recientes. Si la tasa
+de errores o de llamadas lentas supera el umbral, se abre y las llamadas
+fallan inmediatamente con ``CircuitOpenError``. Pasado el tiempo de
+enfriamiento pasa a semiabierto y deja pasar una única llamada de prueba:
+si funciona se cierra, si falla vuelve a abrirse.
+
+El estado es local a cada proceso: cada worker se protege por sí mismo sin
+depender de que la caché compartida esté disponible.
+
+Las llamadas con presupuesto corren en un ``UpstreamPool`` acotado: una
+llamada abandonada sigue ocupando su hilo hasta que Yahoo responde, así que
+el pool no encola y falla rápido con ``UpstreamSaturatedError`` cuando no
+quedan hilos o hay demasiadas llamadas abandonadas en curso.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+from django.conf import settings
+
+from .exceptions import (
+    CircuitOpenError,
+    LatencyBudgetExceeded,
+    UpstreamSaturatedError,
+)
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+# Espera mínima sugerida (s) cuando no hay un plazo mejor que indicar
+MIN_RETRY_AFTER = 1.0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker con ventana deslizante de errores y latencia
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: float = 60.0,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate: float = 0.5,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        pool: Optional["UpstreamPool"] = None,
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._pool = pool
+        self._lock = threading.Lock()
+        # (timestamp, éxito, latencia)
+        self._calls: Deque[Tuple[float, bool, float]] = deque()
+        self._state = STATE_CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started_at = 0.0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == STATE_OPEN
+            and self._clock() - self._opened_at >= self.open_seconds
+        ):
+            self._state = STATE_HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def _trim(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def _open(self, now: float) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = now
+        self._probe_in_flight = False
+        self._calls.clear()
+        logger.warning("Circuito %s abierto durante %ss", self.name, self.open_seconds)
+
+    def _rejection(self) -> CircuitOpenError:
+        now = self._clock()
+        if self._state == STATE_HALF_OPEN:
+            # La prueba en curso se resuelve, como tarde, al volverse lenta
+            retry_after = max(
+                MIN_RETRY_AFTER,
+                self.slow_call_seconds - (now - self._probe_started_at),
+            )
+        else:
+            retry_after = max(0.0, self.open_seconds - (now - self._opened_at))
+        return CircuitOpenError(
+            "Yahoo Finance no está disponible temporalmente",
+            retry_after=retry_after,
+        )
+
+    def raise_if_open(self) -> None:
+        """
+        Falla rápido si el circuito está abierto, sin reservar la prueba
+        """
+        with self._lock:
+            if self._current_state() == STATE_OPEN:
+                raise self._rejection()
+
+    def before_call(self) -> None:
+        """
+        Comprueba si se permite la llamada; lanza ``CircuitOpenError`` si no
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == STATE_CLOSED:
+                return
+            if state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_started_at = self._clock()
+                return
+            raise self._rejection()
+
+    def _cancel_probe(self) -> None:
+        with self._lock:
+            if self._state == STATE_HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record(self, success: bool, latency: float) -> None:
+        """
+        Registra el resultado de una llamada y actualiza el estado
+        """
+        with self._lock:
+            now = self._clock()
+            slow = latency >= self.slow_call_seconds
+
+            if self._state == STATE_HALF_OPEN:
+                if success and not slow:
+                    self._state = STATE_CLOSED
+                    self._calls.clear()
+                    logger.info("Circuito %s cerrado tras la prueba", self.name)
+                else:
+                    self._open(now)
+                return
+
+            self._calls.append((now, success, latency))
+            self._trim(now)
+
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            errors = sum(1 for _, ok, _ in self._calls if not ok)
+            slow_calls = sum(
+                1 for _, _, lat in self._calls if lat >= self.slow_call_seconds
+            )
+            if (
+                errors / total >= self.error_rate
+                or slow_calls / total >= self.slow_call_rate
+            ):
+                self._open(now)
+
+    def call(
+        self, func: Callable[..., Any], *args, budget: Optional[float] = None, **kwargs
+    ) -> Any:
+        """
+        Ejecuta ``func`` protegida por el circuito.
+
+        Si se indica ``budget`` (segundos), la llamada se abandona al agotarse
+        y se lanza ``LatencyBudgetExceeded``; el hilo de trabajo termina en
+        segundo plano pero el llamante queda libre. Si el pool está saturado
+        se lanza ``UpstreamSaturatedError`` sin llamar ni contar un fallo.
+        """
+        self.before_call()
+        start = self._clock()
+        try:
+            if budget is None:
+                result = func(*args, **kwargs)
+            else:
+                result = (self._pool or _get_pool()).run(func, args, kwargs, budget)
+        except UpstreamSaturatedError:
+            self._cancel_probe()
+            raise
+        except Exception:
+            self.record(False, self._clock() - start)
+            raise
+        self.record(True, self._clock() - start)
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = STATE_CLOSED
+            self._calls.clear()
+            self._probe_in_flight = False
+
+
+class UpstreamPool:
+    """
+    Hilos para las llamadas con presupuesto de latencia.
+
+    No encola: una llamada sólo se acepta si hay un hilo libre y menos de
+    ``max_abandoned`` llamadas abandonadas siguen en curso, de forma que las
+    abandonadas nunca retrasan ni bloquean a las nuevas.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        max_abandoned: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_workers = max_workers
+        if max_abandoned is None:
+            max_abandoned = max_workers // 2
+        self.max_abandoned = max(1, min(max_abandoned, max_workers))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="upstream"
+        )
+        self._ids = itertools.count()
+        # Plazo de cada llamada en curso y las que ya se han abandonado
+        self._deadlines: Dict[int, float] = {}
+        self._abandoned: Set[int] = set()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._deadlines)
+
+    @property
+    def abandoned(self) -> int:
+        with self._lock:
+            return len(self._abandoned)
+
+    def _saturated(self) -> UpstreamSaturatedError:
+        retry_after = min(self._deadlines.values()) - self._clock()
+        return UpstreamSaturatedError(
+            "Demasiadas llamadas a Yahoo Finance en curso",
+            retry_after=max(MIN_RETRY_AFTER, retry_after),
+        )
+
+    def run(self, func: Callable[..., Any], args, kwargs, budget: float) -> Any:
+        with self._lock:
+            if (
+                len(self._deadlines) >= self.max_workers
+                or len(self._abandoned) >= self.max_abandoned
+            ):
+                raise self._saturated()
+            call_id = next(self._ids)
+            self._deadlines[call_id] = self._clock() + budget
+        future = self._executor.submit(func, *args, **kwargs)
+        future.add_done_callback(lambda _: self._finish(call_id))
+        try:
+            return future.result(timeout=max(0.0, budget))
+        except FutureTimeout:
+            with self._lock:
+                # Si terminó justo ahora ya no ocupa el hilo
+                if call_id in self._deadlines:
+                    self._abandoned.add(call_id)
+            raise LatencyBudgetExceeded(
+                "Yahoo Finance no respondió dentro del presupuesto de latencia"
+            ) from None
+
+    def _finish(self, call_id: int) -> None:
+        with self._lock:
+            self._deadlines.pop(call_id, None)
+            self._abandoned.discard(call_id)
+
+
+_pool: Optional[UpstreamPool] = None
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def _get_pool() -> UpstreamPool:
+    global _pool
+    with _registry_lock:
+        if _pool is None:
+            config = getattr(settings, "YAHOO_CIRCUIT_BREAKER", {})
+            _pool = UpstreamPool(
+                max_workers=config.get("MAX_WORKERS", 8),
+                max_abandoned=config.get("MAX_ABANDONED"),
+            )
+        return _pool
+
+
+def get_circuit_breaker(name: str = "yahoo") -> CircuitBreaker:
+    """
+    Devuelve el circuito ``name`` configurado en ``settings.YAHOO_CIRCUIT_BREAKER``
+    """
+    with _registry_lock:
+        if name not in _breakers:
+            config = getattr(settings, "YAHOO_CIRCUIT_BREAKER", {})
+            _breakers[name] = CircuitBreaker(
+                name,
+                window=config.get("WINDOW", 60.0),
+                min_calls=config.get("MIN_CALLS", 5),
+                error_rate=config.get("ERROR_RATE", 0.5),
+                slow_call_seconds=config.get("SLOW_CALL_SECONDS", 10.0),
+                slow_call_rate=config.get("SLOW_CALL_RATE", 0.5),
+                open_seconds=config.get("OPEN_SECONDS", 30.0),
+            )
+        return _breakers[name]
@@ -0,0 +1,239 @@
+"""
+Fuentes de datos de Yahoo Finance intercambiables.
+
+Los servicios de ``news.services`` no llaman a yfinance directamente sino a la
+fuente de datos activa:
+
+- ``YahooDataSource``: llamadas reales a yfinance.
+- ``RecordingDataSource``: envuelve otra fuente y guarda cada respuesta en
+  ficheros JSON para reproducirla después.
+- ``ReplayDataSource``: sirve las respuestas grabadas sin red, con latencia y
+  tasa de errores configurables, para medir la ingesta de forma reproducible.
+
+Los ficheros se guardan como ``<directorio>/<tipo>/<TICKER>.json`` donde
+``tipo`` es ``news``, ``quotes``, ``research``, ``info`` o ``history``. Si no
+existe el fichero de un ticker se usa ``_default.json`` del mismo tipo.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import requests
+import yfinance as yf
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIXTURE = "_default"
+
+
+class YahooDataSource:
+    """
+    Fuente de datos real sobre yfinance
+    """
+
+    def search_news(
+        self, ticker: str, news_count: int, timeout: float
+    ) -> List[Dict[str, Any]]:
+        return yf.Search(ticker, news_count=news_count, timeout=timeout).news
+
+    def search_quotes(
+        self, ticker: str, max_results: int, timeout: float
+    ) -> List[Dict[str, Any]]:
+        return yf.Search(ticker, max_results=max_results, timeout=timeout).quotes
+
+    def search_research(self, ticker: str, timeout: float) -> List[Dict[str, Any]]:
+        return yf.Search(ticker, include_research=True, timeout=timeout).research
+
+    def ticker_info(self, ticker: str, timeout: float) -> Dict[str, Any]:
+        # Ticker.info no admite timeout; el presupuesto lo aplica call_upstream
+        return yf.Ticker(ticker).info
+
+    def history(self, ticker: str, timeout: float, **params) -> pd.DataFrame:
+        return yf.Ticker(ticker).history(timeout=timeout, **params)
+
+
+def _frame_to_payload(df: pd.DataFrame) -> Dict[str, Any]:
+    tz = getattr(df.index, "tz", None)
+    return {
+        "index": [ts.isoformat() for ts in df.index],
+        # El desfase de cada fecha cambia con el horario de verano: se guarda
+        # la zona para reconstruir el índice
+        "tz": str(tz) if tz is not None else None,
+        "columns": list(df.columns),
+        "data": df.to_numpy().tolist(),
+    }
+
+
+def _payload_to_frame(payload: Dict[str, Any]) -> pd.DataFrame:
+    if "tz" in payload and payload["tz"] is None:
+        index = pd.to_datetime(payload["index"])
+    else:
+        # Desfases mixtos (-05:00/-04:00) se normalizan a UTC y se vuelven a la
+        # zona grabada; las grabaciones antiguas sin zona quedan en UTC
+        index = pd.to_datetime(payload["index"], utc=True)
+        if payload.get("tz"):
+            index = index.tz_convert(payload["tz"])
+    index = pd.DatetimeIndex(index, name="Date")
+    return pd.DataFrame(payload["data"], index=index, columns=payload["columns"])
+
+
+class RecordingDataSource:
+    """
+    Envuelve otra fuente y graba cada respuesta en ``directory``
+    """
+
+    def __init__(self, inner, directory):
+        self.inner = inner
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def _save(self, kind: str, ticker: str, payload: Any) -> None:
+        path = self.directory / kind / f"{ticker.upper()}.json"
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        logger.debug("Grabada respuesta %s de %s en %s", kind, ticker, path)
+
+    def search_news(self, ticker, news_count, timeout):
+        news = self.inner.search_news(ticker, news_count, timeout)
+        self._save("news", ticker, news)
+        return news
+
+    def search_quotes(self, ticker, max_results, timeout):
+        quotes = self.inner.search_quotes(ticker, max_results, timeout)
+        self._save("quotes", ticker, quotes)
+        return quotes
+
+    def search_research(self, ticker, timeout):
+        research = self.inner.search_research(ticker, timeout)
+        self._save("research", ticker, research)
+        return research
+
+    def ticker_info(self, ticker, timeout):
+        info = self.inner.ticker_info(ticker, timeout)
+        self._save("info", ticker, info)
+        return info
+
+    def history(self, ticker, timeout, **params):
+        df = self.inner.history(ticker, timeout, **params)
+        self._save("history", ticker, _frame_to_payload(df))
+        return df
+
+
+class ReplayDataSource:
+    """
+    Sirve respuestas grabadas con latencia y errores simulados.
+
+    ``latency`` y ``jitter`` están en segundos: cada llamada espera
+    ``latency`` más un valor uniforme en ``[0, jitter]``. ``error_rate`` es la
+    probabilidad de que la llamada falle como lo haría Yahoo.
+    """
+
+    def __init__(
+        self,
+        directory,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        sleep=time.sleep,
+    ):
+        self.directory = Path(directory)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._sleep = sleep
+        self._cache: Dict[Path, Any] = {}
+
+    def _load(self, kind: str, ticker: str) -> Any:
+        path = self.directory / kind / f"{ticker.upper()}.json"
+        if not path.exists():
+            path = self.directory / kind / f"{DEFAULT_FIXTURE}.json"
+        if path not in self._cache:
+            if not path.exists():
+                raise FileNotFoundError(f"No hay respuesta grabada {kind} para {ticker}")
+            self._cache[path] = json.loads(path.read_text(encoding="utf-8"))
+        return self._cache[path]
+
+    def _simulate(self, timeout: float) -> None:
+        with self._random_lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+        if delay > timeout:
+            self._sleep(timeout)
+            raise requests.exceptions.ReadTimeout("Timeout simulado")
+        self._sleep(delay)
+        if fail:
+            raise requests.exceptions.ConnectionError("Error simulado de Yahoo")
+
+    def search_news(self, ticker, news_count, timeout):
+        self._simulate(timeout)
+        return self._load("news", ticker)[:news_count]
+
+    def search_quotes(self, ticker, max_results, timeout):
+        self._simulate(timeout)
+        return self._load("quotes", ticker)[:max_results]
+
+    def search_research(self, ticker, timeout):
+        self._simulate(timeout)
+        return self._load("research", ticker)
+
+    def ticker_info(self, ticker, timeout):
+        self._simulate(timeout)
+        return dict(self._load("info", ticker))
+
+    def history(self, ticker, timeout, **params):
+        self._simulate(timeout)
+        return _payload_to_frame(self._load("history", ticker))
+
+
+_data_source = None
+_data_source_lock = threading.Lock()
+
+
+def _build_data_source(config: Dict[str, Any]):
+    backend = config.get("BACKEND", "live")
+    if backend == "live":
+        return YahooDataSource()
+    if backend == "record":
+        return RecordingDataSource(YahooDataSource(), config["FIXTURES_DIR"])
+    if backend == "replay":
+        return ReplayDataSource(
+            config["FIXTURES_DIR"],
+            latency=config.get("LATENCY", 0.0),
+            jitter=config.get("JITTER", 0.0),
+            error_rate=config.get("ERROR_RATE", 0.0),
+            seed=config.get("SEED"),
+        )
+    raise ValueError(f"Fuente de datos desconocida: {backend}")
+
+
+def get_data_source():
+    """
+    Devuelve la fuente de datos configurada en ``settings.YAHOO_DATA_SOURCE``
+    """
+    global _data_source
+    with _data_source_lock:
+        if _data_source is None:
+            _data_source = _build_data_source(
+                getattr(settings, "YAHOO_DATA_SOURCE", {})
+            )
+        return _data_source
+
+
+def set_data_source(source) -> None:
+    """
+    Sustituye la fuente de datos activa (tests y benchmarks). ``None`` la reinicia.
+    """
+    global _data_source
+    with _data_source_lock:
+        _data_source = source
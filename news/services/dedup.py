@@ -0,0 +1,182 @@
+"""
+Detección de titulares casi duplicados.
+
+Yahoo devuelve la misma historia sindicada por varios medios con uuid
+distintos. Cada titular se resume en una huella SimHash de 64 bits y las
+huellas recientes se indexan con LSH por bandas: la huella se parte en
+``bands`` trozos y dos titulares son candidatos si coinciden en alguno. Con 4
+bandas de 16 bits, cualquier par a distancia de Hamming <= 3 comparte al
+menos una banda, así que la búsqueda es exacta para ese umbral sin comparar
+contra todo el histórico.
+
+El primer titular de cada grupo es el canónico; los demás se enlazan a él
+mediante ``New.canonical`` y no se vuelven a analizar.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models import New
+
+FINGERPRINT_BITS = 64
+DEFAULT_BANDS = 4
+DEFAULT_MAX_DISTANCE = 3
+# Ventana (segundos) en la que se buscan duplicados de un titular
+DEFAULT_WINDOW = 48 * 3600
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+_MASK = (1 << FINGERPRINT_BITS) - 1
+
+
+def _features(text: str) -> List[str]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    # Palabras y bigramas: los bigramas capturan el orden sin penalizar de
+    # más los cambios de una palabra
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+def _hash(feature: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def simhash(text: str) -> int:
+    """
+    Huella SimHash de 64 bits (sin signo) de un texto
+    """
+    weights = [0] * FINGERPRINT_BITS
+    for feature in _features(text):
+        h = _hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK).count("1")
+
+
+def to_db(fingerprint: int) -> int:
+    """
+    Convierte la huella a entero con signo para ``BigIntegerField``
+    """
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def from_db(value: int) -> int:
+    return value & _MASK
+
+
+def _to_datetime(epoch: int) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+class LshIndex:
+    """
+    Índice LSH por bandas sobre huellas SimHash
+    """
+
+    def __init__(self, bands: int = DEFAULT_BANDS):
+        if FINGERPRINT_BITS % bands:
+            raise ValueError("El número de bandas debe dividir 64")
+        self.bands = bands
+        self.band_bits = FINGERPRINT_BITS // bands
+        self._buckets: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+
+    def _keys(self, fingerprint: int) -> Iterable[Tuple[int, int]]:
+        band_mask = (1 << self.band_bits) - 1
+        for band in range(self.bands):
+            yield band, (fingerprint >> (band * self.band_bits)) & band_mask
+
+    def add(self, key: str, fingerprint: int) -> None:
+        for bucket in self._keys(fingerprint):
+            self._buckets[bucket].add(key)
+
+    def candidates(self, fingerprint: int) -> Set[str]:
+        found: Set[str] = set()
+        for bucket in self._keys(fingerprint):
+            found |= self._buckets.get(bucket, set())
+        return found
+
+
+class DuplicateDetector:
+    """
+    Asigna huella y titular canónico a las noticias de una ingesta
+    """
+
+    def __init__(
+        self,
+        window: int = DEFAULT_WINDOW,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+        bands: int = DEFAULT_BANDS,
+    ):
+        self.window = window
+        self.max_distance = max_distance
+        self.index = LshIndex(bands)
+        # uuid -> (huella, uuid canónico, publicación)
+        self._items: Dict[str, Tuple[int, str, Optional[int]]] = {}
+
+    def load_recent(self, since: int, until: Optional[int] = None) -> "DuplicateDetector":
+        """
+        Carga en el índice las noticias con huella publicadas desde ``since``
+        """
+        # published_at está indexado; provider_publish_time no
+        rows = New.objects.filter(
+            published_at__gte=_to_datetime(since), title_fingerprint__isnull=False
+        )
+        if until is not None:
+            rows = rows.filter(published_at__lte=_to_datetime(until))
+        for uuid, fingerprint, canonical_id, published in rows.values_list(
+            "uuid", "title_fingerprint", "canonical_id", "provider_publish_time"
+        ):
+            self._add(str(uuid), from_db(fingerprint), str(canonical_id or uuid), published)
+        return self
+
+    def _add(self, key: str, fingerprint: int, canonical: str, published) -> None:
+        self._items[key] = (fingerprint, canonical, published)
+        self.index.add(key, fingerprint)
+
+    def find_canonical(
+        self, key: str, fingerprint: int, published: Optional[int]
+    ) -> Optional[str]:
+        """
+        uuid canónico del duplicado más cercano dentro de la ventana, si existe
+        """
+        best = None
+        for candidate in self.index.candidates(fingerprint):
+            if candidate == key:
+                continue
+            cand_fp, cand_canonical, cand_published = self._items[candidate]
+            if (
+                published is not None
+                and cand_published is not None
+                and abs(published - cand_published) > self.window
+            ):
+                continue
+            distance = hamming_distance(fingerprint, cand_fp)
+            if distance <= self.max_distance and (best is None or distance < best[0]):
+                best = (distance, cand_canonical)
+        if best is None or best[1] == key:
+            return None
+        return best[1]
+
+    def assign(
+        self, key: str, title: str, published: Optional[int]
+    ) -> Tuple[int, Optional[str]]:
+        """
+        Calcula la huella de un titular, busca su canónico y lo indexa.
+
+        Devuelve ``(huella para BD, uuid canónico o None)``.
+        """
+        fingerprint = simhash(title or "")
+        canonical = self.find_canonical(key, fingerprint, published)
+        self._add(key, fingerprint, canonical or key, published)
+        return to_db(fingerprint), canonical
@@ -0,0 +1,241 @@
+"""
+Bus de eventos en tiempo real para el stream SSE de noticias.
+
+Las ingestas y el análisis de sentimiento publican eventos (``news`` al crear
+una noticia, ``analysis`` al guardar su análisis) y cada conexión SSE abierta
+se suscribe con su conjunto de símbolos. El reparto dentro del proceso es
+en memoria; con ``BACKEND: "redis"`` los eventos viajan por pub/sub de Redis
+para que lleguen también los publicados desde los workers de Celery. Cada
+proceso mantiene una única suscripción a Redis y reparte localmente; si la
+conexión se pierde, el hilo que escucha se reconecta con espera exponencial.
+
+Cada suscripción tiene una cola acotada: si el cliente no consume al ritmo de
+los eventos, los nuevos se descartan (nunca se bloquea a quien publica) y la
+suscripción queda marcada como rezagada para que el cliente se resincronice
+con ``/api/news/changes/``.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = "news-events"
+DEFAULT_MAX_QUEUE = 100
+# Espera (s) antes de reconectar la suscripción a Redis, duplicada en cada fallo
+LISTENER_MIN_BACKOFF = 1.0
+LISTENER_MAX_BACKOFF = 30.0
+
+
+class Subscription:
+    """
+    Suscripción de una conexión: cola acotada en el event loop del cliente
+    """
+
+    def __init__(self, bus, symbols: Iterable[str], max_queue: int, loop):
+        self._bus = bus
+        self.symbols: Set[str] = {s.strip().upper() for s in symbols if s.strip()}
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if not self.symbols:
+            return True
+        return bool(self.symbols.intersection(event.get("symbols") or []))
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        # Se ejecuta en el loop de la suscripción
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Siguiente evento, o ``None`` si se agota ``timeout``.
+
+        Si se descartaron eventos por falta de espacio, antes se entrega un
+        evento ``lagged`` con el número de eventos perdidos.
+        """
+        if self.dropped and self.queue.empty():
+            dropped, self.dropped = self.dropped, 0
+            return {"type": "lagged", "dropped": dropped}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
+class InMemoryEventBus:
+    """
+    Reparto de eventos entre las suscripciones del proceso
+    """
+
+    def __init__(self, max_queue: int = DEFAULT_MAX_QUEUE):
+        self.max_queue = max_queue
+        self._lock = threading.Lock()
+        self._subscriptions: Set[Subscription] = set()
+
+    def subscribe(
+        self, symbols: Iterable[str] = (), max_queue: Optional[int] = None
+    ) -> Subscription:
+        """
+        Suscribe el event loop en curso a los eventos de ``symbols`` (todos si vacío)
+        """
+        subscription = Subscription(
+            self,
+            symbols,
+            max_queue or self.max_queue,
+            asyncio.get_running_loop(),
+        )
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        self._dispatch(event)
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            targets = [s for s in self._subscriptions if s.matches(event)]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # El loop de la conexión ya se cerró
+                self.unsubscribe(subscription)
+
+
+class RedisEventBus(InMemoryEventBus):
+    """
+    Bus sobre pub/sub de Redis: publica en el canal y reparte localmente lo
+    que llega de cualquier proceso
+    """
+
+    def __init__(
+        self,
+        url: str,
+        channel: str = DEFAULT_CHANNEL,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ):
+        super().__init__(max_queue=max_queue)
+        import redis
+
+        self.channel = channel
+        self._redis = redis.Redis.from_url(url)
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        try:
+            self._redis.publish(self.channel, json.dumps(event, default=str))
+        except Exception as e:
+            logger.warning("No se pudo publicar el evento en Redis: %s", e)
+
+    def subscribe(self, symbols=(), max_queue=None) -> Subscription:
+        self._ensure_listener()
+        return super().subscribe(symbols, max_queue)
+
+    def _ensure_listener(self) -> None:
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name="news-event-bus", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self) -> None:
+        backoff = LISTENER_MIN_BACKOFF
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                backoff = LISTENER_MIN_BACKOFF
+                for message in pubsub.listen():
+                    try:
+                        self._dispatch(json.loads(message["data"]))
+                    except (TypeError, ValueError) as e:
+                        logger.warning("Evento inválido en %s: %s", self.channel, e)
+                logger.warning("Suscripción a Redis cerrada, reconectando")
+            except Exception as e:
+                logger.error(
+                    "Suscripción a Redis interrumpida, reintento en %.0fs: %s",
+                    backoff,
+                    e,
+                )
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(backoff)
+            backoff = min(backoff * 2, LISTENER_MAX_BACKOFF)
+
+
+_event_bus = None
+_event_bus_lock = threading.Lock()
+
+
+def _build_event_bus(config: Dict[str, Any]):
+    backend = config.get("BACKEND", "memory")
+    max_queue = config.get("MAX_QUEUE", DEFAULT_MAX_QUEUE)
+    if backend == "memory":
+        return InMemoryEventBus(max_queue=max_queue)
+    if backend == "redis":
+        return RedisEventBus(
+            config["URL"],
+            channel=config.get("CHANNEL", DEFAULT_CHANNEL),
+            max_queue=max_queue,
+        )
+    raise ValueError(f"Bus de eventos desconocido: {backend}")
+
+
+def get_event_bus():
+    """
+    Devuelve el bus configurado en ``settings.NEWS_EVENT_BUS``
+    """
+    global _event_bus
+    with _event_bus_lock:
+        if _event_bus is None:
+            _event_bus = _build_event_bus(getattr(settings, "NEWS_EVENT_BUS", {}))
+        return _event_bus
+
+
+def set_event_bus(bus) -> None:
+    """
+    Sustituye el bus activo (tests). ``None`` lo reinicia.
+    """
+    global _event_bus
+    with _event_bus_lock:
+        _event_bus = bus
+
+
+def publish_event(event: Dict[str, Any]) -> None:
+    """
+    Publica un evento; los fallos del bus nunca interrumpen la ingesta
+    """
+    try:
+        get_event_bus().publish(event)
+    except Exception as e:
+        logger.warning("No se pudo publicar el evento %s: %s", event.get("type"), e)
@@ -0,0 +1,422 @@
+"""
+Estudio de eventos noticia-precio.
+
+Cada par (noticia analizada, ticker) de ``NewsTicker`` es un evento. Su
+publicación se alinea con las barras diarias del símbolo con
+``np.searchsorted``: la barra base es la última cerrada antes de la noticia
+(las publicadas tras el cierre de las 16:00 de Nueva York, con su horario de
+verano o de invierno según la fecha, cuentan para el día siguiente). Para cada ventana ``h`` se calcula:
+
+* el retorno hacia delante ``close[base + h] / close[base] - 1``;
+* el retorno anormal: el retorno menos el del benchmark en las mismas fechas
+  (modelo ajustado al mercado) o, sin benchmark, menos ``h`` veces el retorno
+  diario medio de las ``estimation`` barras anteriores a la base (modelo de
+  media constante).
+
+Los eventos se agrupan por ``sentiment_label`` y ``relevance`` del análisis.
+Todos los eventos de un símbolo se alinean a la vez sobre su serie del
+almacén de precios, así que el coste por evento es constante.
+"""
+
+import time
+from datetime import date, datetime, time as dt_time, timezone as dt_timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..models import NewsTicker
+from .price_series import PriceSeries
+from .polling_scheduler import MARKET_CLOSE, MARKET_TIMEZONE
+from .price_store import get_price_series
+
+DEFAULT_WINDOWS = (1, 3, 5, 10)
+MAX_WINDOW = 60
+MAX_WINDOWS = 10
+DEFAULT_ESTIMATION_WINDOW = 120
+GROUP_FIELDS = ("sentiment_label", "relevance")
+# Símbolos por consulta de eventos en las ejecuciones de todo el universo
+EVENT_SYMBOL_CHUNK = 500
+
+
+def parse_windows(value) -> tuple:
+    """
+    ``"1,5,10"`` (o una secuencia) -> ``(1, 5, 10)``; lanza ``ValueError``
+    si alguna ventana no es un entero entre 1 y ``MAX_WINDOW``
+    """
+    if value is None or value == "":
+        return DEFAULT_WINDOWS
+    items = value.split(",") if isinstance(value, str) else value
+    try:
+        windows = sorted({int(str(item).strip()) for item in items})
+    except ValueError:
+        raise ValueError("Las ventanas deben ser enteros separados por comas")
+    if not windows or len(windows) > MAX_WINDOWS:
+        raise ValueError(f"Indica entre 1 y {MAX_WINDOWS} ventanas")
+    if windows[0] < 1 or windows[-1] > MAX_WINDOW:
+        raise ValueError(f"Las ventanas deben estar entre 1 y {MAX_WINDOW} barras")
+    return tuple(windows)
+
+
+def parse_group_by(value) -> tuple:
+    """
+    Campos de agrupación (``sentiment_label`` y/o ``relevance``)
+    """
+    if not value:
+        return GROUP_FIELDS
+    items = value.split(",") if isinstance(value, str) else value
+    fields = tuple(dict.fromkeys(item.strip() for item in items if item.strip()))
+    unknown = [field for field in fields if field not in GROUP_FIELDS]
+    if unknown or not fields:
+        raise ValueError(
+            f"Agrupación inválida: {', '.join(unknown)}. "
+            f"Disponibles: {', '.join(GROUP_FIELDS)}"
+        )
+    return fields
+
+
+def event_days(publish_times, market_close: dt_time = MARKET_CLOSE):
+    """
+    Día de negociación (``datetime64[D]``) al que corresponde cada
+    publicación (epoch en segundos): las posteriores al cierre, en hora de
+    Nueva York de esa fecha, pasan al día siguiente
+    """
+    local = (
+        pd.to_datetime(np.asarray(publish_times, dtype=np.int64), unit="s", utc=True)
+        .tz_convert(MARKET_TIMEZONE)
+        .tz_localize(None)
+    )
+    # Desplazar el cierre a medianoche: el día del resultado es el de la sesión
+    close = pd.Timedelta(hours=market_close.hour, minutes=market_close.minute)
+    shifted = local + (pd.Timedelta(days=1) - close)
+    return shifted.to_numpy().astype("datetime64[D]")
+
+
+def base_indices(dates: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    Índice de la última barra anterior a cada día (``-1`` si no hay)
+    """
+    return np.searchsorted(dates, days, side="left") - 1
+
+
+def forward_returns(close: np.ndarray, base: np.ndarray, window: int) -> np.ndarray:
+    """
+    ``close[base + window] / close[base] - 1``, ``NaN`` fuera de la serie
+    """
+    close = np.asarray(close, dtype=float)
+    target = base + window
+    valid = (base >= 0) & (target < len(close))
+    out = np.full(len(base), np.nan)
+    out[valid] = close[target[valid]] / close[base[valid]] - 1
+    return out
+
+
+def _benchmark_returns(
+    series: PriceSeries, benchmark: PriceSeries, base: np.ndarray, window: int
+) -> np.ndarray:
+    """
+    Retorno del benchmark entre las fechas de la barra base y la barra
+    ``base + window`` del símbolo
+    """
+    target = base + window
+    valid = (base >= 0) & (target < len(series))
+    out = np.full(len(base), np.nan)
+    if not valid.any():
+        return out
+    start = np.searchsorted(benchmark.dates, series.dates[base[valid]], "right") - 1
+    end = np.searchsorted(benchmark.dates, series.dates[target[valid]], "right") - 1
+    close = np.asarray(benchmark.close, dtype=float)
+    values = np.where(start >= 0, close[end] / close[np.maximum(start, 0)] - 1, np.nan)
+    out[valid] = values
+    return out
+
+
+def _mean_daily_returns(
+    close: np.ndarray, base: np.ndarray, estimation: int
+) -> np.ndarray:
+    """
+    Retorno diario medio de las ``estimation`` barras que terminan en la base
+    (``NaN`` si no hay historia suficiente)
+    """
+    close = np.asarray(close, dtype=float)
+    daily = close[1:] / close[:-1] - 1
+    cumulative = np.concatenate(([0.0], np.cumsum(daily)))
+    valid = base >= estimation
+    out = np.full(len(base), np.nan)
+    out[valid] = (
+        cumulative[base[valid]] - cumulative[base[valid] - estimation]
+    ) / estimation
+    return out
+
+
+def symbol_event_returns(
+    series: PriceSeries,
+    publish_times,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    benchmark: Optional[PriceSeries] = None,
+    estimation: int = DEFAULT_ESTIMATION_WINDOW,
+    market_close: dt_time = MARKET_CLOSE,
+) -> Dict[str, np.ndarray]:
+    """
+    Retornos hacia delante (``ret_<h>``) y anormales (``abn_<h>``) de todos
+    los eventos de un símbolo, más la fecha de su barra base
+    """
+    count = len(publish_times)
+    base = base_indices(series.dates, event_days(publish_times, market_close))
+    base_dates = np.full(count, np.datetime64("NaT"), dtype="datetime64[D]")
+    found = base >= 0
+    base_dates[found] = series.dates[base[found]]
+
+    columns: Dict[str, np.ndarray] = {"base_date": base_dates}
+    mean_daily = None
+    if benchmark is None:
+        mean_daily = _mean_daily_returns(series.close, base, estimation)
+    for window in windows:
+        returns = forward_returns(series.close, base, window)
+        if benchmark is not None:
+            expected = _benchmark_returns(series, benchmark, base, window)
+        else:
+            expected = mean_daily * window
+        columns[f"ret_{window}"] = returns
+        columns[f"abn_{window}"] = returns - expected
+    return columns
+
+
+def event_rows(symbols: Optional[List[str]], since, until):
+    # Los duplicados (``canonical`` no nulo) contarían la misma noticia dos veces
+    queryset = NewsTicker.objects.filter(
+        news__analysis__isnull=False, news__canonical__isnull=True
+    )
+    if symbols is not None:
+        queryset = queryset.filter(symbol__in=symbols)
+    if since is not None:
+        queryset = queryset.filter(publish_time__gte=since)
+    if until is not None:
+        queryset = queryset.filter(publish_time__lte=until)
+    return queryset.order_by("symbol", "publish_time").values_list(
+        "symbol",
+        "news_id",
+        "publish_time",
+        "news__analysis__sentiment_label",
+        "news__analysis__relevance",
+        "news__analysis__combined_score",
+    )
+
+
+def event_symbols() -> List[str]:
+    """
+    Símbolos con alguna noticia canónica analizada
+    """
+    return list(
+        NewsTicker.objects.filter(
+            news__analysis__isnull=False, news__canonical__isnull=True
+        )
+        .order_by("symbol")
+        .values_list("symbol", flat=True)
+        .distinct()
+    )
+
+
+def to_epoch(value, end_of_day: bool = False) -> Optional[int]:
+    """
+    Epoch de una fecha (su inicio o su último segundo, en UTC) o datetime
+    """
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    start = datetime(value.year, value.month, value.day, tzinfo=dt_timezone.utc)
+    return int(start.timestamp()) + (86399 if end_of_day else 0)
+
+
+def event_returns(
+    symbols: Optional[Iterable[str]] = None,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    benchmark: Optional[str] = None,
+    since=None,
+    until=None,
+    estimation: int = DEFAULT_ESTIMATION_WINDOW,
+    market_close: dt_time = MARKET_CLOSE,
+    on_chunk: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> pd.DataFrame:
+    """
+    Una fila por evento con símbolo, noticia, análisis y retornos por
+    ventana. ``symbols=None`` recorre todo el universo en bloques de
+    ``EVENT_SYMBOL_CHUNK`` símbolos; ``since``/``until`` (fechas o epoch)
+    acotan la publicación. Lanza ``ValueError`` si el benchmark no tiene
+    precios.
+    """
+    windows = parse_windows(windows)
+    if estimation < 1:
+        raise ValueError("La ventana de estimación debe ser positiva")
+
+    benchmark_series = None
+    if benchmark:
+        benchmark_series = get_price_series(benchmark)
+        if not len(benchmark_series):
+            raise ValueError(f"No hay precios del benchmark {benchmark.upper()}")
+
+    universe = (
+        event_symbols()
+        if symbols is None
+        else list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    )
+    since, until = to_epoch(since), to_epoch(until, end_of_day=True)
+
+    frames = []
+    chunks = range(0, len(universe), EVENT_SYMBOL_CHUNK)
+    for number, offset in enumerate(chunks, start=1):
+        started = time.monotonic()
+        chunk = universe[offset : offset + EVENT_SYMBOL_CHUNK]
+        rows = list(event_rows(chunk, since, until))
+        if rows:
+            frame = pd.DataFrame(
+                rows,
+                columns=[
+                    "symbol",
+                    "news",
+                    "publish_time",
+                    "sentiment_label",
+                    "relevance",
+                    "combined_score",
+                ],
+            )
+            # Filas ordenadas por símbolo: cada uno es un tramo contiguo
+            symbol_values = frame["symbol"].to_numpy()
+            starts = np.flatnonzero(
+                np.r_[True, symbol_values[1:] != symbol_values[:-1]]
+            )
+            ends = np.r_[starts[1:], len(frame)]
+            times = frame["publish_time"].to_numpy(dtype=np.int64)
+            parts = []
+            for lo, hi in zip(starts, ends):
+                series = get_price_series(symbol_values[lo])
+                parts.append(
+                    symbol_event_returns(
+                        series,
+                        times[lo:hi],
+                        windows,
+                        benchmark_series,
+                        estimation,
+                        market_close,
+                    )
+                )
+            for column in parts[0]:
+                frame[column] = np.concatenate([part[column] for part in parts])
+            frames.append(frame)
+        if on_chunk:
+            on_chunk(
+                {
+                    "chunk": number,
+                    "chunks": len(chunks),
+                    "symbols": len(chunk),
+                    "events": len(rows),
+                    "elapsed": time.monotonic() - started,
+                }
+            )
+
+    if not frames:
+        return pd.DataFrame(
+            columns=[
+                "symbol",
+                "news",
+                "publish_time",
+                "sentiment_label",
+                "relevance",
+                "combined_score",
+                "base_date",
+                *(f"{kind}_{w}" for w in windows for kind in ("ret", "abn")),
+            ]
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _stats(values: np.ndarray) -> Dict[str, Any]:
+    values = values[~np.isnan(values)]
+    count = len(values)
+    if not count:
+        return {
+            "count": 0,
+            "mean": None,
+            "median": None,
+            "std": None,
+            "t_stat": None,
+            "hit_rate": None,
+        }
+    mean = float(values.mean())
+    std = float(values.std(ddof=1)) if count > 1 else None
+    return {
+        "count": count,
+        "mean": mean,
+        "median": float(np.median(values)),
+        "std": std,
+        "t_stat": float(mean / (std / np.sqrt(count))) if std else None,
+        "hit_rate": float((values > 0).mean()),
+    }
+
+
+def _window_stats(frame: pd.DataFrame, windows: Sequence[int], kind: str):
+    return {
+        str(window): _stats(frame[f"{kind}_{window}"].to_numpy(dtype=float))
+        for window in windows
+    }
+
+
+def summarize_events(
+    frame: pd.DataFrame,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    group_by: Sequence[str] = GROUP_FIELDS,
+) -> Dict[str, Any]:
+    """
+    Estadísticas (eventos, media, mediana, desviación, t y tasa de acierto)
+    de los retornos y retornos anormales, en total y por cubo de
+    ``group_by``
+    """
+    group_by = list(group_by)
+    buckets = []
+    if len(frame):
+        for key, group in frame.groupby(group_by, sort=True):
+            key = key if isinstance(key, tuple) else (key,)
+            buckets.append(
+                {
+                    **dict(zip(group_by, key)),
+                    "events": len(group),
+                    "returns": _window_stats(group, windows, "ret"),
+                    "abnormal": _window_stats(group, windows, "abn"),
+                }
+            )
+    return {
+        "events": len(frame),
+        "symbols": int(frame["symbol"].nunique()) if len(frame) else 0,
+        "overall": {
+            "returns": _window_stats(frame, windows, "ret"),
+            "abnormal": _window_stats(frame, windows, "abn"),
+        },
+        "buckets": buckets,
+    }
+
+
+def run_event_study(
+    symbols: Optional[Iterable[str]] = None,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    benchmark: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    group_by: Sequence[str] = GROUP_FIELDS,
+    estimation: int = DEFAULT_ESTIMATION_WINDOW,
+) -> Dict[str, Any]:
+    """
+    Estudio completo: alinea los eventos y devuelve el resumen por cubos
+    """
+    windows = parse_windows(windows)
+    group_by = parse_group_by(group_by)
+    frame = event_returns(
+        symbols, windows, benchmark, since, until, estimation=estimation
+    )
+    return {
+        "windows": list(windows),
+        "benchmark": benchmark.upper() if benchmark else None,
+        "model": "market_adjusted" if benchmark else "constant_mean",
+        "group_by": list(group_by),
+        **summarize_events(frame, windows, group_by),
+    }
@@ -0,0 +1,40 @@
+"""
+Excepciones de las llamadas a Yahoo Finance.
+
+Todas heredan de ``UpstreamUnavailableError`` para que las vistas puedan
+distinguir "Yahoo no está disponible ahora" de un error inesperado.
+"""
+
+
+class UpstreamUnavailableError(Exception):
+    """
+    No se ha llamado (o no se ha esperado) a Yahoo por protección del servicio
+    """
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class UpstreamRateLimitError(UpstreamUnavailableError):
+    """
+    La petición se ha descartado porque el cubo no tiene tokens a tiempo
+    """
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """
+    El circuito está abierto y se falla rápido sin llamar a Yahoo
+    """
+
+
+class LatencyBudgetExceeded(UpstreamUnavailableError):
+    """
+    La llamada no ha terminado dentro del presupuesto de latencia
+    """
+
+
+class UpstreamSaturatedError(UpstreamUnavailableError):
+    """
+    No quedan hilos libres para llamar a Yahoo (llamadas abandonadas en curso)
+    """
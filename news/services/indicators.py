@@ -0,0 +1,284 @@
+"""
+Indicadores técnicos vectorizados sobre las series de precios.
+
+Cada indicador es una función sobre arrays NumPy de la serie completa (las
+medias exponenciales usan ``ewm`` de pandas, que es vectorizado, sembrado
+con la media simple como en las definiciones de Wilder y Appel): el periodo
+de calentamiento queda al principio como ``NaN`` y se codifica como ``null``
+en JSON. ``compute_indicators`` calcula varios indicadores para varios
+símbolos y cachea cada resultado por (símbolo, indicador, parámetros, última
+barra), así que una ingesta nueva invalida la caché sin borrar nada.
+
+Los indicadores se piden como ``nombre`` o ``nombre:p1:p2``, por ejemplo
+``sma:50``, ``macd:12:26:9`` o ``bbands:20:2``.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+
+from .price_series import PriceSeries
+from .price_store import get_price_series
+
+INDICATOR_CACHE_TIMEOUT = 24 * 3600
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Media móvil simple de ``window`` barras (sumas acumuladas)
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        cumsum = np.cumsum(np.insert(values, 0, 0.0))
+        out[window - 1 :] = (cumsum[window:] - cumsum[:-window]) / window
+    return out
+
+
+def _smoothed(values: np.ndarray, alpha: float, period: int) -> np.ndarray:
+    """
+    Media exponencial sembrada con la media simple de las primeras
+    ``period`` barras (las anteriores quedan a ``NaN``)
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if period > len(values):
+        return out
+    seeded = values[period - 1 :].copy()
+    seeded[0] = values[:period].mean()
+    out[period - 1 :] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean()
+    return out
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Media móvil exponencial con ``alpha = 2 / (span + 1)``
+    """
+    return _smoothed(values, 2 / (span + 1), span)
+
+
+def wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Suavizado de Wilder (``alpha = 1 / period``), el de RSI y ATR
+    """
+    return _smoothed(values, 1 / period, period)
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        out[window - 1 :] = windows.std(axis=-1)
+    return out
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Índice de fuerza relativa de Wilder (0-100)
+    """
+    close = np.asarray(close, dtype=float)
+    if len(close) < 2:
+        return np.full(len(close), np.nan)
+    change = np.diff(close)
+    gain = wilder(np.clip(change, 0, None), period)
+    loss = wilder(np.clip(-change, 0, None), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = np.where(loss == 0, 100.0, 100 - 100 / (1 + gain / loss))
+    value[np.isnan(gain)] = np.nan
+    return np.insert(value, 0, np.nan)
+
+
+def macd(
+    close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Dict[str, np.ndarray]:
+    """
+    MACD (EMA rápida - EMA lenta), su señal y el histograma
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = np.full(len(line), np.nan)
+    valid = ~np.isnan(line)
+    if valid.any():
+        signal_line[valid] = ema(line[valid], signal)
+    return {"macd": line, "signal": signal_line, "histogram": line - signal_line}
+
+
+def bollinger(
+    close: np.ndarray, window: int = 20, width: float = 2.0
+) -> Dict[str, np.ndarray]:
+    """
+    Bandas de Bollinger: media de ``window`` barras ± ``width`` desviaciones
+    """
+    middle = sma(close, window)
+    deviation = rolling_std(close, window)
+    return {
+        "middle": middle,
+        "upper": middle + width * deviation,
+        "lower": middle - width * deviation,
+    }
+
+
+def atr(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
+) -> np.ndarray:
+    """
+    Average True Range con suavizado de Wilder
+    """
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    previous = np.insert(close[:-1], 0, np.nan)
+    true_range = np.fmax(
+        high - low, np.fmax(np.abs(high - previous), np.abs(low - previous))
+    )
+    return wilder(true_range, period)
+
+
+def vwap(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    window: int = 20,
+) -> np.ndarray:
+    """
+    Precio medio ponderado por volumen de las últimas ``window`` barras con
+    el precio típico ``(high + low + close) / 3``
+    """
+    typical = (np.asarray(high) + np.asarray(low) + np.asarray(close)) / 3
+    volume = np.asarray(volume, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sma(typical * volume, window) / sma(volume, window)
+
+
+def relative_volume(volume: np.ndarray, window: int = 20) -> np.ndarray:
+    """
+    Volumen de cada barra frente a la media de las ``window`` anteriores
+    """
+    volume = np.asarray(volume, dtype=float)
+    average = np.insert(sma(volume, window)[:-1], 0, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(average > 0, volume / average, np.nan)
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """
+    Indicador registrado: función sobre la serie, parámetros por defecto y
+    cuántos de los primeros son ventanas (enteros)
+    """
+
+    compute: Callable[..., Any]
+    defaults: Tuple[float, ...]
+    windows: int = 1
+
+    def __call__(self, series: PriceSeries, params: Sequence[float]):
+        return self.compute(series, *params)
+
+
+INDICATORS: Dict[str, Indicator] = {
+    "sma": Indicator(lambda s, w: sma(s.close, int(w)), (20,)),
+    "ema": Indicator(lambda s, span: ema(s.close, int(span)), (20,)),
+    "rsi": Indicator(lambda s, p: rsi(s.close, int(p)), (14,)),
+    "macd": Indicator(
+        lambda s, f, sl, sg: macd(s.close, int(f), int(sl), int(sg)), (12, 26, 9), 3
+    ),
+    "bbands": Indicator(lambda s, w, k: bollinger(s.close, int(w), k), (20, 2.0)),
+    "atr": Indicator(lambda s, p: atr(s.high, s.low, s.close, int(p)), (14,)),
+    "vwap": Indicator(
+        lambda s, w: vwap(s.high, s.low, s.close, s.volume, int(w)), (20,)
+    ),
+    "rvol": Indicator(lambda s, w: relative_volume(s.volume, int(w)), (20,)),
+}
+
+MAX_WINDOW = 500
+
+
+def _format_param(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def parse_indicator(spec: str) -> Tuple[str, Tuple[float, ...]]:
+    """
+    ``"macd:12:26:9"`` -> ``("macd", (12, 26, 9))``; lanza ``ValueError`` si
+    el indicador o sus parámetros no son válidos
+    """
+    name, *raw = spec.strip().lower().split(":")
+    indicator = INDICATORS.get(name)
+    if indicator is None:
+        raise ValueError(
+            f"Indicador desconocido: {name}. Disponibles: {', '.join(INDICATORS)}"
+        )
+    if len(raw) > len(indicator.defaults):
+        raise ValueError(f"Demasiados parámetros para {name}")
+    try:
+        given = tuple(float(value) for value in raw)
+    except ValueError:
+        raise ValueError(f"Parámetros inválidos para {name}: {spec}")
+    params = given + indicator.defaults[len(given) :]
+    if any(not 0 < p <= MAX_WINDOW for p in params) or any(
+        not float(p).is_integer() for p in params[: indicator.windows]
+    ):
+        raise ValueError(
+            f"Los parámetros de {name} deben ser positivos (ventanas enteras "
+            f"hasta {MAX_WINDOW})"
+        )
+    return name, params
+
+
+def indicator_key(name: str, params: Sequence[float]) -> str:
+    return ":".join([name, *(_format_param(p) for p in params)])
+
+
+def _slice(result, selection: slice):
+    if isinstance(result, dict):
+        return {key: values[selection] for key, values in result.items()}
+    return result[selection]
+
+
+def compute_indicators(
+    symbols: Iterable[str],
+    specs: Iterable[str],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Calcula ``specs`` para cada símbolo sobre la serie completa (el
+    calentamiento no depende del rango) y devuelve el tramo entre ``start``
+    y ``end``::
+
+        {"AAPL": {"dates": [...], "close": array, "indicators": {"sma:20": array}}}
+    """
+    parsed = [parse_indicator(spec) for spec in specs]
+    result = {}
+    for symbol in dict.fromkeys(s.strip().upper() for s in symbols if s.strip()):
+        series = get_price_series(symbol)
+        window = series.between(start, end)
+        lo = len(series) - len(series.between(start))
+        selection = slice(lo, lo + len(window))
+
+        values: Dict[str, Any] = {}
+        for name, params in parsed:
+            key = indicator_key(name, params)
+            if key in values:
+                continue
+            full = None
+            cache_key = None
+            if len(series):
+                cache_key = f"indicators:{symbol}:{key}:{series.version}"
+                full = cache.get(cache_key)
+            if full is None:
+                full = INDICATORS[name](series, params)
+                if cache_key:
+                    cache.set(cache_key, full, timeout=INDICATOR_CACHE_TIMEOUT)
+            values[key] = _slice(full, selection)
+
+        result[symbol] = {
+            "dates": np.datetime_as_string(window.dates, unit="D").tolist(),
+            "close": np.asarray(window.close),
+            "indicators": values,
+        }
+    return result
+
@@ -1,21 +1,39 @@
-import yfinance as yf
 import requests
+import time
+import uuid
 from django.db import transaction
-from typing import Dict, List, Any
-from ..models import New
+from typing import Dict, List, Any, Optional
+from ..models import New, NewsTicker
+from .data_sources import get_data_source
+from .dedup import DuplicateDetector
+from .exceptions import UpstreamUnavailableError
+from .rate_limiter import PRIORITY_NORMAL
+from .singleflight import get_singleflight
+from .upstream import call_upstream
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_news(ticker: str, news_count: int = 10) -> List[Dict[str, Any]]:
+def fetch_news(
+    ticker: str,
+    news_count: int = 10,
+    priority: str = PRIORITY_NORMAL,
+    budget: Optional[float] = None,
+) -> List[Dict[str, Any]]:
     """
     Obtener noticias de yfinance para un ticker específico
     """
     try:
-        search_instance = yf.Search(ticker, news_count=news_count)
-        search_instance.timeout = 60
-        return search_instance.news
+        return call_upstream(
+            lambda timeout: get_data_source().search_news(
+                ticker, news_count, timeout
+            ),
+            priority=priority,
+            budget=budget,
+        )
+    except UpstreamUnavailableError:
+        raise
     except requests.exceptions.ReadTimeout as e:
         raise Exception("Timeout al obtener noticias") from e
     except Exception as e:
@@ -30,9 +48,29 @@ def validate_news_data(news_data: Dict[str, Any]) -> bool:
     return all(news_data.get(field) for field in required_fields)
 
 
-def process_news_item(news_data: Dict[str, Any]) -> tuple[New, bool]:
+def build_duplicate_detector(news_list: List[Dict[str, Any]]) -> DuplicateDetector:
+    """
+    Detector de duplicados con las noticias guardadas cercanas a las del lote
+    """
+    times = []
+    for news_data in news_list:
+        try:
+            times.append(int(news_data.get("providerPublishTime")))
+        except (ValueError, TypeError):
+            continue
+    detector = DuplicateDetector()
+    since = (min(times) if times else int(time.time())) - detector.window
+    return detector.load_recent(since)
+
+
+def process_news_item(
+    news_data: Dict[str, Any], detector: Optional[DuplicateDetector] = None
+) -> tuple[New, bool]:
     """
-    Procesar un elemento de noticia y crear/actualizar en la base de datos
+    Procesar un elemento de noticia y crear/actualizar en la base de datos.
+
+    Si se pasa ``detector``, la noticia se enlaza a su canónica cuando es un
+    casi duplicado de otra reciente.
     """
     uuid_val = news_data.get("uuid")
     title = news_data.get("title")
@@ -50,26 +88,62 @@ def process_news_item(news_data: Dict[str, Any]) -> tuple[New, bool]:
         except (ValueError, TypeError):
             provider_publish_time = None
 
-    obj, created = New.objects.update_or_create(
-        uuid=uuid_val,
-        defaults={
-            "title": title,
-            "publisher": publisher,
-            "link": link,
-            "provider_publish_time": provider_publish_time,
-            "news_type": news_type,
-            "thumbnail": thumbnail,
-            "related_tickers": related_tickers,
-        },
-    )
+    defaults = {
+        "title": title,
+        "publisher": publisher,
+        "link": link,
+        "provider_publish_time": provider_publish_time,
+        "news_type": news_type,
+        "thumbnail": thumbnail,
+        "related_tickers": related_tickers,
+    }
+
+    if detector is not None:
+        fingerprint, canonical = detector.assign(
+            str(uuid.UUID(str(uuid_val))), title, provider_publish_time
+        )
+        defaults["title_fingerprint"] = fingerprint
+        defaults["canonical_id"] = canonical
+
+    obj, created = New.objects.update_or_create(uuid=uuid_val, defaults=defaults)
+    sync_news_tickers(obj)
 
     return obj, created
 
 
-@transaction.atomic
-def fetch_and_save_news(ticker: str, news_count: int = 10) -> Dict[str, Any]:
+def sync_news_tickers(news: New) -> None:
     """
-    Buscar noticias para un ticker y guardarlas en la base de datos
+    Mantiene las filas de ``NewsTicker`` alineadas con ``related_tickers``
+    """
+    symbols = {
+        str(symbol).strip().upper()
+        for symbol in news.related_tickers or []
+        if str(symbol).strip()
+    }
+    news.tickers.exclude(symbol__in=symbols).delete()
+    news.tickers.filter(symbol__in=symbols).exclude(
+        publish_time=news.provider_publish_time
+    ).update(publish_time=news.provider_publish_time)
+    NewsTicker.objects.bulk_create(
+        [
+            NewsTicker(news=news, symbol=symbol, publish_time=news.provider_publish_time)
+            for symbol in symbols
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def fetch_and_save_news(
+    ticker: str,
+    news_count: int = 10,
+    priority: str = PRIORITY_NORMAL,
+    budget: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Buscar noticias para un ticker y guardarlas en la base de datos.
+
+    Las llamadas concurrentes con el mismo (ticker, news_count) se agrupan:
+    sólo una consulta a Yahoo y las demás comparten su resultado.
     """
     if not ticker or not ticker.strip():
         raise ValueError("El ticker no puede estar vacío")
@@ -79,10 +153,23 @@ def fetch_and_save_news(ticker: str, news_count: int = 10) -> Dict[str, Any]:
     if news_count <= 0:
         raise ValueError("La cantidad de noticias debe ser un número positivo")
 
+    result, shared = get_singleflight().do(
+        f"news:{ticker}:{news_count}",
+        lambda: _fetch_and_save_news(ticker, news_count, priority, budget),
+    )
+    if shared:
+        logger.info(f"Resultado compartido con una ingesta en curso para {ticker}")
+    return result
+
+
+@transaction.atomic
+def _fetch_and_save_news(
+    ticker: str, news_count: int, priority: str, budget: Optional[float]
+) -> Dict[str, Any]:
     logger.info(f"Obteniendo noticias para {ticker}...")
 
     try:
-        news_list = fetch_news(ticker, news_count)
+        news_list = fetch_news(ticker, news_count, priority=priority, budget=budget)
     except Exception as e:
         logger.error(f"Error al obtener noticias para {ticker}: {e}")
         raise
@@ -99,6 +186,7 @@ def fetch_and_save_news(ticker: str, news_count: int = 10) -> Dict[str, Any]:
     saved_count = 0
     updated_count = 0
     news_objects = []
+    detector = build_duplicate_detector(news_list)
 
     for news_data in news_list:
         if not validate_news_data(news_data):
@@ -106,7 +194,7 @@ def fetch_and_save_news(ticker: str, news_count: int = 10) -> Dict[str, Any]:
             continue
 
         try:
-            obj, created = process_news_item(news_data)
+            obj, created = process_news_item(news_data, detector)
             action = "creada" if created else "actualizada"
             logger.info(f"Noticia {action}: {obj.title}")
 
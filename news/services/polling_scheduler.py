@@ -0,0 +1,149 @@
+"""
+Planificador adaptativo de consultas de noticias para la watchlist.
+
+Cada ticker vigilado tiene su propio intervalo de consulta, calculado a partir
+de la velocidad observada de noticias nuevas (media exponencial de noticias por
+hora) y de si el mercado estadounidense está abierto. Los tickers con mucha
+actividad se consultan cada minuto y los inactivos cada hora, de forma que el
+volumen de peticiones a Yahoo queda acotado.
+"""
+
+import logging
+from datetime import datetime, time as dt_time, timedelta
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import WatchedTicker
+
+logger = logging.getLogger(__name__)
+
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+
+DEFAULT_POLLING = {
+    "MIN_INTERVAL": 60,  # segundos
+    "MAX_INTERVAL": 3600,
+    # Noticias nuevas que se espera encontrar en cada consulta
+    "TARGET_NEWS_PER_POLL": 1.0,
+    # Multiplicador del intervalo con el mercado cerrado
+    "OFF_HOURS_FACTOR": 4.0,
+    # Peso de la última observación en la media exponencial
+    "SMOOTHING": 0.3,
+    # Máximo de tickers que se encolan en cada tick de beat
+    "BATCH_SIZE": 50,
+}
+
+
+def get_polling_config() -> Dict[str, Any]:
+    return {**DEFAULT_POLLING, **getattr(settings, "NEWS_POLLING", {})}
+
+
+def is_market_open(now: datetime) -> bool:
+    """
+    Indica si el mercado de EE. UU. está en sesión regular (sin festivos)
+    """
+    local = now.astimezone(MARKET_TIMEZONE)
+    if local.weekday() >= 5:
+        return False
+    return MARKET_OPEN <= local.time() < MARKET_CLOSE
+
+
+def compute_poll_interval(
+    velocity: float, market_open: bool, config: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Calcula el intervalo (segundos) para encontrar ~TARGET_NEWS_PER_POLL
+    noticias nuevas por consulta, acotado entre MIN_INTERVAL y MAX_INTERVAL
+    """
+    config = config or get_polling_config()
+    if velocity > 0:
+        interval = config["TARGET_NEWS_PER_POLL"] * 3600 / velocity
+    else:
+        interval = config["MAX_INTERVAL"]
+    if not market_open:
+        interval *= config["OFF_HOURS_FACTOR"]
+    return int(min(config["MAX_INTERVAL"], max(config["MIN_INTERVAL"], interval)))
+
+
+def _initial_velocity(news_objects: List[Any], now: datetime) -> float:
+    # En la primera consulta todo es "nuevo": se estima la velocidad con las
+    # noticias publicadas en las últimas 24 horas
+    since = (now - timedelta(hours=24)).timestamp()
+    recent = sum(
+        1
+        for obj in news_objects
+        if obj.provider_publish_time and obj.provider_publish_time >= since
+    )
+    return recent / 24
+
+
+def record_poll(
+    watch: WatchedTicker,
+    saved_count: Optional[int],
+    news_objects: Optional[List[Any]] = None,
+    now: Optional[datetime] = None,
+) -> WatchedTicker:
+    """
+    Actualiza velocidad, intervalo y próxima consulta tras un sondeo.
+
+    ``saved_count`` es ``None`` si la consulta no se hizo (p. ej. se descartó
+    por el limitador); en ese caso sólo se reprograma con el intervalo actual.
+    """
+    config = get_polling_config()
+    now = now or timezone.now()
+
+    if saved_count is not None:
+        if watch.last_polled_at is None:
+            watch.news_velocity = _initial_velocity(news_objects or [], now)
+        else:
+            elapsed_hours = max(
+                (now - watch.last_polled_at).total_seconds() / 3600,
+                config["MIN_INTERVAL"] / 3600,
+            )
+            observed = saved_count / elapsed_hours
+            alpha = config["SMOOTHING"]
+            watch.news_velocity = alpha * observed + (1 - alpha) * watch.news_velocity
+        watch.last_polled_at = now
+        watch.poll_interval = compute_poll_interval(
+            watch.news_velocity, is_market_open(now), config
+        )
+
+    watch.next_poll_at = now + timedelta(seconds=watch.poll_interval)
+    watch.save(
+        update_fields=[
+            "news_velocity",
+            "poll_interval",
+            "last_polled_at",
+            "next_poll_at",
+        ]
+    )
+    return watch
+
+
+def claim_due_tickers(now: Optional[datetime] = None) -> List[WatchedTicker]:
+    """
+    Selecciona los tickers pendientes y los reclama para este tick.
+
+    El reclamo adelanta ``next_poll_at`` con una actualización condicional,
+    así dos schedulers concurrentes no encolan el mismo ticker dos veces.
+    """
+    config = get_polling_config()
+    now = now or timezone.now()
+    due = WatchedTicker.objects.filter(active=True, next_poll_at__lte=now).order_by(
+        "next_poll_at"
+    )[: config["BATCH_SIZE"]]
+
+    claimed = []
+    for watch in due:
+        lease = now + timedelta(seconds=watch.poll_interval)
+        updated = WatchedTicker.objects.filter(
+            pk=watch.pk, next_poll_at=watch.next_poll_at
+        ).update(next_poll_at=lease)
+        if updated:
+            watch.next_poll_at = lease
+            claimed.append(watch)
+    return claimed
@@ -0,0 +1,254 @@
+"""
+Series de precios en columnas NumPy para gráficos y analítica.
+
+``load_price_series`` lee los precios históricos de un símbolo con
+``values_list`` y devuelve un array por columna, sin instanciar modelos.
+``resample`` agrega las barras diarias en velas semanales, mensuales,
+trimestrales, anuales o de N días. Las vistas y la analítica leen las series
+con ``price_store.get_price_series``, que usa el almacén mapeado en memoria.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from datetime import date
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from django.core.cache import cache
+
+from ..models import HistoricalPrice
+from ..utils.downsampling import lttb_indices
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """
+    Barras diarias de un símbolo ordenadas por fecha (``datetime64[D]``)
+    """
+
+    symbol: str
+    dates: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def take(self, indices) -> "PriceSeries":
+        return PriceSeries(
+            self.symbol,
+            self.dates[indices],
+            *(getattr(self, name)[indices] for name in COLUMNS),
+        )
+
+    @property
+    def last_bar_key(self) -> Optional[str]:
+        """
+        Fecha, cierre y volumen de la última barra
+        """
+        if not len(self):
+            return None
+        return (
+            f"{np.datetime_as_string(self.dates[-1], unit='D')}:"
+            f"{float(self.close[-1])!r}:{int(self.volume[-1])}"
+        )
+
+    @cached_property
+    def version(self) -> Optional[str]:
+        """
+        Huella del contenido de la serie para invalidar cachés derivadas:
+        cambia también si se edita o borra una barra antigua
+        """
+        if not len(self):
+            return None
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(np.ascontiguousarray(self.dates).tobytes())
+        for name in COLUMNS:
+            digest.update(np.ascontiguousarray(getattr(self, name)).tobytes())
+        return f"{self.last_bar_key}:{len(self)}:{digest.hexdigest()}"
+
+    def between(
+        self, start: Optional[date] = None, end: Optional[date] = None
+    ) -> "PriceSeries":
+        """
+        Barras con ``start <= fecha <= end``; es un corte sin copia
+        """
+        lo = 0
+        hi = len(self)
+        if start is not None:
+            lo = int(np.searchsorted(self.dates, np.datetime64(start, "D")))
+        if end is not None:
+            hi = int(
+                np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+            )
+        return self.take(slice(lo, hi))
+
+    def downsample(self, max_points: int) -> "PriceSeries":
+        """
+        Reduce la serie a ``max_points`` barras con LTTB sobre el cierre
+        """
+        if len(self) <= max_points:
+            return self
+        x = self.dates.astype(np.int64)
+        return self.take(lttb_indices(x, self.close, max_points))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Lista de barras ``{date, open, high, low, close, volume}`` para JSON
+        """
+        dates = np.datetime_as_string(self.dates, unit="D").tolist()
+        return [
+            {"date": d, "open": o, "high": h, "low": low, "close": c, "volume": v}
+            for d, o, h, low, c, v in zip(
+                dates, *(getattr(self, name).tolist() for name in COLUMNS)
+            )
+        ]
+
+
+def empty_series(symbol: str) -> PriceSeries:
+    return PriceSeries(
+        symbol,
+        np.array([], dtype="datetime64[D]"),
+        *(
+            np.array([], dtype=np.int64 if name == "volume" else float)
+            for name in COLUMNS
+        ),
+    )
+
+
+def concat_series(first: PriceSeries, second: PriceSeries) -> PriceSeries:
+    return PriceSeries(
+        first.symbol,
+        np.concatenate([first.dates, second.dates]),
+        *(
+            np.concatenate([getattr(first, name), getattr(second, name)])
+            for name in COLUMNS
+        ),
+    )
+
+
+def load_price_series(
+    symbol: str, start: Optional[date] = None, end: Optional[date] = None
+) -> PriceSeries:
+    """
+    Precios de ``symbol`` entre ``start`` y ``end`` (ambos incluidos)
+    """
+    symbol = symbol.upper()
+    queryset = HistoricalPrice.objects.filter(symbol=symbol)
+    if start:
+        queryset = queryset.filter(date__gte=start)
+    if end:
+        queryset = queryset.filter(date__lte=end)
+    rows = list(queryset.order_by("date").values_list("date", *COLUMNS))
+    if not rows:
+        return empty_series(symbol)
+
+    dates, opens, highs, lows, closes, volumes = zip(*rows)
+    return PriceSeries(
+        symbol,
+        np.array(dates, dtype="datetime64[D]"),
+        np.array(opens, dtype=float),
+        np.array(highs, dtype=float),
+        np.array(lows, dtype=float),
+        np.array(closes, dtype=float),
+        np.array(volumes, dtype=np.int64),
+    )
+
+
+# Intervalos de resample, con la misma notación que yfinance
+CALENDAR_INTERVALS = ("1wk", "1mo", "3mo", "1y")
+_DAYS_RE = re.compile(r"^([1-9][0-9]{0,2})d$")
+RESAMPLE_CACHE_TIMEOUT = 24 * 3600
+
+
+def validate_interval(interval: str) -> str:
+    """
+    Normaliza ``interval`` (``1wk``, ``1mo``, ``3mo``, ``1y`` o ``<N>d``) y
+    lanza ``ValueError`` si no es válido
+    """
+    interval = (interval or "").strip().lower()
+    if interval in CALENDAR_INTERVALS or _DAYS_RE.match(interval):
+        return interval
+    raise ValueError(
+        f"Intervalo inválido: usa {', '.join(CALENDAR_INTERVALS)} o <N>d (ej. 5d)"
+    )
+
+
+def _bucket_keys(dates: np.ndarray, interval: str) -> np.ndarray:
+    days = dates.astype(np.int64)
+    if interval == "1wk":
+        # Semanas de lunes a domingo (el 1970-01-01 fue jueves)
+        return (days + 3) // 7
+    if interval == "1mo":
+        return dates.astype("datetime64[M]").astype(np.int64)
+    if interval == "3mo":
+        return dates.astype("datetime64[M]").astype(np.int64) // 3
+    if interval == "1y":
+        return dates.astype("datetime64[Y]").astype(np.int64)
+    # Bloques de N días naturales anclados en el epoch: los límites no
+    # dependen del rango pedido
+    return days // int(_DAYS_RE.match(interval).group(1))
+
+
+def resample(series: PriceSeries, interval: str) -> PriceSeries:
+    """
+    Agrega las barras en cubos de ``interval``: apertura de la primera barra,
+    máximo de los máximos, mínimo de los mínimos, cierre de la última y
+    volumen sumado. Cada vela lleva la fecha de su primera barra.
+    """
+    interval = validate_interval(interval)
+    if not len(series):
+        return series
+
+    keys = _bucket_keys(series.dates, interval)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(series)] - 1
+    return PriceSeries(
+        series.symbol,
+        series.dates[starts],
+        series.open[starts],
+        np.maximum.reduceat(series.high, starts),
+        np.minimum.reduceat(series.low, starts),
+        series.close[ends],
+        np.add.reduceat(series.volume, starts),
+    )
+
+
+def resampled_records(
+    symbol: str,
+    interval: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Velas de ``symbol`` en ``interval`` con fecha entre ``start`` y ``end``.
+
+    El histórico completo agregado se cachea por (símbolo, intervalo, última
+    barra): una ingesta nueva cambia la clave y el rango se filtra después.
+    """
+    from .price_store import get_price_series
+
+    symbol = symbol.upper()
+    interval = validate_interval(interval)
+    series = get_price_series(symbol)
+    if not len(series):
+        return []
+
+    key = f"prices:resample:{symbol}:{interval}:{series.version}"
+    records = cache.get(key)
+    if records is None:
+        records = resample(series, interval).to_records()
+        cache.set(key, records, timeout=RESAMPLE_CACHE_TIMEOUT)
+
+    if start or end:
+        low = start.isoformat() if start else ""
+        high = end.isoformat() if end else "9999-12-31"
+        records = [r for r in records if low <= r["date"] <= high]
+    return records
@@ -0,0 +1,371 @@
+"""
+Ingesta incremental de precios históricos.
+
+Para cada símbolo se consultan las dos últimas barras guardadas y sólo se
+pide a Yahoo el tramo que falta, desde la penúltima: la última se vuelve a
+pedir para completarla si el día seguía abierto y la penúltima, ya cerrada,
+sirve de ancla. Yahoo devuelve precios ajustados (``auto_adjust``) y tras un
+split o un dividendo reajusta todo el histórico anterior; si el cierre del
+ancla ya no coincide con el guardado, o el tramo nuevo trae un dividendo o
+split, se vuelve a descargar el histórico completo del símbolo para no mezclar
+escalas. Las barras se escriben con un único ``bulk_create`` con upsert sobre
+``(symbol, date)``, construido a partir de las columnas del DataFrame en
+lugar de recorrerlo fila a fila.
+
+``update_price_histories`` hace lo mismo para un universo de símbolos:
+descarga cada lote en paralelo y lo escribe con un solo upsert. Después de
+escribir se actualiza el almacén columnar (``price_store``).
+"""
+
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.db.models import F, Max, Min, Window
+from django.db.models.functions import RowNumber
+
+from ..models import HistoricalPrice
+from .price_store import refresh_price_store
+from .rate_limiter import PRIORITY_NORMAL
+from .stock_service import fetch_price_history
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+# Símbolos por lote y descargas simultáneas en la actualización masiva
+DEFAULT_BATCH_SYMBOLS = 50
+DEFAULT_DOWNLOAD_WORKERS = 8
+PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+UPDATE_FIELDS = ["open", "high", "low", "close", "volume", "dividends", "stock_splits"]
+# Diferencia relativa de cierre a partir de la cual el ancla se da por reajustada
+ADJUSTMENT_TOLERANCE = 1e-5
+
+
+class StoredPrices(NamedTuple):
+    """
+    Histórico guardado de un símbolo: primera y última fecha y la barra
+    anterior a la última (ancla), si la hay
+    """
+
+    first: date
+    last: date
+    anchor_date: Optional[date] = None
+    anchor_close: Optional[float] = None
+
+
+def last_price_dates(symbols: Iterable[str]) -> Dict[str, date]:
+    """
+    Última fecha guardada por símbolo (los símbolos sin precios no aparecen)
+    """
+    return dict(
+        HistoricalPrice.objects.filter(symbol__in=[s.upper() for s in symbols])
+        .values("symbol")
+        .annotate(last=Max("date"))
+        .values_list("symbol", "last")
+    )
+
+
+def stored_prices(symbols: Iterable[str]) -> Dict[str, StoredPrices]:
+    """
+    ``StoredPrices`` por símbolo con dos consultas para todo el universo (los
+    símbolos sin precios no aparecen)
+    """
+    symbols = [s.upper() for s in symbols]
+    ranges = (
+        HistoricalPrice.objects.filter(symbol__in=symbols)
+        .values("symbol")
+        .annotate(first=Min("date"), last=Max("date"))
+        .values_list("symbol", "first", "last")
+    )
+    stored = {symbol: StoredPrices(first, last) for symbol, first, last in ranges}
+    anchors = (
+        HistoricalPrice.objects.filter(symbol__in=symbols)
+        .annotate(
+            position=Window(
+                RowNumber(), partition_by=F("symbol"), order_by=F("date").desc()
+            )
+        )
+        .filter(position=2)
+        .values_list("symbol", "date", "close")
+    )
+    for symbol, day, close in anchors:
+        stored[symbol] = stored[symbol]._replace(anchor_date=day, anchor_close=close)
+    return stored
+
+
+def history_was_adjusted(stored: StoredPrices, rows: list) -> bool:
+    """
+    ``True`` si las barras nuevas indican que Yahoo reajustó el histórico
+    guardado: el cierre del ancla cambió o hay un dividendo o split posterior
+    a la última barra guardada
+    """
+    for row in rows:
+        if row.date == stored.anchor_date and not math.isclose(
+            row.close, stored.anchor_close, rel_tol=ADJUSTMENT_TOLERANCE
+        ):
+            return True
+        if row.date > stored.last and (row.dividends or row.stock_splits):
+            return True
+    return False
+
+
+def _column(df: pd.DataFrame, name: str, default: float = 0.0) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), default, dtype=float)
+    return df[name].to_numpy(dtype=float, na_value=np.nan)
+
+
+def build_price_rows(symbol: str, df: pd.DataFrame) -> list:
+    """
+    Instancias de ``HistoricalPrice`` desde las columnas de un histórico de
+    yfinance. Se descartan las barras sin OHLC completo; una fecha repetida
+    conserva la última barra.
+    """
+    if df is None or df.empty:
+        return []
+
+    prices = {name: _column(df, name, np.nan) for name in PRICE_COLUMNS}
+    valid = np.ones(len(df), dtype=bool)
+    for values in prices.values():
+        valid &= np.isfinite(values)
+    if not valid.any():
+        return []
+
+    index = pd.DatetimeIndex(df.index)
+    dates = index.date[valid]
+    volume = np.nan_to_num(_column(df, "Volume")[valid]).astype(np.int64)
+    dividends = np.nan_to_num(_column(df, "Dividends")[valid])
+    splits = np.nan_to_num(_column(df, "Stock Splits")[valid])
+
+    rows = {}
+    for values in zip(
+        dates,
+        prices["Open"][valid].tolist(),
+        prices["High"][valid].tolist(),
+        prices["Low"][valid].tolist(),
+        prices["Close"][valid].tolist(),
+        volume.tolist(),
+        dividends.tolist(),
+        splits.tolist(),
+    ):
+        rows[values[0]] = HistoricalPrice(
+            symbol=symbol,
+            date=values[0],
+            open=values[1],
+            high=values[2],
+            low=values[3],
+            close=values[4],
+            volume=values[5],
+            dividends=values[6],
+            stock_splits=values[7],
+        )
+    return list(rows.values())
+
+
+def save_price_rows(rows: list) -> int:
+    """
+    Upsert en bloque sobre ``(symbol, date)``; devuelve las filas escritas
+    """
+    if not rows:
+        return 0
+    with transaction.atomic():
+        HistoricalPrice.objects.bulk_create(
+            rows,
+            batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["symbol", "date"],
+            update_fields=UPDATE_FIELDS,
+        )
+    return len(rows)
+
+
+def fetch_missing_rows(
+    symbol: str,
+    period: str = "1mo",
+    interval: str = "1d",
+    stored: Optional[StoredPrices] = None,
+    priority: str = PRIORITY_NORMAL,
+) -> Tuple[int, list]:
+    """
+    Descarga las barras de ``symbol`` que faltan respecto a ``stored`` sin
+    escribirlas; devuelve ``(barras descargadas, filas)``. Si Yahoo reajustó
+    el histórico, las filas son el histórico completo desde ``stored.first``.
+
+    No toca la base de datos, así que puede ejecutarse en hilos.
+    """
+    if stored is None:
+        df = fetch_price_history(
+            symbol, period=period, interval=interval, priority=priority
+        )
+        return (0 if df is None else len(df)), build_price_rows(symbol, df)
+    if stored.last >= date.today():
+        # La barra de hoy se completa en la siguiente ejecución
+        return 0, []
+
+    end = (date.today() + timedelta(days=1)).isoformat()
+    start = stored.anchor_date or stored.last
+    df = fetch_price_history(
+        symbol,
+        interval=interval,
+        priority=priority,
+        start=start.isoformat(),
+        end=end,
+    )
+    # Las fuentes grabadas ignoran start: las barras anteriores se descartan
+    rows = [row for row in build_price_rows(symbol, df) if row.date >= start]
+    fetched = 0 if df is None else len(df)
+    if not history_was_adjusted(stored, rows):
+        return fetched, rows
+
+    logger.info(
+        f"Histórico de {symbol} reajustado por Yahoo (split o dividendo): "
+        f"se descarga completo desde {stored.first}"
+    )
+    df = fetch_price_history(
+        symbol,
+        interval=interval,
+        priority=priority,
+        start=stored.first.isoformat(),
+        end=end,
+    )
+    return fetched + (0 if df is None else len(df)), build_price_rows(symbol, df)
+
+
+def _created(rows: list, stored: Optional[StoredPrices]) -> int:
+    return sum(1 for row in rows if stored is None or row.date > stored.last)
+
+
+def _rewrites_history(rows: list, stored: Optional[StoredPrices]) -> bool:
+    # Sólo la descarga completa tras un reajuste trae barras anteriores al ancla
+    if stored is None or not rows:
+        return False
+    return min(row.date for row in rows) < (stored.anchor_date or stored.last)
+
+
+def update_price_history(
+    symbol: str,
+    period: str = "1mo",
+    interval: str = "1d",
+    stored: Optional[StoredPrices] = None,
+    priority: str = PRIORITY_NORMAL,
+) -> Dict[str, Any]:
+    """
+    Descarga y guarda las barras que faltan de ``symbol``.
+
+    Sin precios guardados se pide ``period`` completo; si no, desde la
+    penúltima fecha guardada (``stored`` evita la consulta si ya se conoce).
+    """
+    symbol = symbol.upper()
+    if stored is None:
+        stored = stored_prices([symbol]).get(symbol)
+
+    fetched, rows = fetch_missing_rows(symbol, period, interval, stored, priority)
+    saved = save_price_rows(rows)
+    if saved:
+        refresh_price_store([symbol], rebuild=_rewrites_history(rows, stored))
+    created = _created(rows, stored)
+    logger.info(f"Precios de {symbol}: {saved} barras guardadas, {created} nuevas")
+    return {
+        "symbol": symbol,
+        "fetched": fetched,
+        "saved": saved,
+        "created": created,
+        "since": stored and stored.last,
+    }
+
+
+def update_price_histories(
+    symbols: Iterable[str],
+    period: str = "1mo",
+    interval: str = "1d",
+    batch_size: int = DEFAULT_BATCH_SYMBOLS,
+    max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    priority: str = PRIORITY_NORMAL,
+    on_batch: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Actualiza los precios de muchos símbolos por lotes.
+
+    Lo guardado de cada símbolo se lee con dos consultas. Cada lote se
+    descarga con un pool de ``max_workers`` hilos (las descargas pasan por el
+    limitador y el circuit breaker como cualquier otra) y se escribe con un
+    único upsert en bloque. ``on_batch`` recibe el resumen de cada lote.
+    """
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    stored = stored_prices(symbols)
+    batches = [
+        symbols[i : i + batch_size] for i in range(0, len(symbols), batch_size)
+    ]
+    totals = {"symbols": len(symbols), "fetched": 0, "saved": 0, "created": 0}
+    errors: Dict[str, str] = {}
+    start = time.monotonic()
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="price-download"
+    ) as pool:
+        for number, batch in enumerate(batches, start=1):
+            batch_start = time.monotonic()
+            futures = {
+                pool.submit(
+                    fetch_missing_rows,
+                    symbol,
+                    period,
+                    interval,
+                    stored.get(symbol),
+                    priority,
+                ): symbol
+                for symbol in batch
+            }
+            rows, fetched, created, batch_errors = [], 0, 0, {}
+            rewritten = set()
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    symbol_fetched, symbol_rows = future.result()
+                except Exception as e:
+                    logger.warning(f"Error al descargar precios de {symbol}: {e}")
+                    batch_errors[symbol] = str(e)
+                    continue
+                fetched += symbol_fetched
+                created += _created(symbol_rows, stored.get(symbol))
+                if _rewrites_history(symbol_rows, stored.get(symbol)):
+                    rewritten.add(symbol)
+                rows.extend(symbol_rows)
+
+            saved = save_price_rows(rows)
+            refresh_price_store(
+                symbol
+                for symbol in dict.fromkeys(row.symbol for row in rows)
+                if symbol not in rewritten
+            )
+            refresh_price_store(sorted(rewritten), rebuild=True)
+            errors.update(batch_errors)
+            totals["fetched"] += fetched
+            totals["saved"] += saved
+            totals["created"] += created
+            if on_batch:
+                on_batch(
+                    {
+                        "batch": number,
+                        "batches": len(batches),
+                        "symbols": len(batch),
+                        "saved": saved,
+                        "created": created,
+                        "errors": batch_errors,
+                        "elapsed": time.monotonic() - batch_start,
+                    }
+                )
+
+    totals["errors"] = errors
+    totals["elapsed"] = time.monotonic() - start
+    logger.info(
+        f"Precios de {len(symbols)} símbolos: {totals['saved']} barras guardadas "
+        f"en {totals['elapsed']:.1f}s ({len(errors)} errores)"
+    )
+    return totals
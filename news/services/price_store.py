@@ -0,0 +1,259 @@
+"""
+Almacén columnar de precios en ficheros NumPy mapeados en memoria.
+
+Cada símbolo guarda una versión inmutable por escritura con un fichero
+``.npy`` por columna (``dates``, ``open``, ``high``, ``low``, ``close`` y
+``volume``)::
+
+    <DIRECTORY>/<SYMBOL>/CURRENT          # nombre de la versión vigente
+    <DIRECTORY>/<SYMBOL>/<versión>/close.npy
+
+Las lecturas abren las columnas con ``np.load(mmap_mode="r")`` y los rangos
+de fechas son cortes sin copia, así que servir diez años de barras no
+necesita consulta ni objetos del ORM. Las escrituras crean una versión nueva
+y sustituyen ``CURRENT`` con ``os.replace`` (atómico): un lector nunca ve una
+versión a medias y los mapas ya abiertos siguen siendo válidos aunque se
+borre la versión anterior.
+
+Tras cada ingesta ``refresh`` lee de la base de datos sólo las barras desde
+la última fecha guardada. Si un símbolo no está en el almacén se construye
+en la primera lectura; ``python manage.py rebuild_price_store`` lo reconstruye
+entero. Las ediciones y borrados fila a fila de ``HistoricalPrice`` (p. ej.
+desde el admin) invalidan la serie del símbolo (``news.signals``), que se
+reconstruye en la siguiente lectura.
+
+Las lecturas no consultan la base de datos, así que ``DIRECTORY``
+(``PRICE_STORE_DIR``) debe ser almacenamiento compartido por todos los hosts
+web y workers: un directorio local por host no vería las ingestas ni las
+invalidaciones hechas en otro y serviría series obsoletas.
+"""
+
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from .price_series import (
+    COLUMNS,
+    PriceSeries,
+    concat_series,
+    load_price_series,
+)
+
+logger = logging.getLogger(__name__)
+
+POINTER = "CURRENT"
+_SYMBOL_RE = re.compile(r"^[A-Z0-9^=._-]{1,20}$")
+
+
+class PriceStore:
+    """
+    Almacén de series de precios por símbolo en ``directory``
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._open: Dict[str, Tuple[str, PriceSeries]] = {}
+
+    def _symbol_dir(self, symbol: str) -> Path:
+        symbol = symbol.upper()
+        if not _SYMBOL_RE.match(symbol):
+            raise ValueError(f"Símbolo inválido para el almacén: {symbol}")
+        return self.directory / symbol
+
+    def version(self, symbol: str) -> Optional[str]:
+        try:
+            pointer = self._symbol_dir(symbol) / POINTER
+            return pointer.read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    # Lectura -----------------------------------------------------------------
+
+    def load(self, symbol: str) -> Optional[PriceSeries]:
+        """
+        Serie completa mapeada en memoria, o ``None`` si el símbolo no está
+        """
+        symbol = symbol.upper()
+        # Un escritor puede borrar la versión entre leer CURRENT y abrirla
+        for _ in range(3):
+            version = self.version(symbol)
+            if version is None:
+                return None
+            with self._lock:
+                cached = self._open.get(symbol)
+            if cached and cached[0] == version:
+                return cached[1]
+            try:
+                series = self._map(symbol, version)
+            except FileNotFoundError:
+                continue
+            with self._lock:
+                self._open[symbol] = (version, series)
+            return series
+        return None
+
+    def _map(self, symbol: str, version: str) -> PriceSeries:
+        path = self._symbol_dir(symbol) / version
+        columns = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r")
+            for name in ("dates", *COLUMNS)
+        }
+        return PriceSeries(symbol, **columns)
+
+    # Escritura -----------------------------------------------------------------
+
+    def write(self, series: PriceSeries) -> str:
+        """
+        Guarda ``series`` como nueva versión vigente y borra las anteriores
+        """
+        symbol_dir = self._symbol_dir(series.symbol)
+        version = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        path = symbol_dir / version
+        path.mkdir(parents=True)
+        np.save(path / "dates.npy", np.ascontiguousarray(series.dates))
+        for name in COLUMNS:
+            column = np.ascontiguousarray(getattr(series, name))
+            np.save(path / f"{name}.npy", column)
+
+        pointer = symbol_dir / f"{POINTER}.{version}"
+        pointer.write_text(version)
+        os.replace(pointer, symbol_dir / POINTER)
+
+        for old in symbol_dir.iterdir():
+            if old.is_dir() and old.name != version:
+                shutil.rmtree(old, ignore_errors=True)
+        return version
+
+    def refresh(self, symbol: str) -> PriceSeries:
+        """
+        Incorpora las barras nuevas o actualizadas desde la base de datos.
+
+        Sólo se leen las barras desde la última fecha guardada (incluida, por
+        si la última barra del día se completó después). Los símbolos sin
+        precios no se guardan.
+        """
+        symbol = symbol.upper()
+        current = self.load(symbol)
+        if current is None or not len(current):
+            series = load_price_series(symbol)
+        else:
+            last: date = current.dates[-1].item()
+            delta = load_price_series(symbol, start=last)
+            if len(delta) == 1 and delta.last_bar_key == current.last_bar_key:
+                return current
+            # La última barra guardada se sustituye por la de la base de datos
+            series = concat_series(current.take(slice(0, len(current) - 1)), delta)
+        return self._save(series)
+
+    def rebuild(self, symbol: str) -> PriceSeries:
+        """
+        Reconstruye la serie completa desde la base de datos
+        """
+        series = load_price_series(symbol)
+        if not len(series):
+            self.delete(symbol)
+        return self._save(series)
+
+    def delete(self, symbol: str) -> None:
+        shutil.rmtree(self._symbol_dir(symbol), ignore_errors=True)
+        with self._lock:
+            self._open.pop(symbol.upper(), None)
+
+    def _save(self, series: PriceSeries) -> PriceSeries:
+        if not len(series):
+            return series
+        self.write(series)
+        return self.load(series.symbol)
+
+    def get(self, symbol: str) -> PriceSeries:
+        """
+        Serie de ``symbol``; se construye desde la base de datos si no está
+        """
+        series = self.load(symbol)
+        return series if series is not None else self.refresh(symbol)
+
+
+_stores: Dict[str, PriceStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_price_store() -> Optional[PriceStore]:
+    """
+    Almacén configurado en ``settings.PRICE_STORE`` o ``None`` si está
+    desactivado
+    """
+    config = getattr(settings, "PRICE_STORE", {})
+    if not config.get("ENABLED", True) or not config.get("DIRECTORY"):
+        return None
+    directory = str(config["DIRECTORY"])
+    with _stores_lock:
+        if directory not in _stores:
+            _stores[directory] = PriceStore(directory)
+        return _stores[directory]
+
+
+def get_price_series(
+    symbol: str, start: Optional[date] = None, end: Optional[date] = None
+) -> PriceSeries:
+    """
+    Precios de ``symbol`` entre ``start`` y ``end`` (incluidos): cortes del
+    almacén si está activo, consulta a la base de datos si no
+    """
+    store = get_price_store()
+    if store is None:
+        return load_price_series(symbol, start, end)
+    try:
+        series = store.get(symbol)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Almacén de precios no disponible para {symbol}: {e}")
+        return load_price_series(symbol, start, end)
+    return series.between(start, end)
+
+
+def refresh_price_store(symbols: Iterable[str], rebuild: bool = False) -> None:
+    """
+    Actualiza el almacén tras una ingesta; con ``rebuild`` reconstruye las
+    series completas (tras reescribir barras antiguas). Los fallos sólo se
+    registran
+    """
+    store = get_price_store()
+    if store is None:
+        return
+    for symbol in symbols:
+        try:
+            if rebuild:
+                store.rebuild(symbol)
+            else:
+                store.refresh(symbol)
+        except Exception as e:
+            logger.warning(
+                f"No se pudo actualizar el almacén de precios de {symbol}: {e}"
+            )
+
+
+def invalidate_price_store(symbols: Iterable[str]) -> None:
+    """
+    Descarta las series de ``symbols`` para que se reconstruyan desde la base
+    de datos en la siguiente lectura; los fallos sólo se registran
+    """
+    store = get_price_store()
+    if store is None:
+        return
+    for symbol in symbols:
+        try:
+            store.delete(symbol)
+        except Exception as e:
+            logger.warning(
+                f"No se pudo invalidar el almacén de precios de {symbol}: {e}"
+            )
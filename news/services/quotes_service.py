@@ -1,13 +1,28 @@
-import yfinance as yf
 import requests
+from typing import Optional
+from .data_sources import get_data_source
+from .exceptions import UpstreamUnavailableError
+from .rate_limiter import PRIORITY_NORMAL
+from .upstream import call_upstream
 
 
-def fetch_quotes(ticker: str, max_results: int = 10):
+def fetch_quotes(
+    ticker: str,
+    max_results: int = 10,
+    priority: str = PRIORITY_NORMAL,
+    budget: Optional[float] = None,
+):
     try:
-        search_instance = yf.Search(ticker, max_results=max_results)
-        search_instance.timeout = 60
-        return search_instance.quotes
+        return call_upstream(
+            lambda timeout: get_data_source().search_quotes(
+                ticker, max_results, timeout
+            ),
+            priority=priority,
+            budget=budget,
+        )
+    except UpstreamUnavailableError:
+        raise
     except requests.exceptions.ReadTimeout as e:
         raise Exception("Timeout al obtener quotes") from e
     except Exception as e:
-        raise Exception("Error al obtener quotes") from e
\ No newline at end of file
+        raise Exception("Error al obtener quotes") from e
@@ -0,0 +1,288 @@
+"""
+Limitador de peticiones compartido para Yahoo Finance.
+
+Implementa un token bucket cuyo estado vive en la caché de Django (Redis en
+producción), de forma que todos los workers de Celery y procesos web consumen
+del mismo cubo. Para tests se dispone de un backend en memoria.
+
+Las peticiones se clasifican por prioridad: las de mayor prioridad pueden
+consumir todo el cubo y esperan un poco más, mientras que las de menor
+prioridad sólo consumen si queda reserva y se descartan antes.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .exceptions import UpstreamRateLimitError
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = "high"
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+
+DEFAULT_BUCKET_KEY = "yahoo"
+
+
+@dataclass(frozen=True)
+class PriorityPolicy:
+    """
+    Política de una prioridad: fracción de la capacidad que debe quedar libre
+    tras consumir y tiempo máximo que se espera en cola antes de descartar
+    """
+
+    reserve: float
+    max_wait: float
+
+
+DEFAULT_POLICIES: Dict[str, PriorityPolicy] = {
+    PRIORITY_HIGH: PriorityPolicy(reserve=0.0, max_wait=5.0),
+    PRIORITY_NORMAL: PriorityPolicy(reserve=0.25, max_wait=30.0),
+    PRIORITY_LOW: PriorityPolicy(reserve=0.5, max_wait=0.0),
+}
+
+
+def _refill(
+    tokens: float, updated_at: float, now: float, rate: float, capacity: float
+) -> float:
+    elapsed = max(0.0, now - updated_at)
+    return min(capacity, tokens + elapsed * rate)
+
+
+def _take(
+    state: Optional[Tuple[float, float]],
+    now: float,
+    cost: float,
+    reserve: float,
+    rate: float,
+    capacity: float,
+) -> Tuple[Tuple[float, float], float]:
+    """
+    Aplica una petición sobre el estado (tokens, timestamp) del cubo.
+
+    Devuelve el nuevo estado y los segundos a esperar (0 si se concede).
+    """
+    if state is None:
+        tokens = capacity
+    else:
+        tokens = _refill(state[0], state[1], now, rate, capacity)
+
+    needed = min(capacity, cost + reserve)
+    if tokens >= needed:
+        return (tokens - cost, now), 0.0
+    return (tokens, now), (needed - tokens) / rate
+
+
+class InMemoryTokenBucketBackend:
+    """
+    Backend local al proceso, pensado para tests y desarrollo
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def consume(
+        self, key: str, cost: float, reserve: float, rate: float, capacity: float
+    ) -> float:
+        with self._lock:
+            state, wait = _take(
+                self._buckets.get(key), self._clock(), cost, reserve, rate, capacity
+            )
+            self._buckets[key] = state
+        return wait
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheTokenBucketBackend:
+    """
+    Backend compartido entre procesos sobre la caché de Django.
+
+    El estado se protege con un cerrojo basado en ``cache.add``, que es
+    atómico en Redis y Memcached.
+    """
+
+    def __init__(
+        self,
+        cache_backend=None,
+        clock: Callable[[], float] = time.time,
+        lock_timeout: float = 1.0,
+    ):
+        self._cache = cache_backend or cache
+        self._clock = clock
+        self._lock_timeout = lock_timeout
+
+    def _acquire_lock(self, lock_key: str, owner: str) -> bool:
+        deadline = time.monotonic() + self._lock_timeout
+        while time.monotonic() < deadline:
+            if self._cache.add(lock_key, owner, timeout=5):
+                return True
+            time.sleep(0.005)
+        return False
+
+    def consume(
+        self, key: str, cost: float, reserve: float, rate: float, capacity: float
+    ) -> float:
+        state_key = f"ratelimit:{key}:state"
+        lock_key = f"ratelimit:{key}:lock"
+        owner = uuid.uuid4().hex
+
+        if not self._acquire_lock(lock_key, owner):
+            logger.warning("No se pudo bloquear el cubo %s, se reintentará", key)
+            return cost / rate
+
+        try:
+            stored = self._cache.get(state_key)
+            state, wait = _take(
+                tuple(stored) if stored else None,
+                self._clock(),
+                cost,
+                reserve,
+                rate,
+                capacity,
+            )
+            # El cubo se rellena por completo en capacity / rate segundos
+            self._cache.set(state_key, state, timeout=int(capacity / rate) + 60)
+        finally:
+            if self._cache.get(lock_key) == owner:
+                self._cache.delete(lock_key)
+        return wait
+
+
+class RateLimiter:
+    """
+    Token bucket con cola por prioridad sobre un backend intercambiable
+    """
+
+    def __init__(
+        self,
+        backend,
+        rate: float,
+        capacity: float,
+        key: str = DEFAULT_BUCKET_KEY,
+        policies: Optional[Dict[str, PriorityPolicy]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("La tasa y la capacidad deben ser positivas")
+        self.backend = backend
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.key = key
+        self.policies = policies or DEFAULT_POLICIES
+        self._sleep = sleep
+        self._clock = clock
+
+    def acquire(
+        self,
+        priority: str = PRIORITY_NORMAL,
+        cost: float = 1.0,
+        max_wait: Optional[float] = None,
+    ) -> float:
+        """
+        Consume ``cost`` tokens esperando en cola si es necesario.
+
+        Devuelve los segundos esperados. Lanza ``UpstreamRateLimitError`` si
+        la espera necesaria supera el máximo permitido para la prioridad o,
+        si se indica, ``max_wait``.
+        """
+        if priority not in self.policies:
+            raise ValueError(f"Prioridad desconocida: {priority}")
+
+        policy = self.policies[priority]
+        limit = policy.max_wait
+        if max_wait is not None:
+            limit = min(limit, max_wait)
+        reserve = policy.reserve * self.capacity
+        start = self._clock()
+
+        while True:
+            wait = self.backend.consume(
+                self.key, cost, reserve, self.rate, self.capacity
+            )
+            waited = self._clock() - start
+            if wait <= 0:
+                return waited
+            if waited + wait > limit:
+                logger.warning(
+                    "Petición %s descartada por límite de Yahoo (espera %.2fs)",
+                    priority,
+                    wait,
+                )
+                raise UpstreamRateLimitError(
+                    "Límite de peticiones a Yahoo Finance alcanzado",
+                    retry_after=wait,
+                )
+            self._sleep(wait)
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+# Cachés de Django cuyo contenido no se comparte entre procesos
+PER_PROCESS_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def _build_backend(name: str):
+    if name == "memory":
+        return InMemoryTokenBucketBackend()
+    if name == "cache":
+        if settings.CACHES.get("default", {}).get("BACKEND") in PER_PROCESS_CACHES:
+            logger.warning(
+                "El límite de Yahoo usa una caché local al proceso: cada "
+                "proceso tendrá su propio cubo (configura REDIS_CACHE_URL)"
+            )
+        return CacheTokenBucketBackend()
+    raise ValueError(f"Backend de rate limit desconocido: {name}")
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Devuelve el limitador global configurado en ``settings.YAHOO_RATE_LIMIT``
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            config = getattr(settings, "YAHOO_RATE_LIMIT", {})
+            _limiter = RateLimiter(
+                backend=_build_backend(config.get("BACKEND", "cache")),
+                rate=config.get("RATE", 2.0),
+                capacity=config.get("CAPACITY", 10),
+            )
+        return _limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """
+    Sustituye el limitador global (útil en tests). ``None`` lo reinicia.
+    """
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
+
+
+def acquire_upstream(
+    priority: str = PRIORITY_NORMAL,
+    cost: float = 1.0,
+    max_wait: Optional[float] = None,
+) -> float:
+    """
+    Atajo para reservar una petición a Yahoo con el limitador global
+    """
+    return get_rate_limiter().acquire(priority=priority, cost=cost, max_wait=max_wait)
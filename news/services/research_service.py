@@ -1,12 +1,22 @@
-import yfinance as yf
 import requests
+from typing import Optional
+from .data_sources import get_data_source
+from .exceptions import UpstreamUnavailableError
+from .rate_limiter import PRIORITY_NORMAL
+from .upstream import call_upstream
 
 
-def fetch_research(ticker: str):
+def fetch_research(
+    ticker: str, priority: str = PRIORITY_NORMAL, budget: Optional[float] = None
+):
     try:
-        search_instance = yf.Search(ticker, include_research=True)
-        search_instance.timeout = 60
-        return search_instance.research
+        return call_upstream(
+            lambda timeout: get_data_source().search_research(ticker, timeout),
+            priority=priority,
+            budget=budget,
+        )
+    except UpstreamUnavailableError:
+        raise
     except requests.exceptions.ReadTimeout as e:
         raise Exception("Timeout al obtener research") from e
     except Exception as e:
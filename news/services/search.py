@@ -0,0 +1,300 @@
+"""
+Búsqueda de texto completo con índice mantenido por la base de datos.
+
+- PostgreSQL: columna ``search_vector`` generada (``tsvector`` ponderado) con
+  índice GIN; la base de datos la mantiene al insertar o actualizar.
+- SQLite (desarrollo): tabla virtual FTS5 ``<tabla>_fts`` sincronizada con
+  triggers. Si una migración rehace la tabla en SQLite los triggers se
+  pierden: ``python manage.py rebuild_search_index`` los recrea.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, List, Sequence, Tuple
+
+from django.db import NotSupportedError, connection as default_connection
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Pesos de PostgreSQL por posición de columna (A es el mayor)
+_PG_WEIGHTS = "ABCD"
+# Pesos equivalentes para bm25 de FTS5
+_FTS_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    Filtro SQL adicional; ``t`` es el alias de la tabla del modelo
+    """
+
+    sql: str
+    params: Sequence[Any] = ()
+
+
+class FullTextIndex:
+    """
+    Índice de texto completo sobre columnas de un modelo.
+
+    ``columns`` va de mayor a menor peso en el ranking.
+    """
+
+    def __init__(self, model, columns: Sequence[str], language: str = "english"):
+        self.model = model
+        self.columns = list(columns)
+        self.language = language
+
+    # Nombres ---------------------------------------------------------------
+
+    @property
+    def table(self) -> str:
+        return self.model._meta.db_table
+
+    @property
+    def key(self) -> str:
+        return self.model._meta.pk.column
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table}_fts"
+
+    def _column(self, name: str) -> str:
+        return self.model._meta.get_field(name).column
+
+    # Instalación -------------------------------------------------------------
+
+    def install(self, connection=None) -> None:
+        """
+        Crea el índice si no existe y lo rellena con las filas actuales
+        """
+        connection = connection or default_connection
+        if connection.vendor == "postgresql":
+            self._install_postgresql(connection)
+        elif connection.vendor == "sqlite":
+            self.rebuild(connection)
+        else:
+            logger.warning("Sin índice de texto completo para %s", connection.vendor)
+
+    def uninstall(self, connection=None) -> None:
+        connection = connection or default_connection
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    f"ALTER TABLE {qn(self.table)} DROP COLUMN IF EXISTS search_vector"
+                )
+            elif connection.vendor == "sqlite":
+                for op in ("ai", "ad", "au"):
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {qn(f'{self.fts_table}_{op}')}")
+                cursor.execute(f"DROP TABLE IF EXISTS {qn(self.fts_table)}")
+
+    def rebuild(self, connection=None) -> None:
+        """
+        Vuelve a indexar todas las filas (sólo necesario en SQLite)
+        """
+        connection = connection or default_connection
+        if connection.vendor != "sqlite":
+            return
+        self._install_sqlite(connection)
+        qn = connection.ops.quote_name
+        columns = ", ".join(qn(self._column(c)) for c in self.columns)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {qn(self.fts_table)}")
+            cursor.execute(
+                f"INSERT INTO {qn(self.fts_table)} (key, {columns}) "
+                f"SELECT {qn(self.key)}, {columns} FROM {qn(self.table)}"
+            )
+
+    def _install_postgresql(self, connection) -> None:
+        qn = connection.ops.quote_name
+        vector = " || ".join(
+            f"setweight(to_tsvector('{self.language}', "
+            f"coalesce({qn(self._column(c))}, '')), '{_PG_WEIGHTS[i]}')"
+            for i, c in enumerate(self.columns)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {qn(self.table)} ADD COLUMN IF NOT EXISTS search_vector "
+                f"tsvector GENERATED ALWAYS AS ({vector}) STORED"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {qn(f'{self.table}_search_gin')} "
+                f"ON {qn(self.table)} USING GIN (search_vector)"
+            )
+
+    def _install_sqlite(self, connection) -> None:
+        qn = connection.ops.quote_name
+        fts = qn(self.fts_table)
+        table = qn(self.table)
+        key = qn(self.key)
+        columns = [qn(self._column(c)) for c in self.columns]
+        new_values = ", ".join(f"new.{c}" for c in columns)
+        column_list = ", ".join(columns)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"key UNINDEXED, {column_list}, tokenize='porter unicode61')"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {qn(f'{self.fts_table}_ai')} "
+                f"AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts} (key, {column_list}) VALUES (new.{key}, {new_values}); "
+                f"END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {qn(f'{self.fts_table}_ad')} "
+                f"AFTER DELETE ON {table} BEGIN "
+                f"DELETE FROM {fts} WHERE key = old.{key}; "
+                f"END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {qn(f'{self.fts_table}_au')} "
+                f"AFTER UPDATE ON {table} BEGIN "
+                f"DELETE FROM {fts} WHERE key = old.{key}; "
+                f"INSERT INTO {fts} (key, {column_list}) VALUES (new.{key}, {new_values}); "
+                f"END"
+            )
+
+    # Búsqueda ----------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        conditions: Sequence[Condition] = (),
+        order_column: str = None,
+        limit: int = 20,
+        offset: int = 0,
+        connection=None,
+    ) -> List[Tuple[Any, float]]:
+        """
+        Devuelve ``(pk, rank)`` de las filas que casan con ``query``, de mayor
+        a menor relevancia; a igual relevancia, por ``order_column`` descendente
+        """
+        connection = connection or default_connection
+        terms = _TOKEN_RE.findall(query or "")
+        if not terms:
+            return []
+
+        if connection.vendor == "postgresql":
+            sql, params = self._postgresql_sql(connection, query, conditions, order_column)
+        elif connection.vendor == "sqlite":
+            sql, params = self._sqlite_sql(connection, terms, conditions, order_column)
+        else:
+            raise NotSupportedError(
+                f"Búsqueda de texto completo no disponible en {connection.vendor}"
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"{sql} LIMIT %s OFFSET %s", [*params, limit, offset])
+            rows = cursor.fetchall()
+        pk_field = self.model._meta.pk
+        return [(pk_field.to_python(pk), rank) for pk, rank in rows]
+
+    def _where(self, conditions) -> Tuple[str, List[Any]]:
+        sql = "".join(f" AND ({c.sql})" for c in conditions)
+        params = [p for c in conditions for p in c.params]
+        return sql, params
+
+    def _order(self, connection, order_column):
+        if not order_column:
+            return ""
+        return f", t.{connection.ops.quote_name(self._column(order_column))} DESC"
+
+    def _postgresql_sql(self, connection, query, conditions, order_column):
+        qn = connection.ops.quote_name
+        where, params = self._where(conditions)
+        sql = (
+            f"SELECT t.{qn(self.key)}, ts_rank_cd(t.search_vector, q) AS rank "
+            f"FROM {qn(self.table)} t, websearch_to_tsquery('{self.language}', %s) q "
+            f"WHERE t.search_vector @@ q{where} "
+            f"ORDER BY rank DESC{self._order(connection, order_column)}"
+        )
+        return sql, [query, *params]
+
+    def _sqlite_sql(self, connection, terms, conditions, order_column):
+        qn = connection.ops.quote_name
+        fts = qn(self.fts_table)
+        where, params = self._where(conditions)
+        # Cada término entre comillas: la sintaxis de FTS5 no se interpreta y
+        # todos los términos deben aparecer
+        match = " ".join('"{}"'.format(term.replace('"', "")) for term in terms)
+        weights = ", ".join(str(w) for w in _FTS_WEIGHTS[: len(self.columns)])
+        # bm25 es menor cuanto más relevante: se invierte el signo
+        sql = (
+            f"SELECT t.{qn(self.key)}, -bm25({fts}, 0.0, {weights}) AS rank "
+            f"FROM {fts} JOIN {qn(self.table)} t ON t.{qn(self.key)} = {fts}.key "
+            f"WHERE {fts} MATCH %s{where} "
+            f"ORDER BY rank DESC{self._order(connection, order_column)}"
+        )
+        return sql, [match, *params]
+
+
+def fetch_ranked(model, ranked: List[Tuple[Any, float]], queryset=None) -> List[Any]:
+    """
+    Carga las instancias de ``ranked`` en el mismo orden y les añade ``rank``
+    """
+    queryset = queryset if queryset is not None else model.objects.all()
+    objects = queryset.in_bulk([pk for pk, _ in ranked])
+    result = []
+    for pk, rank in ranked:
+        obj = objects.get(pk)
+        if obj is not None:
+            obj.rank = rank
+            result.append(obj)
+    return result
+
+
+def news_index() -> FullTextIndex:
+    from ..models import New
+
+    return FullTextIndex(New, ["title", "publisher"])
+
+
+def search_news(
+    query: str,
+    symbol: str = None,
+    since=None,
+    until=None,
+    include_duplicates: bool = False,
+    limit: int = 20,
+    offset: int = 0,
+    connection=None,
+) -> List[Tuple[Any, float]]:
+    """
+    Busca noticias por título (y medio) con filtros de símbolo y fecha
+    """
+    from ..models import NewsTicker
+
+    connection = connection or default_connection
+    ops = connection.ops
+    conditions = []
+    if not include_duplicates:
+        conditions.append(Condition("t.canonical_id IS NULL"))
+    if since:
+        conditions.append(
+            Condition("t.published_at >= %s", [ops.adapt_datetimefield_value(since)])
+        )
+    if until:
+        conditions.append(
+            Condition("t.published_at < %s", [ops.adapt_datetimefield_value(until)])
+        )
+    if symbol:
+        tickers = ops.quote_name(NewsTicker._meta.db_table)
+        conditions.append(
+            Condition(
+                f"EXISTS (SELECT 1 FROM {tickers} nt "
+                f"WHERE nt.news_id = t.uuid AND nt.symbol = %s)",
+                [symbol.upper()],
+            )
+        )
+    return news_index().search(
+        query,
+        conditions,
+        order_column="published_at",
+        limit=limit,
+        offset=offset,
+        connection=connection,
+    )
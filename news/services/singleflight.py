@@ -0,0 +1,159 @@
+"""
+Agrupación de peticiones concurrentes idénticas (singleflight).
+
+Cuando varios llamantes piden lo mismo a la vez, sólo uno (el líder) ejecuta
+la operación y el resto espera y comparte su resultado. Dentro del proceso se
+coordinan con un ``threading.Event``; entre procesos con un cerrojo en la
+caché de Django. Si la caché falla se sigue agrupando dentro del proceso.
+
+El resultado del líder se conserva ``window`` segundos para que las
+peticiones que lleguen justo después también lo reutilicen.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coordina llamadas idénticas por clave dentro y entre procesos
+    """
+
+    def __init__(
+        self,
+        cache_backend=None,
+        window: float = 10.0,
+        lock_timeout: float = 120.0,
+        wait_timeout: float = 60.0,
+        poll_interval: float = 0.1,
+        prefix: str = "singleflight",
+    ):
+        self._cache = cache_backend or cache
+        self.window = window
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Ejecuta ``fn`` una sola vez por ``key`` entre los llamantes concurrentes.
+
+        Devuelve ``(resultado, compartido)``; ``compartido`` es ``True`` si el
+        resultado lo obtuvo otro llamante.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.event.wait(self.wait_timeout):
+                logger.warning("Espera agotada para %s, se ejecuta de nuevo", key)
+                return fn(), False
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result, shared = self._do_distributed(key, fn)
+            return call.result, shared
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def _cache_op(self, method: str, *args, **kwargs) -> Any:
+        try:
+            return getattr(self._cache, method)(*args, **kwargs)
+        except Exception as e:
+            logger.warning("Caché no disponible para singleflight (%s): %s", method, e)
+            return _MISSING
+
+    def _do_distributed(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        result_key = f"{self.prefix}:{key}:result"
+        lock_key = f"{self.prefix}:{key}:lock"
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+
+        while True:
+            cached = self._cache_op("get", result_key)
+            if cached is _MISSING:
+                return fn(), False
+            if cached is not None:
+                return cached, True
+
+            acquired = self._cache_op("add", lock_key, owner, timeout=self.lock_timeout)
+            if acquired is _MISSING:
+                return fn(), False
+            if acquired:
+                try:
+                    result = fn()
+                    if self.window > 0:
+                        self._cache_op("set", result_key, result, timeout=self.window)
+                    return result, False
+                finally:
+                    if self._cache_op("get", lock_key) == owner:
+                        self._cache_op("delete", lock_key)
+
+            # Otro proceso es el líder: esperar su resultado
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                cached = self._cache_op("get", result_key)
+                if cached is not None and cached is not _MISSING:
+                    return cached, True
+                if self._cache_op("get", lock_key) in (None, _MISSING):
+                    # El líder terminó sin resultado (falló): competir de nuevo
+                    break
+            else:
+                logger.warning("Espera agotada para %s, se ejecuta de nuevo", key)
+                return fn(), False
+
+
+_singleflight: Optional[SingleFlight] = None
+_singleflight_lock = threading.Lock()
+
+
+def get_singleflight() -> SingleFlight:
+    """
+    Devuelve la instancia global configurada con ``settings.NEWS_INGEST_COALESCE_WINDOW``
+    """
+    global _singleflight
+    with _singleflight_lock:
+        if _singleflight is None:
+            _singleflight = SingleFlight(
+                window=getattr(settings, "NEWS_INGEST_COALESCE_WINDOW", 10.0)
+            )
+        return _singleflight
+
+
+def set_singleflight(instance: Optional[SingleFlight]) -> None:
+    """
+    Sustituye la instancia global (tests y benchmarks). ``None`` la reinicia.
+    """
+    global _singleflight
+    with _singleflight_lock:
+        _singleflight = instance
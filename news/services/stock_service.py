@@ -0,0 +1,60 @@
+import requests
+from typing import Any, Dict, Optional
+from .data_sources import get_data_source
+from .exceptions import UpstreamUnavailableError
+from .rate_limiter import PRIORITY_NORMAL
+from .upstream import call_upstream
+
+
+def fetch_stock_info(
+    ticker: str, priority: str = PRIORITY_NORMAL, budget: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Obtener la información de un ticker desde yfinance
+    """
+    try:
+        return call_upstream(
+            lambda timeout: get_data_source().ticker_info(ticker, timeout),
+            priority=priority,
+            budget=budget,
+        )
+    except UpstreamUnavailableError:
+        raise
+    except requests.exceptions.ReadTimeout as e:
+        raise Exception("Timeout al obtener información del stock") from e
+    except Exception as e:
+        raise Exception("Error al obtener información del stock") from e
+
+
+def fetch_price_history(
+    ticker: str,
+    period: str = "1mo",
+    interval: str = "1d",
+    priority: str = PRIORITY_NORMAL,
+    budget: Optional[float] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+):
+    """
+    Obtener el histórico de precios (DataFrame) de un ticker desde yfinance.
+
+    Con ``start`` (y opcionalmente ``end``, excluido) se pide ese rango en
+    lugar de ``period``.
+    """
+    params = {"interval": interval}
+    if start:
+        params.update(start=start, end=end)
+    else:
+        params["period"] = period
+    try:
+        return call_upstream(
+            lambda timeout: get_data_source().history(ticker, timeout, **params),
+            priority=priority,
+            budget=budget,
+        )
+    except UpstreamUnavailableError:
+        raise
+    except requests.exceptions.ReadTimeout as e:
+        raise Exception("Timeout al obtener precios históricos") from e
+    except Exception as e:
+        raise Exception("Error al obtener precios históricos") from e
@@ -0,0 +1,48 @@
+"""
+Punto único de llamada a Yahoo Finance.
+
+Combina el circuit breaker, el limitador de peticiones y el presupuesto de
+latencia para que todas las funciones de ``news.services`` se comporten
+igual ante un Yahoo degradado.
+"""
+
+import time
+from typing import Any, Callable, Optional
+
+from .circuit_breaker import get_circuit_breaker
+from .exceptions import LatencyBudgetExceeded
+from .rate_limiter import PRIORITY_NORMAL, acquire_upstream
+
+# Timeout HTTP por defecto cuando el llamante no fija presupuesto
+UPSTREAM_TIMEOUT = 60
+
+
+def call_upstream(
+    fetch: Callable[[float], Any],
+    priority: str = PRIORITY_NORMAL,
+    budget: Optional[float] = None,
+) -> Any:
+    """
+    Ejecuta ``fetch(timeout)`` contra Yahoo con todas las protecciones.
+
+    ``budget`` es el tiempo total (segundos) que el llamante está dispuesto a
+    esperar, incluida la cola del limitador. ``fetch`` recibe el timeout HTTP
+    que debe usar para no sobrepasarlo. Con ``budget`` la llamada corre en el
+    pool acotado y falla rápido (``UpstreamSaturatedError``) si está lleno.
+    """
+    breaker = get_circuit_breaker()
+    # No hacer cola en el limitador si de todas formas vamos a fallar
+    breaker.raise_if_open()
+
+    start = time.monotonic()
+    acquire_upstream(priority, max_wait=budget)
+
+    if budget is None:
+        return breaker.call(fetch, UPSTREAM_TIMEOUT)
+
+    remaining = budget - (time.monotonic() - start)
+    if remaining <= 0:
+        raise LatencyBudgetExceeded(
+            "Presupuesto de latencia agotado esperando turno para Yahoo Finance"
+        )
+    return breaker.call(fetch, remaining, budget=remaining)
@@ -0,0 +1,64 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import HistoricalPrice, New, NewsAnalysis, NewsChange
+from .services.change_feed import record_changes
+from .services.event_bus import publish_event
+from .services.price_store import invalidate_price_store
+
+
+def _symbols(news):
+    return sorted({str(t).strip().upper() for t in news.related_tickers or [] if str(t).strip()})
+
+
+@receiver(post_save, sender=New)
+def record_news_saved(sender, instance, created, **kwargs):
+    record_changes([instance.uuid])
+    # Sólo las noticias nuevas y canónicas se emiten en tiempo real
+    if created and not instance.canonical_id:
+        event = {
+            "type": "news",
+            "uuid": str(instance.uuid),
+            "title": instance.title,
+            "publisher": instance.publisher,
+            "link": instance.link,
+            "provider_publish_time": instance.provider_publish_time,
+            "symbols": _symbols(instance),
+        }
+        transaction.on_commit(lambda: publish_event(event))
+
+
+@receiver(post_delete, sender=New)
+def record_news_deleted(sender, instance, **kwargs):
+    record_changes([instance.uuid], NewsChange.OP_DELETE)
+
+
+@receiver(post_save, sender=NewsAnalysis)
+def record_analysis_saved(sender, instance, **kwargs):
+    # El análisis viaja dentro de la noticia: cuenta como cambio de la noticia
+    record_changes([instance.news_id])
+    event = {
+        "type": "analysis",
+        "uuid": str(instance.news_id),
+        "sentiment_label": instance.sentiment_label,
+        "sentiment_score": instance.sentiment_score,
+        "combined_score": instance.combined_score,
+        "relevance": instance.relevance,
+        "symbols": _symbols(instance.news),
+    }
+    transaction.on_commit(lambda: publish_event(event))
+
+
+@receiver(post_delete, sender=NewsAnalysis)
+def record_analysis_deleted(sender, instance, **kwargs):
+    record_changes([instance.news_id])
+
+
+@receiver(post_save, sender=HistoricalPrice)
+@receiver(post_delete, sender=HistoricalPrice)
+def invalidate_price_series(sender, instance, **kwargs):
+    # Las ingestas escriben con bulk_create (sin señales) y actualizan el
+    # almacén ellas mismas; esto cubre las ediciones fila a fila del admin
+    symbol = instance.symbol
+    transaction.on_commit(lambda: invalidate_price_store([symbol]))
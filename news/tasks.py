@@ -0,0 +1,103 @@
+import logging
+from celery import shared_task
+from django.conf import settings
+from .models import WatchedTicker
+from .services import (
+    fetch_and_save_news,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    UpstreamUnavailableError,
+)
+from .services.change_feed import prune_changes
+from .services.polling_scheduler import claim_due_tickers, record_poll
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def ingest_news_for_symbol(self, symbol, news_count=10):
+    """
+    Ingesta asíncrona de noticias de un símbolo:
+    - obtiene las noticias de Yahoo y las guarda/actualiza.
+    - devuelve los contadores y los uuid de las noticias para el endpoint
+      de estado del job.
+    - si Yahoo no está disponible reintenta cuando el limitador o el
+      circuito lo permitan.
+    """
+    logger.info("⏳ Ingesta de noticias para %s (job %s)", symbol, self.request.id)
+    try:
+        result = fetch_and_save_news(
+            symbol,
+            news_count,
+            priority=PRIORITY_HIGH,
+            budget=settings.YAHOO_INGEST_LATENCY_BUDGET,
+        )
+    except UpstreamUnavailableError as e:
+        logger.warning("Yahoo no disponible para %s, se reintenta: %s", symbol, e)
+        raise self.retry(exc=e, countdown=max(1, int(e.retry_after)))
+
+    return {
+        "symbol": symbol,
+        "total_fetched": result["total_fetched"],
+        "total_saved": result["total_saved"],
+        "total_updated": result["total_updated"],
+        "news_ids": [str(obj.uuid) for obj in result["news_objects"]],
+    }
+
+
+@shared_task
+def schedule_due_polls():
+    """
+    Tick de Celery beat: encola el sondeo de los tickers vigilados cuyo
+    intervalo adaptativo ha vencido.
+    """
+    claimed = claim_due_tickers()
+    for watch in claimed:
+        poll_watched_ticker.delay(watch.pk)
+    if claimed:
+        logger.info("Sondeos encolados: %s", ", ".join(w.symbol for w in claimed))
+    return len(claimed)
+
+
+@shared_task
+def poll_watched_ticker(watch_id):
+    """
+    Sondeo programado de un ticker de la watchlist. Usa prioridad baja para
+    ceder el cupo de Yahoo a las peticiones de usuarios.
+    """
+    try:
+        watch = WatchedTicker.objects.get(pk=watch_id, active=True)
+    except WatchedTicker.DoesNotExist:
+        return None
+
+    try:
+        result = fetch_and_save_news(
+            watch.symbol, watch.news_count, priority=PRIORITY_LOW
+        )
+    except UpstreamUnavailableError as e:
+        logger.info("Sondeo de %s aplazado: %s", watch.symbol, e)
+        record_poll(watch, None)
+        return None
+    except Exception as e:
+        logger.error("Error en el sondeo de %s: %s", watch.symbol, e)
+        record_poll(watch, None)
+        return None
+
+    record_poll(watch, result["total_saved"], result["news_objects"])
+    return {
+        "symbol": watch.symbol,
+        "total_saved": result["total_saved"],
+        "poll_interval": watch.poll_interval,
+    }
+
+
+@shared_task
+def prune_news_changes():
+    """
+    Tarea periódica: poda el feed de cambios de noticias más antiguo que
+    NEWS_CHANGES_RETENTION_DAYS.
+    """
+    deleted = prune_changes()
+    if deleted:
+        logger.info("Cambios de noticias podados: %s", deleted)
+    return deleted
@@ -1,3 +1,2380 @@
-from django.test import TestCase
+"""
+Tests para el módulo de noticias.
 
-# Create your tests here.
+Contiene tests unitarios de los servicios de obtención de datos de
+Yahoo Finance y de las vistas que los exponen.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock, skipUnless
+
+import numpy as np
+import pandas as pd
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, models
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import StreamingHttpResponse
+
+from .services.circuit_breaker import (
+    CircuitBreaker,
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    UpstreamPool,
+)
+from .services.exceptions import (
+    CircuitOpenError,
+    LatencyBudgetExceeded,
+    UpstreamSaturatedError,
+)
+from .models import New, NewsAnalysis, NewsChange, NewsTicker, WatchedTicker
+from .services import fetch_and_save_news, process_news_item, set_data_source
+from .services.change_feed import prune_changes
+from .services.data_sources import RecordingDataSource, ReplayDataSource
+from .services.event_bus import InMemoryEventBus, set_event_bus
+from .services.price_series import load_price_series
+from .services.dedup import DuplicateDetector, LshIndex, hamming_distance, simhash
+from .services.polling_scheduler import (
+    claim_due_tickers,
+    compute_poll_interval,
+    is_market_open,
+    record_poll,
+)
+from .services.singleflight import SingleFlight
+from .tasks import poll_watched_ticker
+from .views.stream_views import EventStream
+from .services.rate_limiter import (
+    CacheTokenBucketBackend,
+    InMemoryTokenBucketBackend,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    RateLimiter,
+    UpstreamRateLimitError,
+    _build_backend,
+)
+
+
+class FakeClock:
+    """Reloj manual para controlar el tiempo en los tests."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimiterTests(SimpleTestCase):
+    """Tests para el token bucket de peticiones a Yahoo."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(
+            backend=InMemoryTokenBucketBackend(clock=self.clock),
+            rate=1.0,
+            capacity=4,
+            sleep=self.clock.sleep,
+            clock=self.clock,
+        )
+
+    def test_acquire_within_capacity_does_not_wait(self):
+        """Test que las peticiones dentro de la capacidad no esperan."""
+        for _ in range(4):
+            self.assertEqual(self.limiter.acquire(PRIORITY_HIGH), 0)
+
+    def test_acquire_queues_when_bucket_is_empty(self):
+        """Test que una petición normal espera a que se rellene el cubo."""
+        for _ in range(4):
+            self.limiter.acquire(PRIORITY_HIGH)
+
+        waited = self.limiter.acquire(PRIORITY_NORMAL)
+
+        self.assertAlmostEqual(waited, 2.0)
+
+    def test_low_priority_is_shed_when_reserve_is_used(self):
+        """Test que la prioridad baja se descarta si no queda reserva."""
+        self.limiter.acquire(PRIORITY_HIGH)
+        self.limiter.acquire(PRIORITY_HIGH)
+
+        with self.assertRaises(UpstreamRateLimitError) as ctx:
+            self.limiter.acquire(PRIORITY_LOW)
+
+        self.assertGreater(ctx.exception.retry_after, 0)
+
+    def test_high_priority_can_use_reserve(self):
+        """Test que la prioridad alta consume la reserva de las demás."""
+        self.limiter.acquire(PRIORITY_HIGH)
+        self.limiter.acquire(PRIORITY_HIGH)
+        self.limiter.acquire(PRIORITY_HIGH)
+
+        self.assertEqual(self.limiter.acquire(PRIORITY_HIGH), 0)
+
+    def test_unknown_priority_raises(self):
+        """Test que una prioridad desconocida es un error de programación."""
+        with self.assertRaises(ValueError):
+            self.limiter.acquire("urgent")
+
+    def test_cache_backend_shares_state(self):
+        """Test que dos backends sobre la misma caché comparten el cubo."""
+        shared = LocMemCache("ratelimit-tests", {})
+        first = CacheTokenBucketBackend(cache_backend=shared, clock=self.clock)
+        second = CacheTokenBucketBackend(cache_backend=shared, clock=self.clock)
+
+        self.assertEqual(first.consume("yahoo", 1, 0, 1.0, 2), 0)
+        self.assertEqual(second.consume("yahoo", 1, 0, 1.0, 2), 0)
+        self.assertGreater(first.consume("yahoo", 1, 0, 1.0, 2), 0)
+
+    @override_settings(CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    })
+    def test_cache_backend_warns_on_per_process_cache(self):
+        """Test que se avisa si el cubo "cache" no se comparte entre procesos."""
+        with self.assertLogs("news.services.rate_limiter", "WARNING"):
+            _build_backend("cache")
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    """Tests para el circuit breaker de llamadas a Yahoo."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "tests",
+            window=60,
+            min_calls=4,
+            error_rate=0.5,
+            slow_call_seconds=5,
+            slow_call_rate=0.5,
+            open_seconds=30,
+            clock=self.clock,
+        )
+
+    def _fail(self):
+        raise RuntimeError("upstream caído")
+
+    def _trip(self):
+        for _ in range(4):
+            with self.assertRaises(RuntimeError):
+                self.breaker.call(self._fail)
+
+    def test_opens_on_error_rate(self):
+        """Test que el circuito se abre al superar la tasa de errores."""
+        self._trip()
+
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.call(lambda: "ok")
+        self.assertAlmostEqual(ctx.exception.retry_after, 30)
+
+    def test_opens_on_slow_calls(self):
+        """Test que el circuito se abre si las llamadas son lentas."""
+        for _ in range(4):
+            self.breaker.record(True, latency=6)
+
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+
+    def test_errors_outside_window_are_forgotten(self):
+        """Test que los errores antiguos salen de la ventana deslizante."""
+        for _ in range(3):
+            self.breaker.record(False, latency=0.1)
+        self.clock.now += 61
+        self.breaker.record(False, latency=0.1)
+
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+
+    def test_half_open_probe_closes_on_success(self):
+        """Test que una prueba correcta en semiabierto cierra el circuito."""
+        self._trip()
+        self.clock.now += 30
+
+        self.assertEqual(self.breaker.state, STATE_HALF_OPEN)
+        self.assertEqual(self.breaker.call(lambda: "ok"), "ok")
+        self.assertEqual(self.breaker.state, STATE_CLOSED)
+
+    def test_half_open_allows_single_probe(self):
+        """Test que en semiabierto sólo pasa una llamada de prueba."""
+        self._trip()
+        self.clock.now += 30
+
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_half_open_probe_failure_reopens(self):
+        """Test que una prueba fallida vuelve a abrir el circuito."""
+        self._trip()
+        self.clock.now += 30
+
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(self._fail)
+
+        self.assertEqual(self.breaker.state, STATE_OPEN)
+
+    def test_latency_budget_exceeded(self):
+        """Test que la llamada se abandona al agotar el presupuesto."""
+        breaker = CircuitBreaker("budget", min_calls=1)
+        release = threading.Event()
+
+        with self.assertRaises(LatencyBudgetExceeded):
+            breaker.call(release.wait, 5, budget=0.01)
+        release.set()
+
+        self.assertEqual(breaker.state, STATE_OPEN)
+
+    def test_half_open_rejection_has_retry_hint(self):
+        """Test que en semiabierto se sugiere esperar a que acabe la prueba."""
+        self._trip()
+        self.clock.now += 30
+        self.breaker.before_call()
+        self.clock.now += 2
+
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.before_call()
+
+        self.assertAlmostEqual(ctx.exception.retry_after, 3)
+
+    def test_saturated_pool_fails_fast(self):
+        """Test que las llamadas abandonadas acotan el pool y las nuevas fallan rápido."""
+        pool = UpstreamPool(max_workers=2, max_abandoned=1)
+        breaker = CircuitBreaker("pool", min_calls=10, pool=pool)
+        release = threading.Event()
+
+        with self.assertRaises(LatencyBudgetExceeded):
+            breaker.call(release.wait, 5, budget=0.01)
+        with self.assertRaises(UpstreamSaturatedError) as ctx:
+            breaker.call(lambda: "ok", budget=1)
+
+        self.assertGreaterEqual(ctx.exception.retry_after, 1)
+        self.assertEqual(pool.abandoned, 1)
+        release.set()
+        deadline = time.monotonic() + 5
+        while pool.in_flight and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(breaker.call(lambda: "ok", budget=1), "ok")
+        self.assertEqual(pool.abandoned, 0)
+
+
+class FetchBySymbolJobTests(TestCase):
+    """Tests para la ingesta asíncrona de noticias por símbolo."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="trader", password="pass1234")
+        self.client.force_authenticate(self.user)
+
+    @mock.patch("news.views.news_views.ingest_news_for_symbol.delay")
+    def test_fetch_by_symbol_enqueues_job(self, delay):
+        """Test que el endpoint encola la ingesta y responde 202."""
+        delay.return_value = mock.Mock(id="job-123")
+
+        response = self.client.post(
+            "/api/news/fetch-by-symbol/",
+            {"symbol": " mlgo ", "news_count": 5},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["job_id"], "job-123")
+        self.assertTrue(response.data["status_url"].endswith("/news/jobs/job-123/"))
+        delay.assert_called_once_with("MLGO", 5)
+        self.assertTrue(self.user.ingestion_jobs.filter(job_id="job-123").exists())
+
+    def test_fetch_by_symbol_validates_news_count(self):
+        """Test que no se encola nada si los parámetros no son válidos."""
+        response = self.client.post(
+            "/api/news/fetch-by-symbol/",
+            {"symbol": "MLGO", "news_count": 100},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _job(self, user=None, job_id="job-123"):
+        from .models import IngestionJob
+
+        return IngestionJob.objects.create(
+            job_id=job_id, user=user or self.user, symbol="MLGO"
+        )
+
+    @mock.patch("news.views.news_views.AsyncResult")
+    def test_job_status_reports_result(self, async_result):
+        """Test que el estado del job incluye contadores e ids."""
+        self._job()
+        job = async_result.return_value
+        job.ready.return_value = True
+        job.successful.return_value = True
+        job.status = "SUCCESS"
+        job.result = {
+            "symbol": "MLGO",
+            "total_fetched": 2,
+            "total_saved": 1,
+            "total_updated": 1,
+            "news_ids": ["a", "b"],
+        }
+
+        response = self.client.get("/api/news/jobs/job-123/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["ready"])
+        self.assertNotIn("Retry-After", response)
+        self.assertEqual(response.data["result"]["news_ids"], ["a", "b"])
+
+    @mock.patch("news.views.news_views.AsyncResult")
+    def test_pending_job_sends_retry_after(self, async_result):
+        """Test que un job en curso responde en seguida con Retry-After."""
+        self._job()
+        job = async_result.return_value
+        job.ready.return_value = False
+        job.successful.return_value = False
+        job.failed.return_value = False
+        job.status = "PENDING"
+
+        response = self.client.get("/api/news/jobs/job-123/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["ready"])
+        self.assertIsNone(response.data["result"])
+        self.assertEqual(response["Retry-After"], "2")
+        job.wait.assert_not_called()
+
+    @mock.patch("news.views.news_views.AsyncResult")
+    def test_failed_job_hides_exception(self, async_result):
+        """Test que el error de un job fallido es genérico."""
+        self._job()
+        job = async_result.return_value
+        job.ready.return_value = True
+        job.successful.return_value = False
+        job.failed.return_value = True
+        job.status = "FAILURE"
+        job.result = RuntimeError("password=secreto en /srv/app")
+
+        with self.assertLogs("news.views.news_views", "ERROR"):
+            response = self.client.get("/api/news/jobs/job-123/")
+
+        self.assertEqual(response.data["error"], "La ingesta de noticias ha fallado")
+        self.assertNotIn("secreto", json.dumps(response.data))
+
+    @mock.patch("news.views.news_views.AsyncResult")
+    def test_foreign_or_unknown_job_is_not_found(self, async_result):
+        """Test que sólo quien encoló el job puede consultarlo."""
+        other = User.objects.create_user(username="otro", password="pass1234")
+        self._job(user=other)
+
+        for job_id in ("job-123", "job-desconocido"):
+            response = self.client.get(f"/api/news/jobs/{job_id}/")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        async_result.assert_not_called()
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Tests para la agrupación de ingestas concurrentes."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.cache = LocMemCache("singleflight-tests", {})
+        self.cache.clear()
+
+    def _run_concurrently(self, flights, key, fn):
+        results = []
+        threads = [
+            threading.Thread(target=lambda f=f: results.append(f.do(key, fn)))
+            for f in flights
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test que las llamadas concurrentes del proceso ejecutan una vez."""
+        flight = SingleFlight(cache_backend=self.cache)
+        calls = []
+        release = threading.Event()
+
+        def slow_fetch():
+            calls.append(1)
+            release.wait(1)
+            return "noticias"
+
+        threading.Timer(0.1, release.set).start()
+        results = self._run_concurrently([flight] * 5, "news:MLGO:10", slow_fetch)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r for r, _ in results], ["noticias"] * 5)
+        self.assertEqual(sum(1 for _, shared in results if shared), 4)
+
+    def test_calls_across_processes_share_cached_result(self):
+        """Test que dos instancias sobre la misma caché comparten resultado."""
+        first = SingleFlight(cache_backend=self.cache, poll_interval=0.01)
+        second = SingleFlight(cache_backend=self.cache, poll_interval=0.01)
+        calls = []
+        release = threading.Event()
+
+        def slow_fetch():
+            calls.append(1)
+            release.wait(1)
+            return {"total_fetched": 3}
+
+        threading.Timer(0.1, release.set).start()
+        results = self._run_concurrently([first, second], "news:MLGO:10", slow_fetch)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r for r, _ in results], [{"total_fetched": 3}] * 2)
+
+    def test_result_is_reused_within_window(self):
+        """Test que el resultado se reutiliza durante la ventana."""
+        flight = SingleFlight(cache_backend=self.cache, window=10)
+
+        flight.do("news:MLGO:10", lambda: "primero")
+        result, shared = flight.do("news:MLGO:10", lambda: "segundo")
+
+        self.assertEqual(result, "primero")
+        self.assertTrue(shared)
+
+    def test_errors_are_not_cached(self):
+        """Test que un fallo del líder no se guarda como resultado."""
+        flight = SingleFlight(cache_backend=self.cache)
+
+        def failing():
+            raise RuntimeError("Yahoo caído")
+
+        with self.assertRaises(RuntimeError):
+            flight.do("news:MLGO:10", failing)
+        result, shared = flight.do("news:MLGO:10", lambda: "ok")
+
+        self.assertEqual(result, "ok")
+        self.assertFalse(shared)
+
+    def test_falls_back_when_cache_is_down(self):
+        """Test que sin caché se ejecuta igualmente la operación."""
+        broken = mock.Mock()
+        broken.get.side_effect = ConnectionError("redis caído")
+        flight = SingleFlight(cache_backend=broken)
+
+        self.assertEqual(flight.do("news:MLGO:10", lambda: "ok"), ("ok", False))
+
+
+class PollingSchedulerTests(TestCase):
+    """Tests para el planificador adaptativo de la watchlist."""
+
+    # Martes 14:00 en Nueva York (sesión abierta)
+    MARKET_HOURS = datetime(2025, 6, 3, 18, 0, tzinfo=dt_timezone.utc)
+    # Sábado
+    WEEKEND = datetime(2025, 6, 7, 18, 0, tzinfo=dt_timezone.utc)
+
+    def test_is_market_open(self):
+        """Test de detección de la sesión regular del mercado."""
+        self.assertTrue(is_market_open(self.MARKET_HOURS))
+        self.assertFalse(is_market_open(self.WEEKEND))
+        self.assertFalse(is_market_open(self.MARKET_HOURS + timedelta(hours=3)))
+
+    def test_interval_adapts_to_velocity(self):
+        """Test que los tickers activos se sondean cada minuto y los inactivos cada hora."""
+        self.assertEqual(compute_poll_interval(120, market_open=True), 60)
+        self.assertEqual(compute_poll_interval(6, market_open=True), 600)
+        self.assertEqual(compute_poll_interval(0, market_open=True), 3600)
+
+    def test_interval_is_longer_off_hours(self):
+        """Test que fuera de sesión el intervalo se alarga."""
+        self.assertEqual(compute_poll_interval(6, market_open=False), 2400)
+
+    def test_record_poll_updates_velocity(self):
+        """Test que la velocidad se suaviza con la nueva observación."""
+        watch = WatchedTicker.objects.create(
+            symbol="MLGO",
+            news_velocity=2.0,
+            last_polled_at=self.MARKET_HOURS - timedelta(hours=1),
+        )
+
+        record_poll(watch, saved_count=12, now=self.MARKET_HOURS)
+
+        watch.refresh_from_db()
+        self.assertAlmostEqual(watch.news_velocity, 0.3 * 12 + 0.7 * 2.0)
+        self.assertEqual(watch.poll_interval, int(3600 / watch.news_velocity))
+        self.assertEqual(
+            watch.next_poll_at,
+            self.MARKET_HOURS + timedelta(seconds=watch.poll_interval),
+        )
+
+    def test_record_poll_without_result_keeps_velocity(self):
+        """Test que un sondeo descartado sólo reprograma."""
+        watch = WatchedTicker.objects.create(symbol="MLGO", news_velocity=3.0)
+
+        record_poll(watch, saved_count=None, now=self.MARKET_HOURS)
+
+        watch.refresh_from_db()
+        self.assertEqual(watch.news_velocity, 3.0)
+        self.assertIsNone(watch.last_polled_at)
+
+    def test_claim_due_tickers_only_claims_once(self):
+        """Test que un ticker pendiente sólo se reclama una vez por intervalo."""
+        WatchedTicker.objects.create(symbol="MLGO", next_poll_at=self.MARKET_HOURS)
+        WatchedTicker.objects.create(
+            symbol="AAPL", next_poll_at=self.MARKET_HOURS + timedelta(hours=1)
+        )
+        WatchedTicker.objects.create(
+            symbol="OFF", active=False, next_poll_at=self.MARKET_HOURS
+        )
+
+        first = claim_due_tickers(now=self.MARKET_HOURS)
+        second = claim_due_tickers(now=self.MARKET_HOURS)
+
+        self.assertEqual([w.symbol for w in first], ["MLGO"])
+        self.assertEqual(second, [])
+
+    @mock.patch("news.tasks.fetch_and_save_news")
+    def test_poll_task_uses_low_priority(self, fetch):
+        """Test que el sondeo programado cede prioridad a los usuarios."""
+        fetch.return_value = {"total_saved": 0, "news_objects": []}
+        watch = WatchedTicker.objects.create(symbol="MLGO", news_count=5)
+
+        poll_watched_ticker(watch.pk)
+
+        fetch.assert_called_once_with("MLGO", 5, priority=PRIORITY_LOW)
+        watch.refresh_from_db()
+        self.assertIsNotNone(watch.last_polled_at)
+
+
+NEWS_FIXTURE = [
+    {
+        "uuid": "5f0c3a4e-2a5e-4c1b-9d0c-0a6f1b7e9c11",
+        "title": "MLGO gains 20% after earnings",
+        "publisher": "Reuters",
+        "link": "https://example.com/mlgo",
+        "providerPublishTime": 1717430400,
+        "type": "STORY",
+        "relatedTickers": ["MLGO"],
+    },
+    {
+        "uuid": "7c1d2b3a-4e5f-4a6b-8c9d-0e1f2a3b4c5d",
+        "title": "Sin enlace",
+        "providerPublishTime": 1717430500,
+    },
+]
+
+
+class ReplayDataSourceTests(TestCase):
+    """Tests para la fuente de datos grabada de Yahoo."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        news_dir = f"{self.tmp.name}/news"
+        os.makedirs(news_dir)
+        cache.clear()
+        with open(f"{news_dir}/MLGO.json", "w") as f:
+            json.dump(NEWS_FIXTURE, f)
+        with open(f"{news_dir}/_default.json", "w") as f:
+            json.dump(NEWS_FIXTURE[:1], f)
+        self.sleeps = []
+
+    def _source(self, **kwargs):
+        return ReplayDataSource(self.tmp.name, sleep=self.sleeps.append, **kwargs)
+
+    def test_replays_recorded_news(self):
+        """Test que se sirven las noticias grabadas del ticker."""
+        news = self._source().search_news("mlgo", 10, timeout=5)
+
+        self.assertEqual(news, NEWS_FIXTURE)
+
+    def test_falls_back_to_default_fixture(self):
+        """Test que un ticker sin grabación usa la respuesta por defecto."""
+        news = self._source().search_news("AAPL", 10, timeout=5)
+
+        self.assertEqual(len(news), 1)
+
+    def test_injects_latency_and_timeouts(self):
+        """Test que la latencia simulada respeta el timeout de la llamada."""
+        source = self._source(latency=2.0)
+
+        source.search_news("MLGO", 10, timeout=5)
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            source.search_news("MLGO", 10, timeout=1)
+
+        self.assertEqual(self.sleeps, [2.0, 1])
+
+    def test_injects_errors(self):
+        """Test que la tasa de errores se aplica de forma reproducible."""
+        source = self._source(error_rate=1.0, seed=1)
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            source.search_news("MLGO", 10, timeout=5)
+
+    def test_history_round_trip(self):
+        """Test que un histórico grabado se reproduce como DataFrame."""
+        # Cruza el cambio al horario de verano: desfases -05:00 y -04:00
+        index = pd.DatetimeIndex(
+            pd.to_datetime(["2024-03-08", "2024-03-11"]).tz_localize("America/New_York"),
+            name="Date",
+        )
+        frame = pd.DataFrame(
+            {"Open": [1.0, 2.0], "Close": [1.5, 2.5], "Volume": [100, 200]},
+            index=index,
+        )
+        inner = mock.Mock()
+        inner.history.return_value = frame
+
+        RecordingDataSource(inner, self.tmp.name).history("MLGO", 5, period="1mo")
+        replayed = self._source().history("MLGO", 5, period="1mo")
+
+        self.assertEqual(list(replayed.columns), ["Open", "Close", "Volume"])
+        self.assertEqual(replayed["Close"].tolist(), [1.5, 2.5])
+        self.assertEqual(replayed.index[1], index[1])
+        self.assertEqual(str(replayed.index.tz), "America/New_York")
+        self.assertEqual(replayed.index.name, "Date")
+
+    @mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+    def test_fetch_and_save_news_offline(self, delay):
+        """Test de la ingesta completa contra la fuente grabada."""
+        set_data_source(self._source())
+        self.addCleanup(set_data_source, None)
+
+        result = fetch_and_save_news("MLGO", 10)
+
+        self.assertEqual(result["total_fetched"], 2)
+        self.assertEqual(result["total_saved"], 1)
+        self.assertTrue(New.objects.filter(title__startswith="MLGO gains").exists())
+
+
+class DuplicateDetectionTests(TestCase):
+    """Tests para la detección de titulares casi duplicados."""
+
+    TITLE = "Apple shares jump after record iPhone sales beat Wall Street estimates"
+
+    def test_similar_titles_have_close_fingerprints(self):
+        """Test que titulares sindicados quedan a poca distancia de Hamming."""
+        near = simhash(self.TITLE + ".")
+        variant = simhash("Apple shares jump after record iPhone sales beat Wall St estimates")
+        other = simhash("Oil prices slide as OPEC signals higher output next quarter")
+
+        self.assertEqual(hamming_distance(simhash(self.TITLE), near), 0)
+        self.assertLess(
+            hamming_distance(simhash(self.TITLE), variant),
+            hamming_distance(simhash(self.TITLE), other),
+        )
+        self.assertGreater(hamming_distance(simhash(self.TITLE), other), 3)
+
+    def test_lsh_finds_candidates_within_threshold(self):
+        """Test que huellas a distancia <= 3 comparten alguna banda."""
+        index = LshIndex(bands=4)
+        fingerprint = simhash(self.TITLE)
+        index.add("a", fingerprint)
+
+        flipped = fingerprint ^ (1 << 3) ^ (1 << 20) ^ (1 << 40)
+        self.assertEqual(index.candidates(flipped), {"a"})
+
+    def test_detector_links_duplicates_within_window(self):
+        """Test que el detector enlaza al canónico sólo dentro de la ventana."""
+        detector = DuplicateDetector(window=3600)
+
+        _, first = detector.assign("a", self.TITLE, 1000)
+        _, second = detector.assign("b", self.TITLE + "!", 1500)
+        _, late = detector.assign("c", self.TITLE, 1000 + 7200)
+
+        self.assertIsNone(first)
+        self.assertEqual(second, "a")
+        self.assertIsNone(late)
+
+    @mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+    def test_ingestion_skips_analysis_for_duplicates(self, delay):
+        """Test que la ingesta enlaza duplicados y no los encola para análisis."""
+        base = NEWS_FIXTURE[0]
+        duplicate = {
+            **base,
+            "uuid": "9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c6d",
+            "publisher": "Yahoo",
+            "providerPublishTime": base["providerPublishTime"] + 600,
+        }
+        source = mock.Mock()
+        source.search_news.return_value = [base, duplicate]
+        set_data_source(source)
+        self.addCleanup(set_data_source, None)
+        cache.clear()
+
+        fetch_and_save_news("MLGO", 10)
+
+        copy = New.objects.get(uuid=duplicate["uuid"])
+        self.assertEqual(str(copy.canonical_id), base["uuid"])
+        self.assertIsNotNone(copy.title_fingerprint)
+        delay.assert_called_once_with(base["uuid"])
+
+
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class NewsTickerTests(TestCase):
+    """Tests para la relación normalizada noticia-ticker."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="trader", password="pass1234")
+        self.client.force_authenticate(self.user)
+
+    def _news(self, uuid, tickers, published=1717430400, title=None):
+        return process_news_item(
+            {
+                "uuid": uuid,
+                "title": title or f"Noticia {uuid[:8]}",
+                "link": "https://example.com",
+                "providerPublishTime": published,
+                "relatedTickers": tickers,
+            }
+        )[0]
+
+    def test_ingestion_maintains_tickers(self, delay):
+        """Test que la ingesta crea, actualiza y elimina las filas de tickers."""
+        uuid = "11111111-1111-4111-8111-111111111111"
+        self._news(uuid, ["ai", "MSFT"])
+        self._news(uuid, ["AI", "NVDA"], published=1717430999)
+
+        rows = NewsTicker.objects.filter(news_id=uuid).order_by("symbol")
+        self.assertEqual(
+            list(rows.values_list("symbol", "publish_time")),
+            [("AI", 1717430999), ("NVDA", 1717430999)],
+        )
+
+    def test_by_symbol_is_exact_and_ordered(self, delay):
+        """Test que el filtro por símbolo no da falsos positivos por subcadena."""
+        older = self._news("22222222-2222-4222-8222-222222222222", ["AI"], 100)
+        newer = self._news("33333333-3333-4333-8333-333333333333", ["AI"], 200)
+        self._news("44444444-4444-4444-8444-444444444444", ["AIRI"], 300)
+
+        response = self.client.get("/api/news/by-symbol/ai/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(
+            [item["uuid"] for item in response.data["news"]],
+            [str(newer.uuid), str(older.uuid)],
+        )
+
+
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class KeysetPaginationTests(TestCase):
+    """Tests para la paginación por cursor de los listados."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="trader", password="pass1234")
+        self.client.force_authenticate(self.user)
+
+    def _create_news(self, count, published=1717430400):
+        # Misma fecha para todas: el desempate lo hace el uuid
+        for i in range(count):
+            New.objects.create(
+                uuid=f"00000000-0000-4000-8000-{i:012d}",
+                title=f"Noticia {i}",
+                publisher="Reuters",
+                link="https://example.com",
+                provider_publish_time=published + (i // 2),
+                news_type="STORY",
+            )
+
+    def _walk(self, url):
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item["uuid"] for item in response.data["results"])
+            url = response.data["next"]
+        return seen
+
+    def test_pages_cover_table_in_order_without_overlap(self, delay):
+        """Test que recorrer los cursores devuelve cada fila una vez y en orden."""
+        self._create_news(7)
+
+        seen = self._walk("/api/news/?page_size=3")
+
+        expected = [
+            str(uuid)
+            for uuid in New.objects.order_by(
+                "-provider_publish_time", "-uuid"
+            ).values_list("uuid", flat=True)
+        ]
+        self.assertEqual(seen, expected)
+
+    def test_previous_cursor_returns_previous_page(self, delay):
+        """Test que el cursor anterior devuelve la página previa."""
+        self._create_news(5)
+
+        first = self.client.get("/api/news/?page_size=2").data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+
+        self.assertIsNone(first["previous"])
+        self.assertEqual(back["results"], first["results"])
+        self.assertIsNone(back["previous"])
+
+    def test_new_rows_do_not_shift_pages(self, delay):
+        """Test que las noticias nuevas no desplazan las páginas siguientes."""
+        self._create_news(4)
+        first = self.client.get("/api/news/?page_size=2").data
+        New.objects.create(
+            uuid="ffffffff-0000-4000-8000-000000000000",
+            title="Última hora",
+            publisher="Reuters",
+            link="https://example.com",
+            provider_publish_time=1817430400,
+            news_type="STORY",
+        )
+
+        second = self.client.get(first["next"]).data
+
+        uuids = {item["uuid"] for item in first["results"] + second["results"]}
+        self.assertEqual(len(uuids), 4)
+
+    def test_invalid_cursor(self, delay):
+        """Test que un cursor manipulado devuelve 404."""
+        response = self.client.get("/api/news/?cursor=no-es-un-cursor")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class NewsFilterTests(TestCase):
+    """Tests para los filtros por fecha, sentimiento, relevancia y símbolo."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="trader", password="pass1234")
+        self.client.force_authenticate(self.user)
+
+    def _news(self, uuid, published, tickers=(), label=None, relevance="baja"):
+        news = process_news_item(
+            {
+                "uuid": uuid,
+                "title": f"Noticia {uuid[:8]}",
+                "link": "https://example.com",
+                "providerPublishTime": published,
+                "relatedTickers": list(tickers),
+            }
+        )[0]
+        if label:
+            NewsAnalysis.objects.create(
+                news=news,
+                sentiment_score=0.5,
+                sentiment_label=label,
+                combined_score=0.5,
+                relevance=relevance,
+                keyword_score=0.5,
+                ticker_count=len(tickers),
+                figures_count=0,
+            )
+        return str(news.uuid)
+
+    def _list(self, query):
+        response = self.client.get(f"/api/news/?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["uuid"] for item in response.data["results"]]
+
+    def test_published_at_follows_provider_time(self, delay):
+        """Test que published_at se deriva de provider_publish_time al guardar."""
+        uuid = self._news("10000000-0000-4000-8000-000000000001", 1717430400)
+
+        self.assertEqual(
+            New.objects.get(uuid=uuid).published_at,
+            datetime(2024, 6, 3, 16, 0, tzinfo=dt_timezone.utc),
+        )
+
+    def test_time_range_filter(self, delay):
+        """Test que since/until aceptan ISO 8601 y epoch."""
+        old = self._news("10000000-0000-4000-8000-000000000001", 1717430400)
+        new = self._news("10000000-0000-4000-8000-000000000002", 1717516800)
+
+        self.assertEqual(self._list("since=2024-06-04T00:00:00Z"), [new])
+        self.assertEqual(self._list("until=1717516800"), [old])
+        for value in ("ayer", "1e20", "inf", "2024-02-30T00:00:00"):
+            response = self.client.get("/api/news/", {"since": value})
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST, value
+            )
+
+    def test_sentiment_relevance_and_symbol_filters(self, delay):
+        """Test que los filtros se combinan sobre el análisis y los tickers."""
+        match = self._news(
+            "10000000-0000-4000-8000-000000000001",
+            1717430400,
+            ["AAPL"],
+            label="positivo",
+            relevance="alta",
+        )
+        self._news(
+            "10000000-0000-4000-8000-000000000002",
+            1717430500,
+            ["AAPL"],
+            label="negativo",
+            relevance="alta",
+        )
+        self._news(
+            "10000000-0000-4000-8000-000000000003",
+            1717430600,
+            ["AAPLX"],
+            label="positivo",
+            relevance="alta",
+        )
+
+        self.assertEqual(
+            self._list("symbol=aapl&sentiment=positivo&relevance=alta"), [match]
+        )
+
+
+@override_settings(NEWS_CHANGES_SETTLE_SECONDS=0)
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class NewsChangesTests(TestCase):
+    """Tests para la sincronización incremental de noticias."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="trader", password="pass1234")
+        self.client.force_authenticate(self.user)
+
+    def _news(self, uuid, title="Noticia"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return process_news_item(
+                {
+                    "uuid": uuid,
+                    "title": title,
+                    "link": "https://example.com",
+                    "providerPublishTime": 1717430400,
+                }
+            )[0]
+
+    def _changes(self, since=0, **params):
+        response = self.client.get("/api/news/changes/", {"since": since, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_returns_only_changes_after_cursor(self, delay):
+        """Test que sólo se devuelven los cambios posteriores al cursor."""
+        self._news("20000000-0000-4000-8000-000000000001")
+        first = self._changes()
+        self._news("20000000-0000-4000-8000-000000000002")
+
+        second = self._changes(first["next_cursor"])
+
+        self.assertEqual(len(first["news"]), 1)
+        self.assertEqual(
+            [item["uuid"] for item in second["news"]],
+            ["20000000-0000-4000-8000-000000000002"],
+        )
+        self.assertEqual(self._changes(second["next_cursor"])["news"], [])
+
+    def test_compacts_repeated_changes_and_reports_tombstones(self, delay):
+        """Test que varios cambios de una noticia se compactan y los borrados se informan."""
+        kept = "20000000-0000-4000-8000-000000000001"
+        gone = "20000000-0000-4000-8000-000000000002"
+        self._news(kept)
+        self._news(kept, title="Noticia actualizada")
+        news = self._news(gone)
+        with self.captureOnCommitCallbacks(execute=True):
+            news.delete()
+
+        feed = self._changes()
+
+        self.assertEqual([item["uuid"] for item in feed["news"]], [kept])
+        self.assertEqual(feed["news"][0]["title"], "Noticia actualizada")
+        self.assertEqual(feed["deleted"], [gone])
+
+    def test_limit_sets_has_more(self, delay):
+        """Test que el límite pagina los cambios con has_more."""
+        for i in range(3):
+            self._news(f"20000000-0000-4000-8000-00000000000{i}")
+
+        feed = self._changes(limit=2)
+
+        self.assertTrue(feed["has_more"])
+        self.assertEqual(len(feed["news"]), 2)
+        self.assertEqual(len(self._changes(feed["next_cursor"])["news"]), 1)
+
+    @override_settings(NEWS_CHANGES_SETTLE_SECONDS=60)
+    def test_recent_changes_wait_to_settle(self, delay):
+        """Test que los cambios recientes no se sirven hasta asentarse."""
+        self._news("20000000-0000-4000-8000-000000000001")
+
+        feed = self._changes()
+
+        self.assertEqual(feed["news"], [])
+        self.assertEqual(feed["next_cursor"], 0)
+
+    def test_prune_keeps_recent_and_latest_changes(self, delay):
+        """Test que la poda borra los cambios antiguos salvo el último."""
+        for i in range(3):
+            self._news(f"20000000-0000-4000-8000-00000000000{i}")
+        latest = NewsChange.objects.order_by("-id").first().id
+
+        deleted = prune_changes(
+            retention_days=0, now=datetime.now(dt_timezone.utc) + timedelta(days=1)
+        )
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(list(NewsChange.objects.values_list("id", flat=True)), [latest])
+        self.assertEqual(prune_changes(retention_days=7), 0)
+
+    def test_pruned_cursor_requires_resync(self, delay):
+        """Test que un cursor anterior a la poda pide recargar el listado."""
+        for i in range(3):
+            self._news(f"20000000-0000-4000-8000-00000000000{i}")
+        prune_changes(retention_days=0, now=datetime.now(dt_timezone.utc) + timedelta(days=1))
+        latest = NewsChange.objects.get().id
+
+        response = self.client.get("/api/news/changes/", {"since": 0})
+
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertTrue(response.data["resync_required"])
+        self.assertEqual(response.data["next_cursor"], latest)
+        self.assertEqual(self._changes(latest)["news"], [])
+        self.assertEqual(len(self._changes(latest - 1)["news"]), 1)
+
+
+class EventBusTests(SimpleTestCase):
+    """Tests para el reparto de eventos en tiempo real."""
+
+    async def test_filters_by_symbol(self):
+        """Test que cada suscripción sólo recibe los eventos de sus símbolos."""
+        bus = InMemoryEventBus()
+        aapl = bus.subscribe(["aapl"])
+        everything = bus.subscribe([])
+
+        bus.publish({"type": "news", "symbols": ["MSFT"]})
+        bus.publish({"type": "news", "symbols": ["AAPL", "MSFT"]})
+        await asyncio.sleep(0)
+
+        self.assertEqual((await aapl.get(timeout=0.1))["symbols"], ["AAPL", "MSFT"])
+        self.assertIsNone(await aapl.get(timeout=0.01))
+        self.assertEqual(everything.queue.qsize(), 2)
+
+    async def test_slow_consumer_gets_lagged_event(self):
+        """Test que una cola llena descarta eventos sin bloquear y avisa después."""
+        bus = InMemoryEventBus(max_queue=2)
+        subscription = bus.subscribe()
+
+        for i in range(5):
+            bus.publish({"type": "news", "n": i})
+        await asyncio.sleep(0)
+
+        received = [await subscription.get(timeout=0.1) for _ in range(3)]
+        self.assertEqual([event.get("n") for event in received[:2]], [0, 1])
+        self.assertEqual(received[2], {"type": "lagged", "dropped": 3})
+
+    async def test_redis_listener_reconnects(self):
+        """Test que el hilo de Redis se reconecta si la suscripción se cae."""
+        from .services.event_bus import RedisEventBus
+
+        # El hilo queda escuchando (es daemon) hasta que acaban los tests
+        release = threading.Event()
+        event = {"type": "news", "symbols": ["AAPL"]}
+
+        def listen():
+            yield {"data": json.dumps(event)}
+            release.wait()
+
+        broken = mock.Mock()
+        broken.subscribe.side_effect = ConnectionError("sin conexión")
+        healthy = mock.Mock()
+        healthy.listen.side_effect = listen
+        client = mock.Mock()
+        client.pubsub.side_effect = [broken, healthy]
+
+        with mock.patch("redis.Redis.from_url", return_value=client), mock.patch(
+            "news.services.event_bus.LISTENER_MIN_BACKOFF", 0
+        ):
+            bus = RedisEventBus("redis://localhost:6379/0")
+            subscription = bus.subscribe(["AAPL"])
+            received = await subscription.get(timeout=2)
+
+        self.assertEqual(received, event)
+        broken.close.assert_called_once()
+
+    async def test_closing_response_unsubscribes(self):
+        """Test que al cerrar la respuesta SSE se retira la suscripción."""
+        bus = InMemoryEventBus()
+        response = StreamingHttpResponse(EventStream(bus.subscribe(), 15, "trader"))
+
+        response.close()
+
+        self.assertEqual(bus.subscriber_count, 0)
+
+
+class NewsStreamTests(TestCase):
+    """Tests para el stream SSE de noticias."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        self.user = User.objects.create_user(username="trader", password="pass1234")
+        self.token = str(AccessToken.for_user(self.user))
+        self.bus = InMemoryEventBus()
+        set_event_bus(self.bus)
+        self.addCleanup(set_event_bus, None)
+
+    async def test_requires_authentication(self):
+        """Test que sin token se responde 401."""
+        response = await self.async_client.get("/api/news/stream/")
+
+        self.assertEqual(response.status_code, 401)
+
+    async def _ticket(self):
+        response = await self.async_client.post(
+            "/api/news/stream/ticket/", headers={"Authorization": f"Bearer {self.token}"}
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()["ticket"]
+
+    async def test_ticket_is_single_use_and_jwt_not_in_query(self):
+        """Test que el ticket sirve una vez y el JWT no se acepta en la URL."""
+        ticket = await self._ticket()
+
+        first = await self.async_client.get("/api/news/stream/", {"ticket": ticket})
+        self.assertEqual(first.status_code, 200)
+        await first.streaming_content.aclose()
+        again = await self.async_client.get("/api/news/stream/", {"ticket": ticket})
+        self.assertEqual(again.status_code, 401)
+        for params in ({"token": self.token}, {"ticket": self.token}):
+            response = await self.async_client.get("/api/news/stream/", params)
+            self.assertEqual(response.status_code, 401)
+
+    async def test_streams_matching_events(self):
+        """Test que el stream emite los eventos de los símbolos pedidos."""
+        response = await self.async_client.get(
+            "/api/news/stream/", {"symbols": "AAPL", "ticket": await self._ticket()}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+
+        self.assertTrue((await anext(stream)).startswith(b"retry:"))
+        self.bus.publish({"type": "news", "uuid": "x", "symbols": ["MSFT"]})
+        self.bus.publish({"type": "analysis", "uuid": "y", "symbols": ["AAPL"]})
+        chunk = (await anext(stream)).decode()
+        await stream.aclose()
+
+        self.assertTrue(chunk.startswith("event: analysis\n"))
+        self.assertEqual(json.loads(chunk.split("data: ")[1])["uuid"], "y")
+
+    @mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+    def test_ingestion_publishes_events(self, delay):
+        """Test que crear una noticia y su análisis publica ambos eventos."""
+        bus = mock.Mock()
+        set_event_bus(bus)
+        with self.captureOnCommitCallbacks(execute=True):
+            news = process_news_item(
+                {
+                    "uuid": "30000000-0000-4000-8000-000000000001",
+                    "title": "Apple sube",
+                    "link": "https://example.com",
+                    "providerPublishTime": 1717430400,
+                    "relatedTickers": ["aapl"],
+                }
+            )[0]
+            NewsAnalysis.objects.create(
+                news=news,
+                sentiment_score=0.5,
+                sentiment_label="positivo",
+                combined_score=0.5,
+                relevance="media",
+                keyword_score=0.5,
+                ticker_count=1,
+                figures_count=0,
+            )
+
+        events = [call.args[0] for call in bus.publish.call_args_list]
+        self.assertEqual([e["type"] for e in events], ["news", "analysis"])
+        self.assertEqual(events[0]["symbols"], ["AAPL"])
+
+
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class SearchTests(TestCase):
+    """Tests para la búsqueda de texto completo."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="trader", password="pass1234")
+        self.client.force_authenticate(self.user)
+
+    def _news(self, uuid, title, tickers=(), published=1717430400):
+        return str(
+            process_news_item(
+                {
+                    "uuid": uuid,
+                    "title": title,
+                    "link": "https://example.com",
+                    "providerPublishTime": published,
+                    "relatedTickers": list(tickers),
+                }
+            )[0].uuid
+        )
+
+    def _search(self, query):
+        response = self.client.get(f"/api/news/search/?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_ranks_and_stems_matches(self, delay):
+        """Test que se buscan raíces de palabras y se ordena por relevancia."""
+        strong = self._news(
+            "40000000-0000-4000-8000-000000000001", "Nvidia earnings beat, earnings guidance raised"
+        )
+        weak = self._news(
+            "40000000-0000-4000-8000-000000000002", "Chip stocks rally after Nvidia earning report"
+        )
+        self._news("40000000-0000-4000-8000-000000000003", "Oil slides on OPEC output")
+
+        data = self._search("q=earnings")
+
+        self.assertEqual([item["uuid"] for item in data["results"]], [strong, weak])
+        self.assertGreater(data["results"][0]["rank"], data["results"][1]["rank"])
+
+    def test_index_follows_updates_and_deletes(self, delay):
+        """Test que el índice se mantiene al actualizar y borrar noticias."""
+        uuid = self._news("40000000-0000-4000-8000-000000000001", "Apple unveils headset")
+        self._news(uuid, "Apple unveils car")
+        self.assertEqual(self._search("q=headset")["results"], [])
+        self.assertEqual(len(self._search("q=car")["results"]), 1)
+
+        New.objects.filter(uuid=uuid).delete()
+
+        self.assertEqual(self._search("q=car")["results"], [])
+
+    def test_symbol_date_filters_and_pagination(self, delay):
+        """Test que los filtros y la paginación se aplican a la búsqueda."""
+        for i in range(3):
+            self._news(
+                f"40000000-0000-4000-8000-00000000000{i}",
+                f"Tesla deliveries update {i}",
+                ["TSLA"],
+                published=1717430400 + i * 86400,
+            )
+        self._news("40000000-0000-4000-8000-000000000009", "Tesla rival deliveries", ["NIO"])
+
+        first = self._search("q=tesla deliveries&symbol=tsla&page_size=2")
+        second = self.client.get(first["next"]).data
+        recent = self._search("q=deliveries&symbol=TSLA&since=2024-06-04T00:00:00Z")
+
+        self.assertEqual(len(first["results"]) + len(second["results"]), 3)
+        self.assertIsNone(second["next"])
+        self.assertEqual(len(recent["results"]), 2)
+
+    def test_query_is_required_and_syntax_is_escaped(self, delay):
+        """Test que q es obligatorio y los operadores no rompen la consulta."""
+        self._news("40000000-0000-4000-8000-000000000001", "AMD \"NEAR\" record")
+
+        self.assertEqual(
+            self.client.get("/api/news/search/").status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        response = self.client.get("/api/news/search/", {"q": 'amd" (record* -'})
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_article_search(self, delay):
+        """Test que los artículos se buscan por título y contenido."""
+        from sentiment_analysis.models import Article
+
+        Article.objects.create(
+            ticker="MSFT",
+            title="Cloud growth",
+            content="Azure revenue accelerates",
+            pub_date=datetime(2024, 6, 3, tzinfo=dt_timezone.utc),
+        )
+
+        response = self.client.get("/api/articles/search/?q=azure&ticker=msft")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["title"], "Cloud growth")
+
+
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class NewsValuesSerializerTests(TestCase):
+    """Tests para la serialización rápida de listados."""
+
+    def test_same_json_as_model_serializer(self, delay):
+        """Test que la serialización por values() produce el mismo JSON."""
+        from rest_framework.renderers import JSONRenderer
+
+        from .serializers import NewsSerializer, NewsValuesSerializer
+
+        canonical = New.objects.create(
+            uuid="50000000-0000-4000-8000-000000000001",
+            title="Original",
+            publisher="Reuters",
+            link="https://example.com/1",
+            provider_publish_time=1717430400,
+            news_type="STORY",
+            thumbnail={"resolutions": [{"url": "https://example.com/t.jpg"}]},
+            related_tickers=["AAPL"],
+            title_fingerprint=-42,
+        )
+        New.objects.create(
+            uuid="50000000-0000-4000-8000-000000000002",
+            title="Copia",
+            publisher="Yahoo",
+            link="https://example.com/2",
+            provider_publish_time=1717430401,
+            news_type="STORY",
+            canonical=canonical,
+        )
+        NewsAnalysis.objects.create(
+            news=canonical,
+            sentiment_score=0.25,
+            sentiment_label="positivo",
+            combined_score=0.5,
+            relevance="alta",
+            keyword_score=0.25,
+            ticker_count=1,
+            figures_count=0,
+        )
+        queryset = New.objects.order_by("uuid")
+        fast = NewsValuesSerializer()
+
+        self.assertEqual(fast.fields, list(NewsSerializer().fields))
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(fast.serialize(fast.values(queryset))),
+            renderer.render(
+                NewsSerializer(queryset.select_related("analysis"), many=True).data
+            ),
+        )
+
+
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class SparseFieldsetTests(TestCase):
+    """Tests para ?fields= / ?exclude= en los listados."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="trader", password="pass1234")
+        self.client.force_authenticate(self.user)
+
+    def _seed(self):
+        for i in range(3):
+            process_news_item(
+                {
+                    "uuid": f"60000000-0000-4000-8000-00000000000{i}",
+                    "title": f"Noticia {i}",
+                    "link": "https://example.com",
+                    "providerPublishTime": 1717430400 + i,
+                    "relatedTickers": ["AAPL"],
+                }
+            )
+
+    def test_news_list_fields(self, delay):
+        """Test que el listado devuelve sólo los campos pedidos y pagina igual."""
+        self._seed()
+        response = self.client.get("/api/news/?fields=uuid,title&page_size=2")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [list(item) for item in response.data["results"]], [["uuid", "title"]] * 2
+        )
+        rest = self.client.get(response.data["next"]).data["results"]
+        self.assertEqual(
+            rest,
+            [{"uuid": "60000000-0000-4000-8000-000000000000", "title": "Noticia 0"}],
+        )
+
+    def test_news_detail_exclude_defers_columns(self, delay):
+        """Test que el detalle omite y difiere las columnas excluidas."""
+        from django.test.utils import CaptureQueriesContext
+
+        self._seed()
+        uuid = "60000000-0000-4000-8000-000000000001"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/news/{uuid}/?exclude=analysis,thumbnail")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("analysis", response.data)
+        self.assertNotIn("thumbnail", response.data)
+        self.assertEqual(response.data["title"], "Noticia 1")
+        select = [q["sql"] for q in queries if "news_new" in q["sql"]]
+        self.assertEqual(len(select), 1)
+        self.assertNotIn("thumbnail", select[0])
+        self.assertNotIn("JOIN", select[0])
+
+    def test_unknown_field_is_rejected(self, delay):
+        """Test que un campo desconocido responde 400."""
+        response = self.client.get("/api/news/?fields=uuid,nope")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_articles_and_stocks(self, delay):
+        """Test que artículos y stocks también admiten campos parciales."""
+        from news.models import Stock
+        from sentiment_analysis.models import Article
+
+        Article.objects.create(
+            ticker="MSFT",
+            title="Cloud growth",
+            content="Texto largo",
+            pub_date=datetime(2024, 6, 3, tzinfo=dt_timezone.utc),
+        )
+        Stock.objects.create(symbol="AAPL", city="Cupertino")
+
+        articles = self.client.get("/api/articles/?exclude=content,analysis").data
+        stocks = self.client.get("/api/stocks/?fields=symbol,city").data
+
+        self.assertEqual(
+            list(articles["results"][0]), ["id", "ticker", "title", "pub_date"]
+        )
+        self.assertEqual(stocks["results"], [{"symbol": "AAPL", "city": "Cupertino"}])
+
+
+@skipUnless(connection.vendor == "sqlite", "Los triggers FTS5 sólo existen en SQLite")
+class SearchIndexMigrationTests(TransactionTestCase):
+    """Tests para el índice de búsqueda instalado por las migraciones."""
+
+    TRIGGERS = ["news_new_fts_ad", "news_new_fts_ai", "news_new_fts_au"]
+
+    def _triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = 'news_new' ORDER BY name"
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def _alter_title(self, max_length):
+        old_field = New._meta.get_field("title")
+        new_field = models.CharField(max_length=max_length)
+        new_field.set_attributes_from_name("title")
+        with connection.schema_editor() as editor:
+            editor.alter_field(New, old_field, new_field)
+
+    def test_table_remake_drops_triggers_until_rebuild(self):
+        """Test que rehacer la tabla en SQLite borra los triggers y rebuild_search_index los recrea."""
+        from io import StringIO
+        from django.core.management import call_command
+
+        self.assertEqual(self._triggers(), self.TRIGGERS)
+
+        self._alter_title(300)
+        self.assertEqual(self._triggers(), [])
+
+        self._alter_title(255)
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(self._triggers(), self.TRIGGERS)
+
+
+class StockSearchTests(TestCase):
+    """Tests para la búsqueda de stocks por símbolo."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        from news.models import Stock
+
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="trader", password="pass1234")
+        )
+        for symbol in ("AA", "AAL", "AAPL", "MSFT"):
+            Stock.objects.create(symbol=symbol)
+
+    def test_prefix_search_is_paginated(self):
+        """Test que se filtra por prefijo en el servidor y se pagina por cursor."""
+        response = self.client.get(
+            "/api/stocks/search/", {"q": "aa", "page_size": 2, "fields": "symbol"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [{"symbol": "AA"}, {"symbol": "AAL"}])
+        rest = self.client.get(response.data["next"]).data
+        self.assertEqual(rest["results"], [{"symbol": "AAPL"}])
+        self.assertIsNone(rest["next"])
+        self.assertEqual(
+            self.client.get("/api/stocks/search/").status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Tests para la codificación JSON con orjson."""
+
+    def test_non_finite_floats_become_null(self):
+        """Test que NaN e infinitos se codifican como null sin recorrido previo."""
+        from django.http import JsonResponse
+
+        from .renderers import FastJSONEncoder, FastJSONRenderer
+
+        data = {"price": float("nan"), "nested": [{"pe": float("inf")}, -float("inf")]}
+
+        rendered = json.loads(FastJSONRenderer().render(data))
+        response = JsonResponse([data], safe=False, encoder=FastJSONEncoder)
+
+        self.assertEqual(rendered, {"price": None, "nested": [{"pe": None}, None]})
+        self.assertEqual(json.loads(response.content), [rendered])
+
+    def test_matches_drf_for_other_types(self):
+        """Test que fechas, decimales y UUIDs se codifican igual que con DRF."""
+        import uuid
+        from decimal import Decimal
+
+        from rest_framework.renderers import JSONRenderer
+
+        from .renderers import FastJSONRenderer
+
+        data = {
+            "at": datetime(2024, 6, 3, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            "day": datetime(2024, 6, 3).date(),
+            "amount": Decimal("1.50"),
+            "id": uuid.UUID("70000000-0000-4000-8000-000000000001"),
+            "text": "Bolsa ↑",
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class PriceIngestionTests(TestCase):
+    """Tests para la ingesta incremental de precios históricos."""
+
+    def setUp(self):
+        """Almacén de precios en un directorio temporal por test."""
+        self.store_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.store_dir.cleanup)
+        store_settings = override_settings(
+            PRICE_STORE={"DIRECTORY": self.store_dir.name}
+        )
+        store_settings.enable()
+        self.addCleanup(store_settings.disable)
+
+    def _frame(self, days, close, volume=1000):
+        index = pd.DatetimeIndex(
+            pd.to_datetime(days).tz_localize("America/New_York"), name="Date"
+        )
+        return pd.DataFrame(
+            {
+                "Open": close,
+                "High": close,
+                "Low": close,
+                "Close": close,
+                "Volume": [volume] * len(days),
+                "Dividends": [0.0] * len(days),
+                "Stock Splits": [0.0] * len(days),
+            },
+            index=index,
+        )
+
+    def _source(self, *frames):
+        source = mock.Mock()
+        source.history.side_effect = list(frames)
+        set_data_source(source)
+        self.addCleanup(set_data_source, None)
+        return source
+
+    def test_first_run_fetches_period_and_skips_incomplete_bars(self):
+        """Test que sin precios guardados se pide el período completo."""
+        from .models import HistoricalPrice
+        from .services import update_price_history
+
+        source = self._source(
+            self._frame(
+                ["2024-06-03", "2024-06-04", "2024-06-05"], [10.0, float("nan"), 12.0]
+            )
+        )
+
+        result = update_price_history("aapl", period="10y")
+
+        self.assertEqual(
+            source.history.call_args.kwargs, {"period": "10y", "interval": "1d"}
+        )
+        self.assertEqual(result["created"], 2)
+        self.assertEqual(
+            list(
+                HistoricalPrice.objects.order_by("date").values_list("symbol", "close")
+            ),
+            [("AAPL", 10.0), ("AAPL", 12.0)],
+        )
+
+    def test_next_run_fetches_missing_range_and_upserts(self):
+        """Test que se pide sólo desde la última fecha y se actualiza esa barra."""
+        from .models import HistoricalPrice
+        from .services import update_price_history
+
+        HistoricalPrice.objects.create(
+            symbol="AAPL",
+            date=date(2024, 6, 4),
+            open=1,
+            high=1,
+            low=1,
+            close=11.0,
+            volume=5,
+        )
+        source = self._source(
+            # Las fuentes grabadas ignoran start: las barras antiguas se descartan
+            self._frame(["2024-06-03", "2024-06-04", "2024-06-05"], [9.0, 11.5, 12.0])
+        )
+
+        result = update_price_history("AAPL")
+
+        self.assertEqual(source.history.call_args.kwargs["start"], "2024-06-04")
+        self.assertNotIn("period", source.history.call_args.kwargs)
+        self.assertEqual((result["saved"], result["created"]), (2, 1))
+        rows = HistoricalPrice.objects.order_by("date")
+        self.assertEqual(
+            list(rows.values_list("date", "close", "volume")),
+            [(date(2024, 6, 4), 11.5, 1000), (date(2024, 6, 5), 12.0, 1000)],
+        )
+
+    def test_adjusted_history_is_fetched_again(self):
+        """Test que un split reajustado por Yahoo reescribe todo el histórico."""
+        from .models import HistoricalPrice
+        from .services import update_price_history
+        from .services.price_store import get_price_series
+
+        for day, close in ((3, 10.0), (4, 11.0), (5, 12.0)):
+            HistoricalPrice.objects.create(
+                symbol="AAPL",
+                date=date(2024, 6, day),
+                open=close,
+                high=close,
+                low=close,
+                close=close,
+                volume=5,
+            )
+        self.assertEqual(get_price_series("AAPL").close.tolist(), [10.0, 11.0, 12.0])
+        # Split 2:1 el día 6: Yahoo devuelve las barras anteriores a mitad
+        delta = self._frame(["2024-06-04", "2024-06-05", "2024-06-06"], [5.5, 6.0, 6.5])
+        delta.loc[delta.index[-1], "Stock Splits"] = 2.0
+        full = self._frame(
+            ["2024-06-03", "2024-06-04", "2024-06-05", "2024-06-06"],
+            [5.0, 5.5, 6.0, 6.5],
+        )
+        source = self._source(delta, full)
+
+        result = update_price_history("AAPL")
+
+        starts = [call.kwargs["start"] for call in source.history.call_args_list]
+        self.assertEqual(starts, ["2024-06-04", "2024-06-03"])
+        self.assertEqual((result["saved"], result["created"]), (4, 1))
+        closes = HistoricalPrice.objects.order_by("date").values_list(
+            "close", flat=True
+        )
+        self.assertEqual(list(closes), [5.0, 5.5, 6.0, 6.5])
+        self.assertEqual(get_price_series("AAPL").close.tolist(), [5.0, 5.5, 6.0, 6.5])
+
+    def test_universe_command_batches_symbols(self):
+        """Test que el modo universo descarga por lotes y reporta los errores."""
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from .models import HistoricalPrice, Stock
+
+        def history(ticker, timeout, **params):
+            if ticker == "BAD":
+                raise ValueError("sin datos")
+            return self._frame(["2024-06-03", "2024-06-04"], [1.0, 2.0])
+
+        source = mock.Mock()
+        source.history.side_effect = history
+        set_data_source(source)
+        self.addCleanup(set_data_source, None)
+        cache.clear()
+        Stock.objects.create(symbol="NVDA")
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("# universo\nmsft, bad\naapl\n")
+        self.addCleanup(os.remove, f.name)
+        out, err = StringIO(), StringIO()
+
+        call_command(
+            "fetch_historical_prices",
+            "AAPL",
+            "--file",
+            f.name,
+            "--all-stocks",
+            "--batch-size",
+            "2",
+            stdout=out,
+            stderr=err,
+        )
+
+        self.assertEqual(
+            set(HistoricalPrice.objects.values_list("symbol", flat=True)),
+            {"AAPL", "MSFT", "NVDA"},
+        )
+        self.assertEqual(HistoricalPrice.objects.count(), 6)
+        self.assertIn("Lote 2/2", out.getvalue())
+        self.assertIn("BAD: Error al obtener precios históricos", err.getvalue())
+
+
+def create_analysis(news, **fields):
+    """Análisis de ``news`` con valores neutros salvo los de ``fields``."""
+    return NewsAnalysis.objects.create(
+        news=news,
+        **{
+            "sentiment_score": 0.0,
+            "sentiment_label": "neutral",
+            "combined_score": 0.0,
+            "relevance": "media",
+            "keyword_score": 0.0,
+            "ticker_count": 1,
+            "figures_count": 0,
+            **fields,
+        },
+    )
+
+
+def create_symbol_news(number, symbol, when, analysis=None, **extra):
+    """
+    Noticia ``number`` de ``symbol`` publicada en ``when`` (UTC) con su
+    ``NewsTicker``; ``analysis`` son los campos de su análisis, si lo tiene.
+    """
+    published = int(when.replace(tzinfo=dt_timezone.utc).timestamp())
+    news = New.objects.create(
+        uuid=f"70000000-0000-4000-8000-{number:012d}",
+        title=f"Noticia {number}",
+        publisher="Reuters",
+        link="https://example.com",
+        provider_publish_time=published,
+        news_type="STORY",
+        related_tickers=[symbol],
+        **extra,
+    )
+    NewsTicker.objects.create(news=news, symbol=symbol, publish_time=published)
+    if analysis is not None:
+        create_analysis(news, **analysis)
+    return news
+
+
+class PriceStoreFixturesMixin:
+    """Almacén de precios temporal y barras diarias de prueba."""
+
+    def setUp(self):
+        """Almacén de precios en un directorio temporal por test."""
+        self.store_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.store_dir.cleanup)
+        store_settings = override_settings(
+            PRICE_STORE={"DIRECTORY": self.store_dir.name}
+        )
+        store_settings.enable()
+        self.addCleanup(store_settings.disable)
+
+    def _prices(self, symbol, closes, first=None):
+        from .models import HistoricalPrice
+
+        first = first or date(2024, 1, 1)
+        HistoricalPrice.objects.bulk_create(
+            HistoricalPrice(
+                symbol=symbol,
+                date=first + timedelta(days=i),
+                open=close,
+                high=close + 1,
+                low=close - 1,
+                close=close,
+                volume=100 + i,
+            )
+            for i, close in enumerate(closes)
+        )
+
+
+class HistoricalPricesViewTests(PriceStoreFixturesMixin, TestCase):
+    """Tests para el endpoint de precios históricos de los gráficos."""
+
+    def test_lttb_keeps_extremes(self):
+        """Test que LTTB conserva extremos, primer y último punto."""
+        from .utils.downsampling import lttb_indices
+
+        y = np.sin(np.linspace(0, 6 * np.pi, 5000))
+        y[1234] = 50.0
+        indices = lttb_indices(np.arange(5000), y, 100)
+
+        self.assertEqual(len(indices), 100)
+        self.assertEqual((indices[0], indices[-1]), (0, 4999))
+        self.assertTrue((np.diff(indices) > 0).all())
+        self.assertIn(1234, indices)
+        self.assertEqual(list(lttb_indices(np.arange(5), y[:5], 10)), [0, 1, 2, 3, 4])
+
+    def test_range_and_max_points(self):
+        """Test que start/end acotan el rango y max_points reduce las barras."""
+        self._prices("AAPL", [float(i) for i in range(365)])
+        self._prices("MSFT", [1.0])
+
+        full = self.client.get("/api/historical-price/aapl/").json()
+        ranged = self.client.get(
+            "/api/historical-price/AAPL/",
+            {"start": "2024-02-01", "end": "2024-02-10"},
+        ).json()
+        reduced = self.client.get(
+            "/api/historical-price/AAPL/", {"max_points": 50}
+        ).json()
+
+        self.assertEqual(len(full), 365)
+        self.assertEqual(
+            full[0],
+            {
+                "date": "2024-01-01",
+                "open": 0.0,
+                "high": 1.0,
+                "low": -1.0,
+                "close": 0.0,
+                "volume": 100,
+            },
+        )
+        self.assertEqual(
+            [row["date"] for row in ranged][::9], ["2024-02-01", "2024-02-10"]
+        )
+        self.assertEqual(len(reduced), 50)
+        self.assertEqual(reduced[-1]["date"], "2024-12-30")
+
+    def test_invalid_parameters(self):
+        """Test que una fecha o max_points inválidos responden 400."""
+        for params in ({"start": "01/02/2024"}, {"max_points": "muchos"}):
+            response = self.client.get("/api/historical-price/AAPL/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_max_points_out_of_range(self):
+        """Test que max_points fuera de rango responde 400 en vez de acotarse."""
+        for max_points in ("2", "5001", "muchos"):
+            response = self.client.get(
+                "/api/historical-price/AAPL/", {"max_points": max_points}
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(
+                response.json()["error"], "max_points debe ser un entero entre 3 y 5000"
+            )
+
+    def test_resample_ohlcv_semantics(self):
+        """Test que las velas semanales y mensuales agregan OHLCV correctamente."""
+        # 2024-01-01 es lunes: dos semanas completas y el lunes siguiente
+        self._prices("AAPL", [10.0, 12.0, 8.0, 11.0, 9.0, 9.5, 9.5, 20.0, 21.0])
+
+        weekly = self.client.get(
+            "/api/historical-price/AAPL/resample/", {"interval": "1wk"}
+        ).json()
+        monthly = self.client.get(
+            "/api/historical-price/AAPL/resample/", {"interval": "1mo"}
+        ).json()
+        blocks = self.client.get(
+            "/api/historical-price/AAPL/resample/",
+            {"interval": "3d", "start": date(2024, 1, 4).isoformat()},
+        ).json()
+
+        self.assertEqual(
+            weekly,
+            [
+                {
+                    "date": "2024-01-01",
+                    "open": 10.0,
+                    "high": 13.0,
+                    "low": 7.0,
+                    "close": 9.5,
+                    "volume": sum(range(100, 107)),
+                },
+                {
+                    "date": "2024-01-08",
+                    "open": 20.0,
+                    "high": 22.0,
+                    "low": 19.0,
+                    "close": 21.0,
+                    "volume": 107 + 108,
+                },
+            ],
+        )
+        self.assertEqual(len(monthly), 1)
+        self.assertEqual((monthly[0]["open"], monthly[0]["close"]), (10.0, 21.0))
+        # Bloques de 3 días anclados en el epoch: 03-05, 06-08 y 09-11 de enero
+        self.assertEqual(
+            [(row["date"], row["volume"]) for row in blocks],
+            [("2024-01-06", 105 + 106 + 107), ("2024-01-09", 108)],
+        )
+
+    def test_resample_cache_follows_last_bar(self):
+        """Test que la caché se invalida al cambiar la última barra."""
+        from .models import HistoricalPrice
+        from .services.price_store import refresh_price_store
+
+        cache.clear()
+        self._prices("AAPL", [10.0, 11.0])
+        url = "/api/historical-price/AAPL/resample/?interval=1mo"
+
+        first = self.client.get(url).json()
+        HistoricalPrice.objects.filter(symbol="AAPL", close=11.0).update(close=15.0)
+        # Lo que hace la ingesta después de escribir
+        refresh_price_store(["AAPL"])
+        second = self.client.get(url).json()
+
+        self.assertEqual(first[0]["close"], 11.0)
+        self.assertEqual(second[0]["close"], 15.0)
+        self.assertEqual(
+            self.client.get(url.replace("1mo", "2wk")).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_price_store_refreshes_incrementally(self):
+        """Test que el almacén sirve cortes mapeados y lee sólo las barras nuevas."""
+        from .services.price_store import get_price_series, get_price_store
+
+        self._prices("AAPL", [10.0, 11.0, 12.0])
+        store = get_price_store()
+
+        series = get_price_series("aapl", start=date(2024, 1, 2))
+        self._prices("AAPL", [13.0, 14.0], first=date(2024, 1, 4))
+        with mock.patch(
+            "news.services.price_store.load_price_series",
+            wraps=load_price_series,
+        ) as loader:
+            refreshed = store.refresh("AAPL")
+
+        self.assertIsInstance(series.close, np.memmap)
+        self.assertEqual(series.close.tolist(), [11.0, 12.0])
+        self.assertEqual(loader.call_args.kwargs, {"start": date(2024, 1, 3)})
+        self.assertEqual(refreshed.close.tolist(), [10.0, 11.0, 12.0, 13.0, 14.0])
+        self.assertEqual(len(get_price_series("AAPL")), 5)
+        self.assertEqual(len(get_price_series("NOPE")), 0)
+        self.assertIsNone(store.version("NOPE"))
+
+    def test_row_edits_invalidate_price_store(self):
+        """Test que editar o borrar barras sueltas (admin) invalida la serie."""
+        from .models import HistoricalPrice
+        from .services.price_store import get_price_series, get_price_store
+
+        self._prices("AAPL", [10.0, 11.0, 12.0])
+        version = get_price_series("AAPL").version
+
+        bar = HistoricalPrice.objects.get(symbol="AAPL", date=date(2024, 1, 1))
+        bar.close = 9.5
+        with self.captureOnCommitCallbacks(execute=True):
+            bar.save()
+        self.assertIsNone(get_price_store().version("AAPL"))
+        edited = get_price_series("AAPL")
+        self.assertEqual(edited.close.tolist(), [9.5, 11.0, 12.0])
+        self.assertNotEqual(edited.version, version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            HistoricalPrice.objects.filter(date=date(2024, 1, 2)).delete()
+        self.assertEqual(get_price_series("AAPL").close.tolist(), [9.5, 12.0])
+
+    def test_indicator_math(self):
+        """Test de SMA, RSI y MACD frente a sus definiciones."""
+        from .services import indicators
+
+        close = np.arange(1.0, 41.0)
+        sma = indicators.sma(close, 5)
+        self.assertTrue(np.isnan(sma[:4]).all())
+        self.assertEqual(sma[4:7].tolist(), [3.0, 4.0, 5.0])
+
+        # Serie siempre al alza: sin pérdidas el RSI es 100
+        rsi = indicators.rsi(close, 14)
+        self.assertTrue(np.isnan(rsi[:14]).all())
+        self.assertEqual(rsi[14], 100.0)
+
+        # EMA sembrada con la media simple de las primeras barras
+        ema = indicators.ema(close, 10)
+        self.assertEqual(ema[9], 5.5)
+        self.assertAlmostEqual(ema[10], 11 * 2 / 11 + 5.5 * 9 / 11)
+
+        result = indicators.macd(close, 3, 6, 4)
+        self.assertEqual(set(result), {"macd", "signal", "histogram"})
+        self.assertEqual(int(np.isnan(result["macd"]).sum()), 5)
+        self.assertEqual(int(np.isnan(result["signal"]).sum()), 8)
+
+        with self.assertRaises(ValueError):
+            indicators.parse_indicator("sma:2.5")
+        with self.assertRaises(ValueError):
+            indicators.parse_indicator("foo")
+        self.assertEqual(
+            indicators.parse_indicator("BBANDS:10"), ("bbands", (10.0, 2.0))
+        )
+
+    def test_indicators_endpoint(self):
+        """Test de varios indicadores y símbolos en una sola petición."""
+        from django.urls import reverse
+
+        self._prices("AAPL", [float(10 + i) for i in range(30)])
+        self._prices("MSFT", [float(50 - i) for i in range(30)])
+        user = User.objects.create_user(username="trader", password="pass1234")
+        client = APIClient()
+        client.force_authenticate(user)
+        url = reverse("indicators")
+
+        response = client.get(
+            url,
+            {
+                "symbols": "aapl,MSFT",
+                "indicators": "sma:5,macd:3:6:4,rsi",
+                "start": "2024-01-03",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        payload = json.loads(response.content)["symbols"]
+        self.assertEqual(set(payload), {"AAPL", "MSFT"})
+
+        aapl = payload["AAPL"]
+        self.assertEqual(aapl["dates"][0], "2024-01-03")
+        self.assertEqual(len(aapl["close"]), 28)
+        # El calentamiento se calcula con las barras anteriores al rango
+        self.assertEqual(aapl["indicators"]["sma:5"][:3], [None, None, 12.0])
+        self.assertEqual(
+            set(aapl["indicators"]["macd:3:6:4"]), {"macd", "signal", "histogram"}
+        )
+        self.assertIsNone(aapl["indicators"]["rsi:14"][0])
+        self.assertEqual(payload["MSFT"]["indicators"]["rsi:14"][-1], 0.0)
+
+        for params in (
+            {"symbols": "AAPL"},
+            {"symbols": "AAPL", "indicators": "sma:0"},
+            {"symbols": "AAPL", "indicators": "sma", "end": "ayer"},
+        ):
+            self.assertEqual(
+                client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST
+            )
+        self.assertEqual(
+            APIClient().get(url, {"symbols": "AAPL", "indicators": "sma"}).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class EventStudyTests(PriceStoreFixturesMixin, TestCase):
+    """Tests para el estudio de eventos noticia-precio."""
+
+    def _event(
+        self, number, symbol, when, label=None, relevance="alta", canonical=None
+    ):
+        analysis = label and {
+            "sentiment_label": label,
+            "combined_score": 0.5 if label == "positivo" else -0.5,
+            "relevance": relevance,
+        }
+        return create_symbol_news(
+            number, symbol, when, analysis or None, canonical=canonical
+        )
+
+    def _seed(self):
+        self._prices("AAPL", [float(100 + i) for i in range(20)])
+        self._prices("SPY", [float(200 + 2 * i) for i in range(20)])
+        # Antes del cierre: la barra base es la del día anterior (2024-01-04)
+        first = self._event(1, "AAPL", datetime(2024, 1, 5, 14), "positivo")
+        # Tras el cierre: cuenta para el día siguiente, base 2024-01-05
+        self._event(2, "AAPL", datetime(2024, 1, 5, 22), "negativo", "baja")
+        # Sin barras posteriores: no entra en las estadísticas
+        self._event(3, "AAPL", datetime(2024, 1, 25, 14), "positivo")
+        # Sin análisis: no es un evento
+        self._event(4, "AAPL", datetime(2024, 1, 8, 14))
+        # Duplicada de la primera: no cuenta dos veces
+        self._event(
+            5, "AAPL", datetime(2024, 1, 5, 15), "positivo", canonical=first
+        )
+        # Símbolo con sólo duplicados: fuera del universo
+        self._event(6, "MSFT", datetime(2024, 1, 5, 15), "positivo", canonical=first)
+
+    def test_event_days_follow_new_york_close(self, delay):
+        """Test que el cierre de las 16:00 de Nueva York sigue el horario de verano."""
+        from .services.event_study import event_days
+
+        published = [
+            datetime(2024, 1, 5, 20, 30, tzinfo=dt_timezone.utc),  # 15:30 EST
+            datetime(2024, 1, 5, 21, 30, tzinfo=dt_timezone.utc),  # 16:30 EST
+            datetime(2024, 7, 1, 19, 30, tzinfo=dt_timezone.utc),  # 15:30 EDT
+            datetime(2024, 7, 1, 20, 30, tzinfo=dt_timezone.utc),  # 16:30 EDT
+        ]
+
+        days = event_days([int(when.timestamp()) for when in published])
+
+        self.assertEqual(
+            days.astype(str).tolist(),
+            ["2024-01-05", "2024-01-06", "2024-07-01", "2024-07-02"],
+        )
+
+    def test_alignment_and_returns(self, delay):
+        """Test de la alineación con las barras y los retornos por ventana."""
+        from .services.event_study import event_returns
+
+        self._seed()
+        frame = event_returns(["aapl"], windows=(1, 3), benchmark="spy")
+
+        self.assertEqual(len(frame), 3)
+        first, second, last = frame.to_dict("records")
+        self.assertEqual(first["base_date"].date(), date(2024, 1, 4))
+        self.assertEqual(second["base_date"].date(), date(2024, 1, 5))
+        self.assertAlmostEqual(first["ret_1"], 104 / 103 - 1)
+        self.assertAlmostEqual(first["ret_3"], 106 / 103 - 1)
+        self.assertAlmostEqual(second["ret_1"], 105 / 104 - 1)
+        self.assertAlmostEqual(first["abn_1"], (104 / 103 - 1) - (208 / 206 - 1))
+        self.assertTrue(np.isnan(last["ret_1"]))
+
+        # Sin benchmark: modelo de media constante sobre 2 barras previas
+        frame = event_returns(["AAPL"], windows=(1,), estimation=2)
+        mean = (102 / 101 - 1 + 103 / 102 - 1) / 2
+        self.assertAlmostEqual(frame["abn_1"][0], (104 / 103 - 1) - mean)
+
+    def test_endpoint_buckets_by_sentiment(self, delay):
+        """Test del endpoint: cubos por sentimiento y relevancia."""
+        from django.urls import reverse
+
+        self._seed()
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_user(username="trader", password="pass1234")
+        )
+        url = reverse("event_study")
+
+        response = client.get(
+            url, {"symbols": "AAPL", "windows": "1,3", "benchmark": "SPY"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data["events"], 3)
+        self.assertEqual(data["model"], "market_adjusted")
+        buckets = {
+            (b["sentiment_label"], b["relevance"]): b for b in data["buckets"]
+        }
+        self.assertEqual(set(buckets), {("negativo", "baja"), ("positivo", "alta")})
+        positive = buckets[("positivo", "alta")]
+        self.assertEqual(positive["events"], 2)
+        self.assertEqual(positive["returns"]["1"]["count"], 1)
+        self.assertEqual(positive["returns"]["1"]["hit_rate"], 1.0)
+        self.assertEqual(data["overall"]["returns"]["3"]["count"], 2)
+
+        response = client.get(
+            url,
+            {"symbols": "AAPL", "group_by": "sentiment_label", "until": "2024-01-05"},
+        )
+        self.assertEqual(
+            [b["sentiment_label"] for b in response.data["buckets"]],
+            ["negativo", "positivo"],
+        )
+        for params in (
+            {},
+            {"symbols": "AAPL", "windows": "0"},
+            {"symbols": "AAPL", "benchmark": "NOPE"},
+            {"symbols": "AAPL", "group_by": "publisher"},
+        ):
+            self.assertEqual(
+                client.get(url, params).status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_universe_command(self, delay):
+        """Test del comando por lotes sobre todo el universo."""
+        import os
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        self._seed()
+        out = StringIO()
+        csv_path = os.path.join(self.store_dir.name, "events.csv")
+        call_command(
+            "run_event_study", "--windows", "1", "--events-csv", csv_path, stdout=out
+        )
+
+        self.assertIn("3 eventos de 1 símbolos", out.getvalue())
+        self.assertIn("positivo / alta: 2 eventos", out.getvalue())
+        with open(csv_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 4)
+
+
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class PriceOverlayTests(PriceStoreFixturesMixin, TestCase):
+    """Tests para el endpoint combinado de precios y noticias del gráfico."""
+
+    def setUp(self):
+        """Configuración inicial para los tests."""
+        super().setUp()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="trader", password="pass1234")
+        self.client.force_authenticate(self.user)
+
+    def test_prices_and_snapped_markers(self, delay):
+        """Test de los marcadores anclados a las barras devueltas."""
+        # Semana del 1 al 5 y del 8 al 12 de enero: sin barras en fin de semana
+        self._prices("AAPL", [10.0, 11.0, 12.0, 13.0, 14.0])
+        self._prices("AAPL", [15.0, 16.0, 17.0, 18.0, 19.0], first=date(2024, 1, 8))
+        midweek = create_symbol_news(1, "AAPL", datetime(2024, 1, 3, 15))
+        create_analysis(midweek, sentiment_label="positivo")
+        weekend = create_symbol_news(2, "AAPL", datetime(2024, 1, 6, 12))
+        create_symbol_news(3, "AAPL", datetime(2024, 1, 6, 13), canonical=weekend)
+        create_symbol_news(4, "AAPL", datetime(2024, 1, 20, 12))
+
+        response = self.client.get(
+            "/api/historical-price/aapl/overlay/", {"start": "2024-01-02"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data["symbol"], "AAPL")
+        self.assertEqual(data["prices"][0]["date"], "2024-01-02")
+        self.assertEqual(len(data["prices"]), 9)
+        self.assertFalse(data["truncated"])
+        self.assertEqual(
+            [(n["uuid"], n["date"], n["sentiment_label"]) for n in data["news"]],
+            [
+                (str(midweek.uuid), "2024-01-03", "positivo"),
+                (str(weekend.uuid), "2024-01-08", None),
+            ],
+        )
+
+        response = self.client.get(
+            "/api/historical-price/AAPL/overlay/", {"max_markers": 1}
+        )
+        self.assertTrue(response.data["truncated"])
+        self.assertEqual(response.data["news"][0]["uuid"], str(weekend.uuid))
+        self.assertEqual(
+            self.client.get(
+                "/api/historical-price/AAPL/overlay/", {"end": "enero"}
+            ).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_etag_revalidation(self, delay):
+        """Test que If-None-Match devuelve 304 hasta que cambian las noticias."""
+        self._prices("AAPL", [10.0, 11.0, 12.0])
+        with self.captureOnCommitCallbacks(execute=True):
+            news = create_symbol_news(1, "AAPL", datetime(2024, 1, 2, 15))
+        url = "/api/historical-price/AAPL/overlay/"
+
+        first = self.client.get(url)
+        etag = first["ETag"]
+        self.assertIn("no-cache", first["Cache-Control"])
+
+        # Revalidar sólo consulta la secuencia de cambios
+        with self.assertNumQueries(1):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached.content, b"")
+
+        other = self.client.get(url, {"max_points": 3}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_analysis(news, sentiment_label="negativo")
+        updated = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(updated.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(updated["ETag"], etag)
+        self.assertEqual(updated.data["news"][0]["sentiment_label"], "negativo")
+
+
+class BacktestKernelTests(SimpleTestCase):
+    """Tests para la simulación vectorizada de estrategias."""
+
+    def _panel(self):
+        from .utils.backtesting import SignalPanel
+
+        return SignalPanel(
+            score=np.array([0.5, -0.6, 0.1, 0.4]),
+            relevance=np.array([2, 1, 2, 0], dtype=np.int8),
+            paths=np.array(
+                [
+                    [0.01, 0.03, -0.02],
+                    [-0.02, -0.01, 0.04],
+                    [0.05, 0.05, 0.05],
+                    [-0.06, 0.02, np.nan],
+                ]
+            ),
+            exit_days=np.array(
+                [[10, 11, 12], [11, 12, 13], [12, 13, 14], [13, 14, -1]],
+                dtype=np.int32,
+            ),
+        )
+
+    def test_entries_and_exits(self):
+        """Test de las reglas de entrada, cortos, stops y métricas."""
+        from .utils.backtesting import StrategyConfig, simulate
+
+        panel = self._panel()
+        result = simulate(panel, StrategyConfig(threshold=0.3, holding=2))
+        # Largo +0.03, corto +0.01; el evento de 0.1 no supera el umbral
+        self.assertEqual(result["trades"], 3)
+        self.assertAlmostEqual(result["pnl"], 0.03 + 0.01 + 0.02)
+        self.assertEqual(result["hit_rate"], 1.0)
+
+        result = simulate(
+            panel,
+            StrategyConfig(threshold=0.3, holding=3, stop_loss=0.05, cost=0.001),
+        )
+        # El último evento no tiene las 3 barras: no opera aunque toque el stop
+        self.assertEqual(result["trades"], 2)
+        self.assertAlmostEqual(result["pnl"], -0.02 - 0.04 - 0.002)
+        self.assertAlmostEqual(result["max_drawdown"], 0.062)
+        self.assertEqual(result["profit_factor"], 0.0)
+        unstopped = simulate(panel, StrategyConfig(threshold=0.3, holding=3))
+        self.assertEqual(unstopped["trades"], result["trades"])
+
+        result = simulate(
+            panel,
+            StrategyConfig(
+                threshold=0.3, holding=3, min_relevance="alta", allow_short=False
+            ),
+        )
+        self.assertEqual(result["trades"], 1)
+        with self.assertRaises(ValueError):
+            StrategyConfig(min_relevance="máxima")
+
+    def test_parallel_sweep_matches_serial(self):
+        """Test que el barrido en procesos da los mismos resultados."""
+        from .services.backtest import build_grid
+        from .utils.backtesting import sweep
+
+        configs = build_grid(
+            {
+                "threshold": [0.1, 0.3, 0.45, 0.55],
+                "holding": [1, 2, 3],
+                "stop_loss": [0, 0.03],
+                "take_profit": [0, 0.02],
+            }
+        )
+        self.assertEqual(len(configs), 48)
+        panel = self._panel()
+        self.assertEqual(sweep(panel, configs, workers=2), sweep(panel, configs))
+
+
+@mock.patch("sentiment_analysis.signals.analyze_news_title.delay")
+class BacktestCommandTests(PriceStoreFixturesMixin, TestCase):
+    """Tests del backtest sobre noticias y precios guardados."""
+
+    def test_grid_over_stored_data(self, delay):
+        """Test de la carga del panel y del comando con una rejilla."""
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from .services.backtest import load_signal_panel
+
+        self._prices("AAPL", [100.0, 102.0, 101.0, 105.0, 104.0])
+        positive = {"sentiment_label": "positivo", "combined_score": 0.5}
+        negative = {"sentiment_label": "negativo", "combined_score": -0.5}
+        # Antes del cierre del día 2: entra al cierre del día 2 (102)
+        create_symbol_news(1, "AAPL", datetime(2024, 1, 2, 15), positive)
+        # Tras el cierre del día 2: entra al cierre del día 3 (101)
+        create_symbol_news(2, "AAPL", datetime(2024, 1, 2, 22), negative)
+
+        panel = load_signal_panel(["AAPL"], max_holding=2)
+        self.assertEqual(panel.paths.shape, (2, 2))
+        self.assertAlmostEqual(panel.paths[0, 0], 101 / 102 - 1)
+        self.assertAlmostEqual(panel.paths[1, 1], 104 / 101 - 1)
+
+        out = StringIO()
+        call_command(
+            "backtest_sentiment",
+            "--threshold",
+            "0.3,0.6",
+            "--holding",
+            "1,2",
+            "--workers",
+            "1",
+            stdout=out,
+        )
+        output = out.getvalue()
+        self.assertIn("4 configuraciones sobre 2 eventos", output)
+        self.assertIn("umbral 0.3 | 2 barras", output)
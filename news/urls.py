@@ -4,7 +4,13 @@ from .views import (
     NewsView,
     StocksView,
     StockDetailView,
-    get_historical_prices
+    get_historical_prices,
+    get_resampled_prices,
+    PriceOverlayView,
+    news_stream,
+    NewsStreamTicketView,
+    IndicatorsView,
+    EventStudyView,
 )
 
 router = routers.DefaultRouter()
@@ -12,9 +18,28 @@ router.register(r"news", NewsView, basename="news")
 router.register(r"stocks", StocksView, basename="stocks")
 
 urlpatterns = [
+    # Antes del router para que "stream" no se tome como id de noticia
+    path("news/stream/", news_stream, name="news_stream"),
+    path(
+        "news/stream/ticket/",
+        NewsStreamTicketView.as_view(),
+        name="news_stream_ticket",
+    ),
     path("", include(router.urls)),
     path("new/", include(router.urls)),
     path("stock/<str:symbol>/", StockDetailView.as_view(), name="stock_detail"),
-    path("historical-price/<str:symbol>/", get_historical_prices, name="historical_prices")
+    path("historical-price/<str:symbol>/", get_historical_prices, name="historical_prices"),
+    path(
+        "historical-price/<str:symbol>/resample/",
+        get_resampled_prices,
+        name="resampled_prices",
+    ),
+    path(
+        "historical-price/<str:symbol>/overlay/",
+        PriceOverlayView.as_view(),
+        name="price_overlay",
+    ),
+    path("indicators/", IndicatorsView.as_view(), name="indicators"),
+    path("event-study/", EventStudyView.as_view(), name="event_study"),
     
 ]
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+Simulación vectorizada de estrategias por señales de noticias.
+
+Las señales se cargan una vez en un ``SignalPanel``: por evento, su
+puntuación, su relevancia y la matriz de retornos desde el cierre de entrada
+hasta el cierre de cada una de las ``H`` barras siguientes. Simular una
+configuración es entonces una selección de filas y un ``argmax`` sobre la
+matriz para encontrar la salida (fin del periodo, stop loss o take profit),
+sin bucles por operación ni por símbolo.
+
+Cada operación invierte el mismo nominal, así que el PnL es la suma de sus
+retornos netos de costes; el drawdown se mide sobre esa curva ordenada por
+fecha de salida.
+
+El módulo sólo depende de NumPy para que ``sweep`` pueda repartir una
+rejilla de configuraciones entre procesos, que reciben el panel una vez al
+arrancar.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+RELEVANCE_LEVELS = ("baja", "media", "alta")
+MAX_HOLDING = 60
+# Por debajo de este número de configuraciones arrancar procesos no compensa
+PARALLEL_MIN_CONFIGS = 32
+
+
+@dataclass(frozen=True)
+class SignalPanel:
+    """
+    Eventos alineados con los precios.
+
+    ``paths[e, k]`` es el retorno del cierre de entrada al cierre ``k + 1``
+    barras después (``NaN`` si la serie no llega) y ``exit_days[e, k]`` el día
+    (días desde el epoch) de esa barra.
+    """
+
+    score: np.ndarray
+    relevance: np.ndarray
+    paths: np.ndarray
+    exit_days: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    @property
+    def max_holding(self) -> int:
+        return self.paths.shape[1]
+
+
+@dataclass(frozen=True)
+class StrategyConfig:
+    """
+    Reglas de entrada y salida.
+
+    Se entra en largo si ``combined_score >= threshold`` y en corto si
+    ``combined_score <= -threshold`` (con ``allow_short``), sólo para
+    noticias con relevancia ``min_relevance`` o mayor. Se sale tras
+    ``holding`` barras o antes si el retorno cruza ``-stop_loss`` o
+    ``take_profit`` (0 los desactiva). ``cost`` es el coste de ida y vuelta
+    en tanto por uno.
+    """
+
+    threshold: float = 0.2
+    holding: int = 5
+    min_relevance: str = "baja"
+    stop_loss: float = 0.0
+    take_profit: float = 0.0
+    allow_short: bool = True
+    cost: float = 0.0
+
+    def __post_init__(self):
+        if not 0 < self.threshold <= 1:
+            raise ValueError("El umbral debe estar entre 0 (excluido) y 1")
+        if not 1 <= self.holding <= MAX_HOLDING:
+            raise ValueError(f"El periodo debe estar entre 1 y {MAX_HOLDING} barras")
+        if self.min_relevance not in RELEVANCE_LEVELS:
+            raise ValueError(
+                f"Relevancia inválida: usa {', '.join(RELEVANCE_LEVELS)}"
+            )
+        if self.stop_loss < 0 or self.take_profit < 0 or self.cost < 0:
+            raise ValueError("Stop loss, take profit y coste no pueden ser negativos")
+
+
+def relevance_levels(values: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Nivel ordinal de cada relevancia (las desconocidas cuentan como ``baja``)
+    """
+    levels = {name: level for level, name in enumerate(RELEVANCE_LEVELS)}
+    return np.array([levels.get(value, 0) for value in values], dtype=np.int8)
+
+
+def entry_paths(
+    close: np.ndarray, dates: np.ndarray, entry: np.ndarray, max_holding: int
+):
+    """
+    Matrices de retornos y días de salida para entradas en ``close[entry]``
+    (``entry == len(close)``: sin barra de entrada, todo ``NaN``)
+    """
+    close = np.asarray(close, dtype=float)
+    offsets = entry[:, None] + np.arange(1, max_holding + 1)
+    valid = offsets < len(close)
+    safe = np.where(valid, offsets, 0)
+    base = close[np.minimum(entry, len(close) - 1)][:, None]
+    paths = np.where(valid, close[safe] / base - 1, np.nan)
+    days = np.where(valid, dates[safe].astype(np.int64), -1).astype(np.int32)
+    return paths, days
+
+
+def trade_returns(panel: SignalPanel, config: StrategyConfig):
+    """
+    Retornos netos y días de salida de las operaciones de ``config``; los
+    eventos cuya ventana de ``holding`` barras no está completa no operan
+    """
+    if config.holding > panel.max_holding:
+        raise ValueError(
+            f"El panel sólo cubre {panel.max_holding} barras tras la entrada"
+        )
+    score = panel.score
+    # Sólo eventos con las ``holding`` barras disponibles: si no, entre los
+    # recientes sobrevivirían justo los que tocan el stop o el objetivo
+    selected = (
+        (np.abs(score) >= config.threshold)
+        & (panel.relevance >= RELEVANCE_LEVELS.index(config.min_relevance))
+        & ~np.isnan(panel.paths[:, config.holding - 1])
+    )
+    if not config.allow_short:
+        selected &= score > 0
+    rows = np.flatnonzero(selected)
+
+    side = np.sign(score[rows])[:, None]
+    paths = panel.paths[rows, : config.holding] * side
+    exits = np.full(len(rows), config.holding - 1)
+    hit = np.zeros(paths.shape, dtype=bool)
+    if config.stop_loss:
+        hit |= paths <= -config.stop_loss
+    if config.take_profit:
+        hit |= paths >= config.take_profit
+    stopped = hit.any(axis=1)
+    exits[stopped] = hit[stopped].argmax(axis=1)
+
+    returns = paths[np.arange(len(rows)), exits] - config.cost
+    return returns, panel.exit_days[rows, exits]
+
+
+def performance(returns: np.ndarray, exit_days: np.ndarray) -> Dict[str, Any]:
+    """
+    PnL total y medio, tasa de acierto, drawdown máximo y profit factor
+    """
+    count = len(returns)
+    if not count:
+        return {
+            "trades": 0,
+            "pnl": 0.0,
+            "avg_return": None,
+            "hit_rate": None,
+            "max_drawdown": 0.0,
+            "profit_factor": None,
+        }
+    equity = np.cumsum(returns[np.argsort(exit_days, kind="stable")])
+    peak = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+    gains = float(returns[returns > 0].sum())
+    losses = float(-returns[returns < 0].sum())
+    return {
+        "trades": count,
+        "pnl": float(equity[-1]),
+        "avg_return": float(returns.mean()),
+        "hit_rate": float((returns > 0).mean()),
+        "max_drawdown": float((peak - equity).max()),
+        "profit_factor": gains / losses if losses else None,
+    }
+
+
+def simulate(panel: SignalPanel, config: StrategyConfig) -> Dict[str, Any]:
+    """
+    Configuración y métricas de ``config`` sobre ``panel``
+    """
+    return {**asdict(config), **performance(*trade_returns(panel, config))}
+
+
+_worker_panel: Optional[SignalPanel] = None
+
+
+def _init_worker(panel: SignalPanel) -> None:
+    global _worker_panel
+    _worker_panel = panel
+
+
+def _simulate_in_worker(config: StrategyConfig) -> Dict[str, Any]:
+    return simulate(_worker_panel, config)
+
+
+def sweep(
+    panel: SignalPanel, configs: Sequence[StrategyConfig], workers: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Simula todas las ``configs``; con ``workers > 1`` se reparten entre
+    procesos que reciben el panel una sola vez
+    """
+    if workers <= 1 or len(configs) < PARALLEL_MIN_CONFIGS:
+        return [simulate(panel, config) for config in configs]
+    workers = min(workers, len(configs))
+    chunksize = max(1, math.ceil(len(configs) / (workers * 4)))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(panel,)
+    ) as executor:
+        return list(executor.map(_simulate_in_worker, configs, chunksize=chunksize))
@@ -0,0 +1,55 @@
+"""
+Campos parciales de la API: ``?fields=a,b`` para pedir sólo esos campos y
+``?exclude=c`` para omitirlos.
+"""
+
+from typing import Iterable, Optional, Set
+
+from rest_framework.exceptions import ValidationError
+
+
+def parse_fieldset(query_params, available: Iterable[str]) -> Optional[Set[str]]:
+    """
+    Campos pedidos con ``?fields=a,b`` o excluidos con ``?exclude=c``.
+
+    Devuelve ``None`` si no se pidió ningún subconjunto y lanza
+    ``ValidationError`` (400) si algún nombre no existe.
+    """
+    available = list(available)
+    requested = {
+        param: {name.strip() for name in query_params.get(param, "").split(",") if name.strip()}
+        for param in ("fields", "exclude")
+    }
+    if not requested["fields"] and not requested["exclude"]:
+        return None
+
+    unknown = (requested["fields"] | requested["exclude"]) - set(available)
+    if unknown:
+        raise ValidationError(
+            {
+                "fields": f"Campos desconocidos: {', '.join(sorted(unknown))}. "
+                f"Disponibles: {', '.join(available)}"
+            }
+        )
+
+    selected = requested["fields"] or set(available)
+    return selected - requested["exclude"]
+
+
+class SparseFieldsetMixin:
+    """
+    Limita los campos del serializer a ``?fields=`` / ``?exclude=`` de la
+    petición del contexto
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None:
+            return
+        selected = parse_fieldset(request.query_params, self.fields.keys())
+        if selected is None:
+            return
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
@@ -1,5 +1,9 @@
 import math
-from datetime import datetime
+from datetime import datetime, timezone as dt_timezone
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
 
 
 def sanitize_floats(obj):
@@ -44,3 +48,50 @@ def parse_date(date_str: str):
         except ValueError:
             return None
     return None
+
+
+def parse_day_param(query_params, param: str):
+    """
+    Fecha ``YYYY-MM-DD`` de un parámetro de consulta, o ``None`` si no viene;
+    lanza ``ValueError`` si el formato no es válido
+    """
+    value = query_params.get(param)
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(f"{param} debe tener formato YYYY-MM-DD")
+    return day
+
+
+def parse_time_param(query_params, param: str):
+    """
+    Fecha de un parámetro de consulta en ISO 8601 o epoch (segundos).
+
+    Devuelve ``None`` si falta y lanza ``ValidationError`` (400) si no es válida.
+    """
+    value = query_params.get(param)
+    if not value:
+        return None
+    error = ValidationError({param: "Fecha inválida: usa ISO 8601 o epoch en segundos"})
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = None
+    if seconds is not None:
+        # Epochs fuera del rango de datetime (1e20, inf, nan)
+        try:
+            return datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            raise error
+    try:
+        # parse_datetime lanza ValueError si el formato es válido pero la
+        # fecha no existe (2024-02-30)
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise error
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
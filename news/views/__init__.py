@@ -1,4 +1,23 @@
 from .news_views import NewsView
-from .stock_views import StocksView, StockDetailView, get_historical_prices
+from .stock_views import (
+    StocksView,
+    StockDetailView,
+    get_historical_prices,
+    get_resampled_prices,
+    PriceOverlayView,
+)
+from .stream_views import news_stream, NewsStreamTicketView
+from .analytics_views import IndicatorsView, EventStudyView
 
-__all__ = ["NewsView", "StocksView", "StockDetailView", "get_historical_prices"]
+__all__ = [
+    "NewsView",
+    "StocksView",
+    "StockDetailView",
+    "get_historical_prices",
+    "get_resampled_prices",
+    "PriceOverlayView",
+    "news_stream",
+    "NewsStreamTicketView",
+    "IndicatorsView",
+    "EventStudyView",
+]
@@ -0,0 +1,96 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..services.event_study import run_event_study
+from ..services.indicators import compute_indicators
+from ..utils.helpers import parse_day_param
+
+# Límites por petición del endpoint de indicadores
+MAX_INDICATOR_SYMBOLS = 20
+MAX_INDICATORS = 10
+# Símbolos por petición del estudio de eventos; el universo completo se
+# calcula con ``python manage.py run_event_study``
+MAX_EVENT_STUDY_SYMBOLS = 50
+
+
+def _split(value):
+    return [item for item in (value or "").split(",") if item.strip()]
+
+
+class IndicatorsView(APIView):
+    """
+    Indicadores técnicos de uno o varios símbolos en una sola petición.
+
+    ``?symbols=AAPL,MSFT&indicators=sma:50,rsi:14,macd:12:26:9`` con
+    ``?start=`` y ``?end=`` opcionales (YYYY-MM-DD). Disponibles: ``sma``,
+    ``ema``, ``rsi``, ``macd``, ``bbands``, ``atr``, ``vwap`` y ``rvol``. Las
+    series se devuelven en columnas alineadas con ``dates``.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        symbols = _split(request.query_params.get("symbols"))
+        specs = _split(request.query_params.get("indicators"))
+        if not symbols or not specs:
+            return Response(
+                {"error": "Los parámetros symbols e indicators son requeridos"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(symbols) > MAX_INDICATOR_SYMBOLS or len(specs) > MAX_INDICATORS:
+            return Response(
+                {
+                    "error": f"Máximo {MAX_INDICATOR_SYMBOLS} símbolos y "
+                    f"{MAX_INDICATORS} indicadores por petición"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            start = parse_day_param(request.query_params, "start")
+            end = parse_day_param(request.query_params, "end")
+            data = compute_indicators(symbols, specs, start, end)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"symbols": data}, status=status.HTTP_200_OK)
+
+
+class EventStudyView(APIView):
+    """
+    Estudio de eventos noticia-precio de uno o varios símbolos.
+
+    ``?symbols=AAPL,MSFT`` con ``?windows=`` (barras, por defecto 1,3,5,10),
+    ``?benchmark=`` (retornos anormales frente al benchmark en lugar del
+    modelo de media constante), ``?since=``/``?until=`` (YYYY-MM-DD) y
+    ``?group_by=sentiment_label,relevance``.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        symbols = _split(request.query_params.get("symbols"))
+        if not symbols:
+            return Response(
+                {"error": "El parámetro symbols es requerido"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(symbols) > MAX_EVENT_STUDY_SYMBOLS:
+            return Response(
+                {"error": f"Máximo {MAX_EVENT_STUDY_SYMBOLS} símbolos por petición"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            data = run_event_study(
+                symbols,
+                windows=request.query_params.get("windows"),
+                benchmark=request.query_params.get("benchmark") or None,
+                since=parse_day_param(request.query_params, "since"),
+                until=parse_day_param(request.query_params, "until"),
+                group_by=request.query_params.get("group_by"),
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data, status=status.HTTP_200_OK)
@@ -0,0 +1,52 @@
+from ..utils.fieldsets import parse_fieldset
+
+
+class SparseFieldsetViewMixin:
+    """
+    Traduce ``?fields=`` / ``?exclude=`` a ``.defer()`` sobre el queryset, así
+    la base de datos tampoco lee las columnas que el cliente no pidió.
+
+    ``sparse_required_fields`` son columnas que la vista necesita aunque no se
+    devuelvan (p. ej. las de ordenación de la paginación por cursor).
+    """
+
+    sparse_required_fields = ()
+
+    def get_sparse_fields(self):
+        """
+        Campos del serializer pedidos, o ``None`` si se piden todos
+        """
+        serializer = self.get_serializer_class()()
+        return parse_fieldset(self.request.query_params, serializer.fields.keys())
+
+    def apply_sparse_fieldset(self, queryset):
+        selected = self.get_sparse_fields()
+        if selected is None:
+            return queryset
+
+        serializer = self.get_serializer_class()()
+        model_fields = {
+            f.name: f for f in queryset.model._meta.concrete_fields if not f.primary_key
+        }
+        deferred = set()
+        dropped_relations = set()
+        for name, field in serializer.fields.items():
+            if name in selected:
+                continue
+            source = field.source.split(".")[0]
+            if source in model_fields and source not in self.sparse_required_fields:
+                deferred.add(source)
+            else:
+                dropped_relations.add(source)
+
+        # Las columnas que sigue usando un campo pedido no se difieren
+        for name in selected:
+            deferred.discard(serializer.fields[name].source.split(".")[0])
+
+        related = queryset.query.select_related
+        if isinstance(related, dict) and dropped_relations & set(related):
+            keep = [path for path in related if path not in dropped_relations]
+            queryset = queryset.select_related(None)
+            if keep:
+                queryset = queryset.select_related(*keep)
+        return queryset.defer(*deferred) if deferred else queryset
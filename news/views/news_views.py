@@ -3,37 +3,114 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
-from ..models import New
-from ..serializers import NewsSerializer
-from ..services import fetch_and_save_news
+from django.urls import reverse
+from celery.result import AsyncResult
+from ..models import IngestionJob, New, NewsTicker
+from ..pagination import NewsPagination, NewsTickerPagination, RankedPagination
+from ..serializers import NewsSerializer, NewsValuesSerializer
+from ..services.change_feed import read_changes
+from ..services.search import fetch_ranked, search_news
+from ..tasks import ingest_news_for_symbol
+from ..utils.helpers import parse_time_param
+from .mixins import SparseFieldsetViewMixin
 import logging
+import math
 
 logger = logging.getLogger(__name__)
 
-class NewsView(viewsets.ModelViewSet):
+# Segundos que los clientes esperan antes de volver a consultar un job en
+# curso (Retry-After); la vista responde en seguida, sin retener el worker
+JOB_RETRY_AFTER = 2
+
+class NewsView(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
-    ViewSet para gestionar noticias
+    ViewSet para gestionar noticias.
+
+    Listado y detalle admiten ``?fields=`` / ``?exclude=``.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = NewsSerializer
+    pagination_class = NewsPagination
+    # Columnas de ordenación de la paginación por cursor
+    sparse_required_fields = ("published_at",)
     queryset = (
         New.objects.all()
         .select_related("analysis")
         .order_by("-provider_publish_time")
     )
     
+    def _hide_duplicates(self):
+        include_duplicates = self.request.query_params.get('include_duplicates', '')
+        return include_duplicates.lower() not in ('true', '1')
+
+    def _parse_time(self, param):
+        return parse_time_param(self.request.query_params, param)
+
     def get_queryset(self):
         """
-        Personalizar queryset según filtros
+        Personalizar queryset según filtros.
+
+        En el listado admite ``?since=`` y ``?until=`` (ISO 8601 o epoch),
+        ``?sentiment=``, ``?relevance=`` y ``?symbol=``. Los casi duplicados
+        se ocultan salvo que se pida ``?include_duplicates=true``.
         """
         queryset = super().get_queryset()
-        
+
+        if self.action == 'retrieve':
+            return self.apply_sparse_fieldset(queryset)
+        if self.action != 'list':
+            return queryset
+
+        if self._hide_duplicates():
+            queryset = queryset.filter(canonical__isnull=True)
+
+        params = self.request.query_params
+        since = self._parse_time('since')
+        until = self._parse_time('until')
+        if since:
+            queryset = queryset.filter(published_at__gte=since)
+        if until:
+            queryset = queryset.filter(published_at__lt=until)
+
+        symbol = params.get('symbol', '').strip().upper()
+        if symbol:
+            # Un único filter() para que símbolo y rango usen el mismo join
+            # y el índice (symbol, publish_time) de NewsTicker
+            ticker_filter = {'tickers__symbol': symbol}
+            if since:
+                ticker_filter['tickers__publish_time__gte'] = int(since.timestamp())
+            if until:
+                ticker_filter['tickers__publish_time__lt'] = math.ceil(until.timestamp())
+            queryset = queryset.filter(**ticker_filter)
+
+        sentiment = params.get('sentiment', '').strip().lower()
+        if sentiment:
+            queryset = queryset.filter(analysis__sentiment_label=sentiment)
+        relevance = params.get('relevance', '').strip().lower()
+        if relevance:
+            queryset = queryset.filter(analysis__relevance=relevance)
+
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        """
+        Listado paginado con la serialización rápida basada en ``.values()``
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = NewsValuesSerializer(
+            fields=self.get_sparse_fields(),
+            required_columns=[name.lstrip("-") for name in NewsPagination.ordering],
+        )
+        page = self.paginate_queryset(serializer.values(queryset))
+        return self.get_paginated_response(serializer.serialize(page))
+
     @action(detail=False, methods=['post'], url_path='fetch-by-symbol')
     def fetch_by_symbol(self, request):
         """
-        Endpoint para buscar y guardar noticias por símbolo
+        Endpoint para buscar y guardar noticias por símbolo.
+
+        Encola la ingesta en Celery y responde ``202`` con el id del job,
+        consultable en ``jobs/<job_id>/``.
         """
         symbol = request.data.get('symbol', '').strip().upper()
         news_count = request.data.get('news_count', 10)
@@ -57,31 +134,126 @@ class NewsView(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        job = ingest_news_for_symbol.delay(symbol, news_count)
+        IngestionJob.objects.create(job_id=job.id, user=request.user, symbol=symbol)
+        logger.info(f"Ingesta de noticias encolada para {symbol}: {job.id}")
+
+        return Response({
+            'message': f'Proceso encolado para {symbol}',
+            'symbol': symbol,
+            'job_id': job.id,
+            'status_url': request.build_absolute_uri(
+                reverse('news-job-status', kwargs={'job_id': job.id})
+            ),
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'], url_path='jobs/(?P<job_id>[^/.]+)')
+    def job_status(self, request, job_id=None):
+        """
+        Estado y resultado de un job de ingesta encolado por el usuario.
+
+        Los jobs de otros usuarios y los ids desconocidos responden ``404``.
+        Mientras el job no termina la respuesta lleva ``Retry-After`` con los
+        segundos hasta la siguiente consulta.
+        """
+        if not IngestionJob.objects.filter(job_id=job_id, user=request.user).exists():
+            return Response(
+                {'error': 'Job no encontrado'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        job = AsyncResult(job_id)
+        payload = {
+            'job_id': job_id,
+            'status': job.status,
+            'ready': job.ready(),
+            'result': None,
+        }
+        if job.successful():
+            payload['result'] = job.result
+        elif job.failed():
+            # El detalle de la excepción sólo va al log
+            logger.error(f"Ingesta {job_id} fallida: {job.result!r}")
+            payload['error'] = 'La ingesta de noticias ha fallado'
+
+        response = Response(payload, status=status.HTTP_200_OK)
+        if not payload['ready']:
+            response['Retry-After'] = str(JOB_RETRY_AFTER)
+        return response
+
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request):
+        """
+        Sincronización incremental del listado de noticias.
+
+        Devuelve las noticias creadas o modificadas (incluido su análisis)
+        después de ``?since=<cursor>``, los uuids borrados en ``deleted`` y el
+        cursor para la siguiente consulta. Sin ``since`` empieza desde el
+        principio; si ``has_more`` es cierto hay que volver a pedir en seguida.
+        Si el cursor es anterior a los cambios conservados responde 410 con
+        ``resync_required``: hay que recargar el listado y seguir desde
+        ``next_cursor``.
+        """
         try:
-            # Usar el servicio para buscar y guardar noticias
-            result = fetch_and_save_news(symbol, news_count)
-            
-            return Response({
-                'message': f'Proceso completado para {symbol}',
-                'symbol': symbol,
-                'total_fetched': result['total_fetched'],
-                'total_saved': result['total_saved'],
-                'total_updated': result['total_updated'],
-                'news': NewsSerializer(result['news_objects'], many=True).data
-            }, status=status.HTTP_200_OK)
-            
-        except ValueError as e:
-            logger.warning(f"Error de validación al buscar noticias para {symbol}: {e}")
+            since = int(request.query_params.get('since', 0))
+            limit = int(request.query_params.get('limit', 500))
+        except ValueError:
             return Response(
-                {'error': str(e)},
+                {'error': 'Los parámetros since y limit deben ser enteros'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        except Exception as e:
-            logger.error(f"Error inesperado al buscar noticias para {symbol}: {e}")
+
+        feed = read_changes(
+            since, limit=limit, include_duplicates=not self._hide_duplicates()
+        )
+        if feed.get('resync_required'):
             return Response(
-                {'error': 'Error interno del servidor'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {
+                    'error': 'El cursor es demasiado antiguo, recarga el listado',
+                    'resync_required': True,
+                    'next_cursor': feed['next_cursor'],
+                },
+                status=status.HTTP_410_GONE
             )
+        serializer = self.get_serializer(feed['news'], many=True)
+        return Response({
+            'next_cursor': feed['next_cursor'],
+            'has_more': feed['has_more'],
+            'news': serializer.data,
+            'deleted': feed['deleted'],
+        })
+
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """
+        Búsqueda de texto completo en los titulares.
+
+        ``?q=`` es obligatorio; admite ``?symbol=``, ``?since=``, ``?until=``,
+        ``?page=`` y ``?page_size=``. Los resultados van ordenados por
+        relevancia (``rank``) y, a igualdad, por fecha.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'El parámetro q es requerido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        paginator = RankedPagination(request)
+        ranked = paginator.paginate(search_news(
+            query,
+            symbol=request.query_params.get('symbol', '').strip(),
+            since=self._parse_time('since'),
+            until=self._parse_time('until'),
+            include_duplicates=not self._hide_duplicates(),
+            limit=paginator.limit,
+            offset=paginator.offset,
+        ))
+        news = fetch_ranked(New, ranked, New.objects.select_related('analysis'))
+        data = self.get_serializer(news, many=True).data
+        for item, obj in zip(data, news):
+            item['rank'] = obj.rank
+        return paginator.get_paginated_response(data)
 
     @action(detail=False, methods=['get'], url_path='by-symbol/(?P<symbol>[^/.]+)')
     def get_by_symbol(self, request, symbol=None):
@@ -95,15 +267,21 @@ class NewsView(viewsets.ModelViewSet):
             )
         
         symbol = symbol.upper()
-        
-        # Filtrar noticias que contengan el símbolo en related_tickers
-        queryset = self.get_queryset().filter(
-            related_tickers__icontains=symbol
+
+        # Coincidencia exacta por la tabla normalizada NewsTicker: la página
+        # es un recorrido del índice (symbol, publish_time)
+        tickers = NewsTicker.objects.filter(symbol=symbol).select_related(
+            'news', 'news__analysis'
         )
-        
-        serializer = self.get_serializer(queryset, many=True)
+        if self._hide_duplicates():
+            tickers = tickers.filter(news__canonical__isnull=True)
+
+        paginator = NewsTickerPagination()
+        page = paginator.paginate_queryset(tickers, request, view=self)
+        serializer = self.get_serializer([row.news for row in page], many=True)
         return Response({
             'symbol': symbol,
-            'count': queryset.count(),
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
             'news': serializer.data
-        })
\ No newline at end of file
+        })
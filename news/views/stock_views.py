@@ -1,34 +1,65 @@
 from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from ..models import Stock, HistoricalPrice
+from ..models import Stock
+from ..pagination import StockPagination
 from ..serializers import StocksSerializer
-from ..utils.helpers import sanitize_floats
+from ..renderers import FastJSONEncoder
+from ..services.chart_overlay import (
+    OVERLAY_DEFAULT_MAX_MARKERS,
+    OVERLAY_MAX_MARKERS,
+    chart_overlay,
+    overlay_etag,
+)
+from ..services.price_series import resampled_records
+from ..services.price_store import get_price_series
+from ..utils.helpers import parse_day_param
+from .mixins import SparseFieldsetViewMixin
 
+# Barras devueltas por get_historical_prices si no se pide ?max_points=, y
+# límites aceptados
+HISTORICAL_DEFAULT_MAX_POINTS = 1000
+HISTORICAL_MIN_POINTS = 3
+HISTORICAL_MAX_POINTS = 5000
 
-class StocksView(viewsets.ModelViewSet):
+
+class StocksView(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     """
-    ViewSet para gestionar stocks
+    ViewSet para gestionar stocks (admite ``?fields=`` / ``?exclude=``)
     """
     permission_classes = [IsAuthenticated]
     serializer_class = StocksSerializer
+    pagination_class = StockPagination
+    sparse_required_fields = ("symbol",)
     queryset = Stock.objects.all()
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        data = serializer.data
-        clean_data = sanitize_floats(data)
-        return Response(clean_data, status=status.HTTP_200_OK)
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve", "search"):
+            queryset = self.apply_sparse_fieldset(queryset)
+        return queryset
 
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        data = serializer.data
-        clean_data = sanitize_floats(data)
-        return Response(clean_data, status=status.HTTP_200_OK)
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """
+        Stocks cuyo símbolo empieza por ``?q=`` (obligatorio), paginados por
+        cursor como el listado
+        """
+        query = request.query_params.get("q", "").strip().upper()
+        if not query:
+            return Response(
+                {"error": "El parámetro q es requerido"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        page = self.paginate_queryset(
+            self.get_queryset().filter(symbol__istartswith=query)
+        )
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
 
 
 class StockDetailView(APIView):
@@ -46,28 +77,105 @@ class StockDetailView(APIView):
             )
         
         serializer = StocksSerializer(stock)
-        data = serializer.data
-        clean_data = sanitize_floats(data)
-        return Response(clean_data, status=status.HTTP_200_OK)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+def _price_range_params(query_params):
+    """
+    ``start``, ``end`` y ``max_points`` de los endpoints de precios; lanza
+    ``ValueError`` con el mensaje para el cliente si alguno no es válido
+    """
+    start = parse_day_param(query_params, "start")
+    end = parse_day_param(query_params, "end")
+    raw = query_params.get("max_points")
+    if raw is None:
+        return start, end, HISTORICAL_DEFAULT_MAX_POINTS
+    try:
+        max_points = int(raw)
+    except ValueError:
+        max_points = None
+    if max_points is None or not (
+        HISTORICAL_MIN_POINTS <= max_points <= HISTORICAL_MAX_POINTS
+    ):
+        raise ValueError(
+            f"max_points debe ser un entero entre {HISTORICAL_MIN_POINTS} "
+            f"y {HISTORICAL_MAX_POINTS}"
+        )
+    return start, end, max_points
 
 
 def get_historical_prices(request, symbol):
     """
-    Obtiene precios históricos de un stock
+    Obtiene precios históricos de un stock.
+
+    ``?start=`` y ``?end=`` (YYYY-MM-DD, incluidos) acotan el rango y
+    ``?max_points=`` (entre ``HISTORICAL_MIN_POINTS`` y
+    ``HISTORICAL_MAX_POINTS``, por defecto ``HISTORICAL_DEFAULT_MAX_POINTS``)
+    limita las barras devueltas: las series más largas se reducen con LTTB
+    sobre el cierre, conservando la forma del gráfico. Fuera de rango responde
+    400.
+    """
+    try:
+        start, end, max_points = _price_range_params(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    series = get_price_series(symbol, start, end).downsample(max_points)
+    return JsonResponse(series.to_records(), safe=False, encoder=FastJSONEncoder)
+
+
+
+def get_resampled_prices(request, symbol):
     """
-    datos = HistoricalPrice.objects.filter(
-        symbol=symbol.upper()
-    ).order_by("date")
-    
-    respuesta = [
-        {
-            "date": dato.date.isoformat(),
-            "open": dato.open,
-            "high": dato.high,
-            "low": dato.low,
-            "close": dato.close,
-            "volume": dato.volume,
-        }
-        for dato in datos
-    ]
-    return JsonResponse(respuesta, safe=False)
\ No newline at end of file
+    Velas OHLCV agregadas en el servidor.
+
+    ``?interval=`` admite ``1wk``, ``1mo``, ``3mo``, ``1y`` o ``<N>d`` (por
+    defecto ``1wk``); ``?start=`` y ``?end=`` (YYYY-MM-DD) filtran por la
+    fecha de cada vela.
+    """
+    try:
+        start = parse_day_param(request.GET, "start")
+        end = parse_day_param(request.GET, "end")
+        records = resampled_records(
+            symbol, request.GET.get("interval", "1wk"), start, end
+        )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return JsonResponse(records, safe=False, encoder=FastJSONEncoder)
+
+
+class PriceOverlayView(APIView):
+    """
+    Precios y noticias de un símbolo para el gráfico en una sola petición.
+
+    Admite ``?start=``, ``?end=`` y ``?max_points=`` como
+    ``get_historical_prices`` y ``?max_markers=`` (por defecto
+    ``OVERLAY_DEFAULT_MAX_MARKERS``). Cada noticia lleva su sentimiento y la
+    fecha de la barra en la que se dibuja. La respuesta lleva ``ETag``: con
+    ``If-None-Match`` se responde 304 sin leer precios ni noticias.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, symbol):
+        try:
+            start, end, max_points = _price_range_params(request.query_params)
+            max_markers = int(
+                request.query_params.get("max_markers", OVERLAY_DEFAULT_MAX_MARKERS)
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        max_markers = max(0, min(max_markers, OVERLAY_MAX_MARKERS))
+
+        series = get_price_series(symbol)
+        etag = quote_etag(
+            overlay_etag(symbol, series, start, end, max_points, max_markers)
+        )
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is None:
+            data = chart_overlay(series, start, end, max_points, max_markers)
+            response = Response(data, status=status.HTTP_200_OK)
+        else:
+            response = not_modified
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import logging
+import secrets
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from ..services.event_bus import get_event_bus
+
+logger = logging.getLogger(__name__)
+
+# Reintento sugerido al EventSource del navegador si se corta la conexión (ms)
+STREAM_RETRY_MS = 5000
+
+
+# Validez (s) de los tickets de /api/news/stream/ticket/
+STREAM_TICKET_MAX_AGE = 30
+STREAM_TICKET_SALT = "news.stream.ticket"
+
+
+def issue_stream_ticket(user) -> str:
+    """
+    Ticket firmado, de un solo uso y corta duración para abrir el stream
+    """
+    # El nonce distingue tickets emitidos en el mismo segundo
+    return signing.dumps(
+        {"user": user.pk, "nonce": secrets.token_hex(8)}, salt=STREAM_TICKET_SALT
+    )
+
+
+def _redeem_stream_ticket(ticket: str):
+    """
+    Usuario del ticket, o ``None`` si no es válido, caducó o ya se usó
+    """
+    try:
+        payload = signing.loads(
+            ticket, salt=STREAM_TICKET_SALT, max_age=STREAM_TICKET_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    key = "news-stream-ticket:" + hashlib.sha256(ticket.encode()).hexdigest()
+    if not cache.add(key, True, STREAM_TICKET_MAX_AGE):
+        return None
+    return (
+        get_user_model().objects.filter(pk=payload.get("user"), is_active=True).first()
+    )
+
+
+async def _authenticate(request):
+    """
+    Autentica con JWT desde la cabecera Authorization o con un ticket de
+    ``/api/news/stream/ticket/`` en ``?ticket=``, ya que ``EventSource`` no
+    permite enviar cabeceras. El JWT nunca viaja en la URL, que acaba en los
+    logs de acceso.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if raw_token is None:
+        ticket = request.GET.get("ticket")
+        if not ticket:
+            return None
+        return await sync_to_async(_redeem_stream_ticket)(ticket)
+    try:
+        validated = auth.get_validated_token(raw_token)
+        return await sync_to_async(auth.get_user)(validated)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+class NewsStreamTicketView(APIView):
+    """
+    Emite el ticket con el que un ``EventSource`` abre el stream de noticias
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response(
+            {
+                "ticket": issue_stream_ticket(request.user),
+                "expires_in": STREAM_TICKET_MAX_AGE,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class EventStream:
+    """
+    Iterador asíncrono del cuerpo SSE.
+
+    Expone ``close()`` para que Django cancele la suscripción al cerrar la
+    respuesta, también cuando el cliente se desconecta.
+    """
+
+    def __init__(self, subscription, keepalive, user):
+        self.subscription = subscription
+        self.keepalive = keepalive
+        self.user = user
+        self._started = False
+        self._closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._closed:
+            raise StopAsyncIteration
+        if not self._started:
+            self._started = True
+            return f"retry: {STREAM_RETRY_MS}\n\n"
+        event = await self.subscription.get(timeout=self.keepalive)
+        if event is None:
+            return ": keep-alive\n\n"
+        return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.subscription.close()
+            logger.info("Stream de noticias cerrado para %s", self.user)
+
+
+async def news_stream(request):
+    """
+    Stream SSE de noticias nuevas y análisis de sentimiento terminados.
+
+    ``?symbols=AAPL,MSFT`` limita los eventos a esos tickers. Si el cliente
+    no consume al ritmo de los eventos recibe un evento ``lagged`` y debe
+    resincronizar con ``/api/news/changes/``. Requiere servidor ASGI.
+    """
+    user = await _authenticate(request)
+    if user is None or not user.is_active:
+        return JsonResponse(
+            {"detail": "Las credenciales de autenticación no se proveyeron."},
+            status=401,
+        )
+
+    subscription = get_event_bus().subscribe(request.GET.get("symbols", "").split(","))
+    logger.info(
+        "Stream de noticias abierto para %s (%s)",
+        user,
+        ",".join(sorted(subscription.symbols)) or "todos",
+    )
+    stream = EventStream(
+        subscription, getattr(settings, "NEWS_STREAM_KEEPALIVE", 15), user
+    )
+
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Evita que nginx acumule el stream en su buffer
+    response["X-Accel-Buffering"] = "no"
+    return response
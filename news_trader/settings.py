@@ -20,9 +20,12 @@ Django settings for news_trader project.
 """
 
 import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # -------------------------------
@@ -256,8 +259,17 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson: NaN/Inf de los datos de mercado se codifican como null
+    "DEFAULT_RENDERER_CLASSES": [
+        "news.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
+# Tamaño de página por defecto de los listados paginados por cursor
+# (news, articles, stocks); el cliente puede pedir otro con ?page_size=
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "50"))
+
 SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
     "ROTATE_REFRESH_TOKENS": True,
@@ -278,6 +290,140 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
+# Permite distinguir en el estado de los jobs entre encolado y en curso
+CELERY_TASK_TRACK_STARTED = True
+# Tareas periódicas (ejecutar con: celery -A news_trader beat)
+CELERY_BEAT_SCHEDULE = {
+    "schedule-news-polls": {
+        "task": "news.tasks.schedule_due_polls",
+        "schedule": 60.0,
+    },
+    "prune-news-changes": {
+        "task": "news.tasks.prune_news_changes",
+        "schedule": 6 * 60 * 60.0,
+    },
+}
+
+# -------------------------------
+# 🗄️ Caché compartida (Redis si está configurado)
+# -------------------------------
+REDIS_CACHE_URL = os.environ.get("REDIS_CACHE_URL")
+
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# -------------------------------
+# 🚦 Límite de peticiones a Yahoo Finance
+# -------------------------------
+YAHOO_RATE_LIMIT = {
+    # "cache" comparte el cubo entre procesos, "memory" es local al proceso
+    "BACKEND": os.environ.get("YAHOO_RATE_LIMIT_BACKEND", "cache"),
+    "RATE": float(os.environ.get("YAHOO_RATE_LIMIT_RATE", "2")),  # tokens/segundo
+    "CAPACITY": float(os.environ.get("YAHOO_RATE_LIMIT_CAPACITY", "10")),
+}
+# Sobre LocMemCache el cubo "cache" es de cada proceso: N workers enviarían N
+# veces la tasa configurada. Fuera de DEBUG se exige una caché compartida
+if (
+    not DEBUG
+    and YAHOO_RATE_LIMIT["BACKEND"] == "cache"
+    and CACHES["default"]["BACKEND"].endswith("LocMemCache")
+):
+    raise ImproperlyConfigured(
+        "YAHOO_RATE_LIMIT_BACKEND=cache necesita una caché compartida entre "
+        "procesos: define REDIS_CACHE_URL (o usa YAHOO_RATE_LIMIT_BACKEND=memory "
+        "con un único proceso)"
+    )
+
+# Fuente de datos de Yahoo: "live", "record" (graba respuestas en FIXTURES_DIR)
+# o "replay" (las reproduce sin red, con latencia y errores simulados)
+YAHOO_DATA_SOURCE = {
+    "BACKEND": os.environ.get("YAHOO_DATA_SOURCE", "live"),
+    "FIXTURES_DIR": os.environ.get(
+        "YAHOO_FIXTURES_DIR", str(BASE_DIR / "fixtures" / "yahoo")
+    ),
+    "LATENCY": float(os.environ.get("YAHOO_REPLAY_LATENCY", "0")),
+    "JITTER": float(os.environ.get("YAHOO_REPLAY_JITTER", "0")),
+    "ERROR_RATE": float(os.environ.get("YAHOO_REPLAY_ERROR_RATE", "0")),
+}
+
+# Circuit breaker por proceso alrededor de las llamadas a Yahoo
+YAHOO_CIRCUIT_BREAKER = {
+    "WINDOW": 60.0,  # segundos de la ventana deslizante
+    "MIN_CALLS": 5,
+    "ERROR_RATE": 0.5,
+    "SLOW_CALL_SECONDS": 10.0,
+    "SLOW_CALL_RATE": 0.5,
+    "OPEN_SECONDS": 30.0,
+    "MAX_WORKERS": 8,
+    # Llamadas abandonadas (fuera de presupuesto) que pueden seguir ocupando
+    # hilos; al llegar al límite las nuevas fallan rápido
+    "MAX_ABANDONED": 4,
+}
+
+# Segundos durante los que una ingesta de noticias se comparte con peticiones
+# idénticas (mismo símbolo y cantidad) que lleguen después
+NEWS_INGEST_COALESCE_WINDOW = float(
+    os.environ.get("NEWS_INGEST_COALESCE_WINDOW", "10")
+)
+
+# Antigüedad mínima (s) de un cambio para servirlo en /api/news/changes/; debe
+# cubrir el desfase entre asignar el id del cambio y confirmarlo
+NEWS_CHANGES_SETTLE_SECONDS = float(
+    os.environ.get("NEWS_CHANGES_SETTLE_SECONDS", "2")
+)
+# Días que se conservan los cambios; un cliente con un cursor más antiguo
+# recibe 410 y debe recargar el listado (tarea news.tasks.prune_news_changes)
+NEWS_CHANGES_RETENTION_DAYS = float(
+    os.environ.get("NEWS_CHANGES_RETENTION_DAYS", "7")
+)
+
+# Bus de eventos del stream SSE /api/news/stream/ (ver news.services.event_bus).
+# "redis" recibe los eventos publicados por los workers de Celery (ingestas y
+# análisis); "memory" sólo reparte dentro del proceso y hay que pedirlo
+# explícitamente (un único proceso sin workers). Los tests lo usan por defecto
+TESTING = sys.argv[1:2] == ["test"]
+NEWS_EVENT_BUS = {
+    "BACKEND": os.environ.get("NEWS_EVENT_BUS", "memory" if TESTING else "redis"),
+    "URL": os.environ.get("NEWS_EVENT_BUS_URL", CELERY_BROKER_URL),
+    # Eventos pendientes por conexión antes de descartar y avisar con "lagged"
+    "MAX_QUEUE": int(os.environ.get("NEWS_EVENT_BUS_MAX_QUEUE", "100")),
+}
+NEWS_STREAM_KEEPALIVE = 15  # segundos entre comentarios keep-alive del SSE
+
+# Sondeo adaptativo de la watchlist (ver news.services.polling_scheduler)
+NEWS_POLLING = {
+    "MIN_INTERVAL": 60,
+    "MAX_INTERVAL": 3600,
+    "OFF_HOURS_FACTOR": 4.0,
+    "BATCH_SIZE": 50,
+}
+
+# Almacén columnar de precios en ficheros NumPy mapeados en memoria (ver
+# news.services.price_store); se actualiza tras cada ingesta de precios.
+# PRICE_STORE_DIR debe estar en almacenamiento compartido por todos los hosts
+# web y workers de Celery: las lecturas no consultan la base de datos
+PRICE_STORE = {
+    "ENABLED": os.environ.get("PRICE_STORE_ENABLED", "true").lower() == "true",
+    "DIRECTORY": os.environ.get(
+        "PRICE_STORE_DIR", str(BASE_DIR / "var" / "price_store")
+    ),
+}
+
+# Presupuesto de latencia (segundos) de las ingestas bajo demanda
+YAHOO_INGEST_LATENCY_BUDGET = float(
+    os.environ.get("YAHOO_INGEST_LATENCY_BUDGET", "15")
+)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sentiment_analysis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-pub_date', '-id'], name='sa_article_pub_dat_389365_idx'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+from django.db import migrations
+
+# SQL en línea (y no news.services.search.FullTextIndex) para que la migración
+# no cambie si cambia el código vivo. Debe coincidir con FullTextIndex(Article,
+# ['title', 'content']), que es lo que recrea ``rebuild_search_index``.
+#
+# En SQLite, cualquier AlterField/AddField que rehaga la tabla sa_article borra
+# estos triggers sin avisar: esas migraciones deben ir seguidas de
+# ``python manage.py rebuild_search_index``.
+
+POSTGRESQL_INSTALL = [
+    """
+    ALTER TABLE "sa_article" ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce("title", '')), 'A')
+        || setweight(to_tsvector('english', coalesce("content", '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS "sa_article_search_gin" ON "sa_article" USING GIN (search_vector)',
+]
+
+POSTGRESQL_UNINSTALL = [
+    'ALTER TABLE "sa_article" DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS "sa_article_fts" USING fts5(
+        key UNINDEXED, "title", "content", tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS "sa_article_fts_ai" AFTER INSERT ON "sa_article" BEGIN
+        INSERT INTO "sa_article_fts" (key, "title", "content")
+        VALUES (new."id", new."title", new."content");
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS "sa_article_fts_ad" AFTER DELETE ON "sa_article" BEGIN
+        DELETE FROM "sa_article_fts" WHERE key = old."id";
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS "sa_article_fts_au" AFTER UPDATE ON "sa_article" BEGIN
+        DELETE FROM "sa_article_fts" WHERE key = old."id";
+        INSERT INTO "sa_article_fts" (key, "title", "content")
+        VALUES (new."id", new."title", new."content");
+    END
+    """,
+    'DELETE FROM "sa_article_fts"',
+    """
+    INSERT INTO "sa_article_fts" (key, "title", "content")
+    SELECT "id", "title", "content" FROM "sa_article"
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    'DROP TRIGGER IF EXISTS "sa_article_fts_ai"',
+    'DROP TRIGGER IF EXISTS "sa_article_fts_ad"',
+    'DROP TRIGGER IF EXISTS "sa_article_fts_au"',
+    'DROP TABLE IF EXISTS "sa_article_fts"',
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+install_search_index = _run(
+    {'postgresql': POSTGRESQL_INSTALL, 'sqlite': SQLITE_INSTALL}
+)
+uninstall_search_index = _run(
+    {'postgresql': POSTGRESQL_UNINSTALL, 'sqlite': SQLITE_UNINSTALL}
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sentiment_analysis', '0002_article_keyset_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -10,6 +10,10 @@ class Article(models.Model):
     class Meta:
         db_table = "sa_article"
         ordering = ["-pub_date"]
+        indexes = [
+            # Orden de la paginación por cursor de /api/articles/
+            models.Index(fields=["-pub_date", "-id"]),
+        ]
 
     def __str__(self):
         return f"{self.ticker}: {self.title[:50]}"
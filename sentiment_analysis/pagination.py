@@ -0,0 +1,5 @@
+from news.pagination import KeysetPagination
+
+
+class ArticlePagination(KeysetPagination):
+    ordering = ("-pub_date", "-id")
@@ -0,0 +1,46 @@
+from typing import Any, List, Tuple
+
+from django.db import connection as default_connection
+
+from news.services.search import Condition, FullTextIndex
+
+from .models import Article
+
+
+def article_index() -> FullTextIndex:
+    return FullTextIndex(Article, ["title", "content"])
+
+
+def search_articles(
+    query: str,
+    ticker: str = None,
+    since=None,
+    until=None,
+    limit: int = 20,
+    offset: int = 0,
+    connection=None,
+) -> List[Tuple[Any, float]]:
+    """
+    Busca artículos por título y contenido con filtros de ticker y fecha
+    """
+    connection = connection or default_connection
+    ops = connection.ops
+    conditions = []
+    if ticker:
+        conditions.append(Condition("t.ticker = %s", [ticker.upper()]))
+    if since:
+        conditions.append(
+            Condition("t.pub_date >= %s", [ops.adapt_datetimefield_value(since)])
+        )
+    if until:
+        conditions.append(
+            Condition("t.pub_date < %s", [ops.adapt_datetimefield_value(until)])
+        )
+    return article_index().search(
+        query,
+        conditions,
+        order_column="pub_date",
+        limit=limit,
+        offset=offset,
+        connection=connection,
+    )
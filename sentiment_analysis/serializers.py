@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from news.utils.fieldsets import SparseFieldsetMixin
 from .models import Article, ArticleAnalysis, NewsAnalysis
 
 
@@ -16,7 +17,7 @@ class ArticleAnalysisSerializer(serializers.ModelSerializer):
         ]
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     analysis = ArticleAnalysisSerializer(read_only=True)
 
     class Meta:
@@ -6,4 +6,7 @@ from .tasks import analyze_news_title
 
 @receiver(post_save, sender=New)
 def enqueue_news_analysis(sender, instance, created, **kwargs):
+    # Los casi duplicados comparten el análisis de su noticia canónica
+    if instance.canonical_id:
+        return
     analyze_news_title.delay(str(instance.uuid))
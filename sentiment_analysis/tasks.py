@@ -16,6 +16,10 @@ def analyze_news_title(self, news_uuid):
         logger.error("❌ No existe noticia %s", news_uuid)
         return
 
+    if news.canonical_id:
+        logger.info("🔁 %s es duplicada, se usa el análisis de %s", news_uuid, news.canonical_id)
+        return
+
     title = news.title
     # Básico lexicon
     lex_score = lexicon_score(title)
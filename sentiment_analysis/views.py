@@ -1,5 +1,11 @@
 from rest_framework import viewsets
 from .models import Article, ArticleAnalysis
+from .pagination import ArticlePagination
+from .search import search_articles
+from news.pagination import RankedPagination
+from news.services.search import fetch_ranked
+from news.utils.helpers import parse_time_param
+from news.views.mixins import SparseFieldsetViewMixin
 from .serializers import ArticleSerializer, ArticleAnalysisSerializer
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -29,10 +35,57 @@ class AnalyzeNewsView(APIView):
         )
 
 
-class ArticleView(viewsets.ModelViewSet):
+class ArticleView(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    """
+    Artículos con su análisis; listado, detalle y búsqueda admiten
+    ``?fields=`` / ``?exclude=`` (p. ej. ``?exclude=content``)
+    """
+
     permission_classes = [IsAuthenticated]
     serializer_class = ArticleSerializer
-    queryset = Article.objects.all().order_by("-pub_date")
+    pagination_class = ArticlePagination
+    sparse_required_fields = ("pub_date",)
+    queryset = Article.objects.all().select_related("analysis").order_by("-pub_date")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            queryset = self.apply_sparse_fieldset(queryset)
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Búsqueda de texto completo en título y contenido de los artículos.
+
+        ``?q=`` es obligatorio; admite ``?ticker=``, ``?since=``, ``?until=``,
+        ``?page=`` y ``?page_size=``.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": "El parámetro q es requerido"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        paginator = RankedPagination(request)
+        ranked = paginator.paginate(
+            search_articles(
+                query,
+                ticker=request.query_params.get("ticker", "").strip(),
+                since=parse_time_param(request.query_params, "since"),
+                until=parse_time_param(request.query_params, "until"),
+                limit=paginator.limit,
+                offset=paginator.offset,
+            )
+        )
+        articles = fetch_ranked(
+            Article, ranked, self.apply_sparse_fieldset(self.get_queryset())
+        )
+        data = self.get_serializer(articles, many=True).data
+        for item, obj in zip(data, articles):
+            item["rank"] = obj.rank
+        return paginator.get_paginated_response(data)
 
     @action(detail=True, methods=["post"])
     def analyze(self, request, pk=None):